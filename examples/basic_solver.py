@@ -34,19 +34,16 @@ def solve_puzzle(puzzle_state, algorithm='astar', heuristic=None):
     if algorithm == 'astar':
         if heuristic is None:
             heuristic = h3_manhattan_distance  # Default to Manhattan distance
-        solution = aStarSearch(problem, heuristic)
-        return solution, 0, 0  # Simplified for basic example
+        result = aStarSearch(problem, heuristic)
     elif algorithm == 'bfs':
-        solution, max_fringe, expanded = breadthFirstSearch(problem)
-        return solution, expanded, max_fringe
+        result = breadthFirstSearch(problem)
     elif algorithm == 'dfs':
-        solution, max_fringe, expanded = depthFirstSearch(problem)
-        return solution, expanded, max_fringe
+        result = depthFirstSearch(problem)
     elif algorithm == 'ucs':
-        solution, max_fringe, expanded = uniformCostSearch(problem)
-        return solution, expanded, max_fringe
+        result = uniformCostSearch(problem)
     else:
         raise ValueError(f"Unknown algorithm: {algorithm}")
+    return result.actions, result.nodesExpanded, result.maxOpen
 
 
 def main():
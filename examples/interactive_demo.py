@@ -112,7 +112,7 @@ def solve_puzzle(puzzle, heuristic):
     print(f"\nSolving with {heuristic.__name__} heuristic...")
     print("Please wait...")
     
-    solution = aStarSearch(problem, heuristic)
+    solution = aStarSearch(problem, heuristic).actions
     
     if solution:
         print(f"\nSolution found in {len(solution)} moves!")
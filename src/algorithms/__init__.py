@@ -4,33 +4,73 @@ Search algorithms and heuristics for N-Puzzle Solver.
 
 from .search import (
     SearchProblem,
+    SearchStats,
+    PhaseProfile,
     depthFirstSearch,
     breadthFirstSearch,
     uniformCostSearch,
-    aStarSearch
+    aStarSearch,
+    enhancedPartialExpansionAStarSearch,
+    iterativeDeepeningAStarSearch
 )
 
+from .pruning import MovePruner, slidingTilePruner
+from .perimeter import PerimeterDatabase, loadPerimeter
+from .transposition import TranspositionTable
+from .layered import layeredBreadthFirstSearch, slidingTileSuccessors
+from .external import externalBreadthFirstSearch
+from .twobit import twoBitBreadthFirstSearch
+from .pattern_database import PatternDatabase, buildPatternDatabase
+from .constructive import solveByConstruction
+from .shortening import removeCycles, shortenSolution
+
 from .heuristics import (
     null_heuristic,
     h1_misplaced_tiles,
     h2_euclidean_distance,
     h3_manhattan_distance,
     h4_row_column_misplacements,
+    manhattan_operator_table,
+    goal_tables,
+    make_heuristics,
+    heuristics_for,
     HEURISTICS,
     get_heuristic
 )
 
 __all__ = [
     'SearchProblem',
+    'SearchStats',
+    'PhaseProfile',
     'depthFirstSearch',
     'breadthFirstSearch', 
     'uniformCostSearch',
     'aStarSearch',
+    'enhancedPartialExpansionAStarSearch',
+    'iterativeDeepeningAStarSearch',
+    'MovePruner',
+    'slidingTilePruner',
+    'PerimeterDatabase',
+    'loadPerimeter',
+    'TranspositionTable',
+    'layeredBreadthFirstSearch',
+    'slidingTileSuccessors',
+    'externalBreadthFirstSearch',
+    'twoBitBreadthFirstSearch',
+    'PatternDatabase',
+    'buildPatternDatabase',
+    'solveByConstruction',
+    'removeCycles',
+    'shortenSolution',
     'null_heuristic',
     'h1_misplaced_tiles',
     'h2_euclidean_distance',
     'h3_manhattan_distance',
     'h4_row_column_misplacements',
+    'manhattan_operator_table',
+    'goal_tables',
+    'make_heuristics',
+    'heuristics_for',
     'HEURISTICS',
     'get_heuristic'
 ]
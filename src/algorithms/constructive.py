@@ -0,0 +1,277 @@
+# constructive.py
+# ---------------
+# Fast suboptimal solver for large sliding-tile puzzles.
+
+"""
+Constructive solver for N x N sliding-tile puzzles.
+
+Optimal search does not scale past the fifteen puzzle.  This solver builds a
+legal, usually far from optimal, solution in polynomial time instead: it
+places the first row and the first column, then repeats on the remaining
+(N-1) x (N-1) board until a 2 x 3 block is left, which is finished from a
+lookup table.
+
+The goal is tiles 1..N*N-1 in row order followed by the blank, as for the
+fifteen puzzle.  Solutions are lists of blank moves ('up', 'down', 'left',
+'right'), the same format the searches in search.py return.
+"""
+
+from collections import deque
+
+
+class _Board:
+    """
+      Flat N x N board that records every blank move made on it.
+
+      cells[i] is the tile on cell i (row-major), where[t] the cell holding
+      tile t, and blank the cell holding the blank (tile 0).
+    """
+
+    def __init__(self, numbers, size):
+        self.size = size
+        self.cells = list(numbers)
+        self.where = [0] * len(self.cells)
+        for index, tile in enumerate(self.cells):
+            self.where[tile] = index
+        self.blank = self.where[0]
+        self.moves = []
+
+    def neighbours(self, index):
+        "Returns the cells next to 'index'"
+        size = self.size
+        row, col = divmod(index, size)
+        result = []
+        if row > 0:
+            result.append(index - size)
+        if row < size - 1:
+            result.append(index + size)
+        if col > 0:
+            result.append(index - 1)
+        if col < size - 1:
+            result.append(index + 1)
+        return result
+
+    def slide(self, target):
+        "Moves the blank onto the neighbouring cell 'target'"
+        difference = target - self.blank
+        if difference == -self.size:
+            self.moves.append('up')
+        elif difference == self.size:
+            self.moves.append('down')
+        elif difference == -1:
+            self.moves.append('left')
+        else:
+            self.moves.append('right')
+        tile = self.cells[target]
+        self.cells[self.blank] = tile
+        self.where[tile] = self.blank
+        self.cells[target] = 0
+        self.where[0] = target
+        self.blank = target
+
+
+def _shortestPath(board, start, targets, blocked):
+    """
+    Returns the cells of a shortest path from 'start' to any cell in
+    'targets' that avoids 'blocked', start included.
+    """
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        if cell in targets:
+            path = []
+            while cell is not None:
+                path.append(cell)
+                cell = parents[cell]
+            path.reverse()
+            return path
+        for neighbour in board.neighbours(cell):
+            if neighbour not in parents and neighbour not in blocked:
+                parents[neighbour] = cell
+                queue.append(neighbour)
+    raise RuntimeError("No path from cell %d to %s" % (start, sorted(targets)))
+
+
+def _moveBlank(board, targets, blocked):
+    "Walks the blank to the nearest cell in 'targets' without entering 'blocked'"
+    for cell in _shortestPath(board, board.blank, targets, blocked)[1:]:
+        board.slide(cell)
+
+
+def _moveTile(board, tile, target, locked):
+    """
+    Moves 'tile' to 'target' one cell at a time, each time bringing the blank
+    round to the cell in front of it without disturbing 'locked' cells.
+    """
+    route = _shortestPath(board, board.where[tile], {target}, locked)
+    for cell in route[1:]:
+        _moveBlank(board, {cell}, locked | {board.where[tile]})
+        board.slide(board.where[tile])
+
+
+def _bfsTable(neighbours, goals):
+    """
+    Breadth-first search over the configurations of a small block, from every
+    goal configuration at once.  Configurations are tuples of positions whose
+    last entry is the blank.  Returns a dict mapping each reachable
+    configuration to the cell the blank should move to next (None at a goal).
+    """
+    table = {}
+    queue = deque()
+    for goal in goals:
+        table[goal] = None
+        queue.append(goal)
+    while queue:
+        config = queue.popleft()
+        blank = config[-1]
+        for cell in neighbours[blank]:
+            # slide whatever is on 'cell' onto the blank
+            moved = tuple(blank if position == cell else position for position in config[:-1]) + (cell,)
+            if moved not in table:
+                # from 'moved', sliding the blank back to 'blank' undoes the move
+                table[moved] = blank
+                queue.append(moved)
+    return table
+
+
+def _localNeighbours(rows, cols):
+    "Returns the neighbour lists of a rows x cols block with row-major cells"
+    neighbours = []
+    for cell in range(rows * cols):
+        row, col = divmod(cell, cols)
+        adjacent = []
+        if row > 0:
+            adjacent.append(cell - cols)
+        if row < rows - 1:
+            adjacent.append(cell + cols)
+        if col > 0:
+            adjacent.append(cell - 1)
+        if col < cols - 1:
+            adjacent.append(cell + 1)
+        neighbours.append(adjacent)
+    return neighbours
+
+
+_pairTables = {}
+
+
+def _pairTable(height):
+    """
+    Returns the lookup table for the last two tiles of a line: tiles A and B
+    and the blank anywhere in a 2-wide strip of the given height, where the
+    goal puts A and B side by side on the strip's top row.
+    """
+    if height not in _pairTables:
+        cellCount = 2 * height
+        goals = [(0, 1, blank) for blank in range(2, cellCount)]
+        _pairTables[height] = _bfsTable(_localNeighbours(height, 2), goals)
+    return _pairTables[height]
+
+
+_finalTable = []
+
+
+def _finalBlockTable():
+    "Returns the lookup table for the closing 2 x 3 block, built on first use"
+    if not _finalTable:
+        # configuration: the position of each of the five tiles, then the blank
+        _finalTable.append(_bfsTable(_localNeighbours(2, 3), [(0, 1, 2, 3, 4, 5)]))
+    return _finalTable[0]
+
+
+def _solveLine(board, line, first, transposed, locked):
+    """
+    Places the goal tiles of one line of the unsolved region and adds their
+    cells to 'locked'.  In view coordinates the line is row 'line' from
+    column 'first' to the right edge; with 'transposed' the view swaps rows
+    and columns, so the same code places a column.
+    """
+    size = board.size
+
+    def cell(row, col):
+        return col * size + row if transposed else row * size + col
+
+    def goalTile(index):
+        return (index + 1) % (size * size)
+
+    for col in range(first, size - 2):
+        target = cell(line, col)
+        _moveTile(board, goalTile(target), target, locked)
+        locked.add(target)
+
+    # The last two tiles cannot be placed one after the other.  Gather both
+    # and the blank in the 2-wide strip at the end of the region, then finish
+    # from a lookup table.
+    cellA, cellB = cell(line, size - 2), cell(line, size - 1)
+    tileA, tileB = goalTile(cellA), goalTile(cellB)
+    if board.where[tileA] != cellA or board.where[tileB] != cellB:
+        strip = [cell(line + index // 2, size - 2 + index % 2) for index in range(2 * (size - line))]
+        stripIndex = {index: local for local, index in enumerate(strip)}
+
+        _moveTile(board, tileA, cell(line + 1, size - 1), locked)
+        if board.where[tileB] not in stripIndex:
+            row = board.where[tileB] % size if transposed else board.where[tileB] // size
+            _moveTile(board, tileB, cell(row, size - 2), locked | {board.where[tileA]})
+        if board.blank not in stripIndex:
+            _moveBlank(board, set(strip) - {board.where[tileA], board.where[tileB]},
+                       locked | {board.where[tileA], board.where[tileB]})
+
+        table = _pairTable(size - line)
+        while True:
+            config = (stripIndex[board.where[tileA]], stripIndex[board.where[tileB]], stripIndex[board.blank])
+            nextCell = table[config]
+            if nextCell is None:
+                break
+            board.slide(strip[nextCell])
+
+    locked.add(cellA)
+    locked.add(cellB)
+
+
+def _solveFinalBlock(board):
+    "Finishes the bottom-right 2 x 3 block from the lookup table"
+    size = board.size
+    block = [row * size + col for row in (size - 2, size - 1) for col in (size - 3, size - 2, size - 1)]
+    blockIndex = {index: local for local, index in enumerate(block)}
+    tiles = [(index + 1) % (size * size) for index in block]
+
+    table = _finalBlockTable()
+    while True:
+        config = tuple(blockIndex[board.where[tile]] for tile in tiles[:-1]) + (blockIndex[board.blank],)
+        if config not in table:
+            raise ValueError("The puzzle is not solvable")
+        nextCell = table[config]
+        if nextCell is None:
+            return
+        board.slide(block[nextCell])
+
+
+def solveByConstruction(puzzle):
+    """
+    Returns a list of blank moves that solves an N x N puzzle, N >= 3.
+
+    'puzzle' is a flat list of the tiles in row order with 0 for the blank,
+    a list of rows, or a SlidingPuzzleState.  Runs in
+    polynomial time; the solution is legal but not optimal.
+
+    Raises ValueError if the puzzle is not a square board or not solvable.
+    """
+    if hasattr(puzzle, 'tiles'):
+        puzzle = puzzle.tiles
+    numbers = list(puzzle)
+    if numbers and isinstance(numbers[0], (list, tuple)):
+        numbers = [tile for row in numbers for tile in row]
+
+    size = int(round(len(numbers) ** 0.5))
+    if size < 3 or size * size != len(numbers) or sorted(numbers) != list(range(size * size)):
+        raise ValueError("Expected the tiles 0..N*N-1 of an N x N board with N >= 3")
+
+    board = _Board(numbers, size)
+    locked = set()
+    for corner in range(size - 3):
+        _solveLine(board, corner, corner, False, locked)      # row 'corner'
+        _solveLine(board, corner, corner + 1, True, locked)   # column 'corner'
+    _solveLine(board, size - 3, size - 3, False, locked)
+    _solveFinalBlock(board)
+    return board.moves
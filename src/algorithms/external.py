@@ -0,0 +1,197 @@
+# external.py
+# -----------
+# Disk-backed breadth-first search for state spaces larger than memory.
+
+"""
+External-memory breadth-first search.
+
+The layered search in layered.py holds whole layers in memory.  This
+version keeps them on disk as sorted files of packed uint64 states, so the
+largest layer only has to fit on disk:
+
+  1. the current layer is read in chunks; the successors of each chunk are
+     sorted, deduplicated and written out as a sorted run file;
+  2. the runs are merged block by block; each merged block is deduplicated
+     and the states of the current and previous layer are removed by
+     looking up the same key range in those (memory-mapped) layer files;
+  3. the new layer file is renamed into place and a checkpoint recording
+     the finished depth is written.
+
+Every step after the checkpoint can be repeated, so a run interrupted at
+any point resumes from the last finished layer when started again on the
+same directory.
+"""
+
+import glob
+import json
+import os
+
+import numpy as np
+
+from algorithms.layered import DEFAULT_CHUNK_SIZE, containsSorted, subtractSorted
+
+CHECKPOINT = 'checkpoint.json'
+
+
+def layerPath(directory, depth):
+    "Returns the file holding the sorted layer at 'depth'"
+    return os.path.join(directory, 'layer_%04d.bin' % depth)
+
+
+def readLayer(directory, depth):
+    "Returns the layer at 'depth' as a read-only memory map"
+    path = layerPath(directory, depth)
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=np.uint64)
+    return np.memmap(path, dtype=np.uint64, mode='r')
+
+
+def _writeAtomically(path, write):
+    "Calls write(file) on a temporary file, then renames it to 'path'"
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as file:
+        write(file)
+    os.replace(temporary, path)
+
+
+def _saveCheckpoint(directory, checkpoint):
+    _writeAtomically(os.path.join(directory, CHECKPOINT),
+                     lambda file: file.write(json.dumps(checkpoint).encode('utf-8')))
+
+
+def _loadCheckpoint(directory, config):
+    """
+    Returns the checkpoint of an earlier run on 'directory', or None.  Raises
+    ValueError if it was saved by a search with another 'config'.
+    """
+    path = os.path.join(directory, CHECKPOINT)
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        checkpoint = json.load(file)
+    saved = {key: checkpoint.get(key) for key in config}
+    if saved != config:
+        raise ValueError(f"{directory} holds a different search: {saved}, expected {config}")
+    return checkpoint
+
+
+def _writeRuns(directory, layer, successors, chunkSize):
+    "Writes the sorted, unique successors of each chunk of 'layer' as run files"
+    paths = []
+    for index, begin in enumerate(range(0, len(layer), chunkSize)):
+        run = np.unique(successors(np.asarray(layer[begin:begin + chunkSize])))
+        path = os.path.join(directory, 'run_%06d.bin' % index)
+        run.tofile(path)
+        paths.append(path)
+    return paths
+
+
+def _lookupRange(layer, low, high):
+    "Returns the entries of a sorted layer between 'low' and 'high' inclusive"
+    begin = np.searchsorted(layer, low, side='left')
+    end = np.searchsorted(layer, high, side='right')
+    return np.asarray(layer[begin:end])
+
+
+def _mergeRuns(runPaths, output, seenLayers, blockSize):
+    """
+    Merges sorted run files into 'output', dropping duplicates and every
+    state in 'seenLayers'.  Returns the number of states written.
+    """
+    runs = [np.memmap(path, dtype=np.uint64, mode='r') for path in runPaths if os.path.getsize(path)]
+    positions = [0] * len(runs)
+    written = 0
+    while True:
+        active = [index for index, run in enumerate(runs) if positions[index] < len(run)]
+        if not active:
+            return written
+        # Everything up to the smallest block end is complete in every run.
+        cutoff = min(runs[index][min(positions[index] + blockSize, len(runs[index])) - 1] for index in active)
+        parts = []
+        for index in active:
+            run = runs[index]
+            end = np.searchsorted(run[positions[index]:positions[index] + blockSize], cutoff, side='right')
+            parts.append(np.asarray(run[positions[index]:positions[index] + end]))
+            positions[index] += end
+        block = np.unique(np.concatenate(parts))
+        for layer in seenLayers:
+            if len(block) == 0:
+                break
+            block = subtractSorted(block, _lookupRange(layer, block[0], block[-1]))
+        if len(block):
+            block.tofile(output)
+            written += len(block)
+
+
+def externalBreadthFirstSearch(start, successors, directory, goal=None, maxDepth=None,
+                               chunkSize=DEFAULT_CHUNK_SIZE, keepLayers=True, onLayer=None, config=None):
+    """
+    Breadth-first search from the packed state 'start', with every layer
+    stored in 'directory' (created if needed) and a checkpoint written after
+    each one.  If 'directory' already holds a checkpoint for the same start,
+    goal and config, the search resumes after its last finished layer; a
+    checkpoint of any other search raises ValueError.
+
+    successors: maps a uint64 array of packed states to their successors
+    goal: a packed goal; the search stops at the first layer containing it
+    maxDepth: stop after this many layers below the start
+    chunkSize: states expanded, and states per run read while merging, at
+      a time; bounds the memory used
+    keepLayers: keep every layer file (needed to reconstruct paths);
+      otherwise layers no longer needed for duplicate removal are deleted
+    onLayer: called as onLayer(depth, size) after each layer is finished
+    config: a JSON-serialisable dict describing the state space, such as the
+      board size and goal, saved with the checkpoint so that a resume cannot
+      mix in the layers of another puzzle
+
+    Returns (layers, sizes): memory maps of the kept layers, indexed by
+    depth (None for deleted ones), and the number of states at each depth.
+    """
+    os.makedirs(directory, exist_ok=True)
+    config = dict(config or {}, start=int(start), goal=None if goal is None else int(goal))
+    checkpoint = _loadCheckpoint(directory, config)
+    if checkpoint is None:
+        _writeAtomically(layerPath(directory, 0),
+                         lambda file: np.array([start], dtype=np.uint64).tofile(file))
+        checkpoint = dict(config, depth=0, sizes=[1], done=False)
+        _saveCheckpoint(directory, checkpoint)
+        if onLayer is not None:
+            onLayer(0, 1)
+
+    # Leftovers of an interrupted layer
+    for path in glob.glob(os.path.join(directory, 'run_*.bin')) + glob.glob(os.path.join(directory, '*.tmp')):
+        os.remove(path)
+
+    depth = checkpoint['depth']
+    while not checkpoint['done'] and (maxDepth is None or depth < maxDepth):
+        current = readLayer(directory, depth)
+        if goal is not None and containsSorted(current, goal):
+            break
+        seen = [current] + ([readLayer(directory, depth - 1)] if depth > 0 else [])
+
+        runPaths = _writeRuns(directory, current, successors, chunkSize)
+        newPath = layerPath(directory, depth + 1)
+        with open(newPath + '.tmp', 'wb') as output:
+            size = _mergeRuns(runPaths, output, seen, chunkSize)
+        del current, seen
+        for path in runPaths:
+            os.remove(path)
+
+        if size == 0:
+            os.remove(newPath + '.tmp')
+            checkpoint['done'] = True
+        else:
+            os.replace(newPath + '.tmp', newPath)
+            depth += 1
+            checkpoint['depth'] = depth
+            checkpoint['sizes'].append(size)
+        _saveCheckpoint(directory, checkpoint)
+        if size and onLayer is not None:
+            onLayer(depth, size)
+
+        if not keepLayers and depth >= 2 and os.path.exists(layerPath(directory, depth - 2)):
+            os.remove(layerPath(directory, depth - 2))
+
+    layers = [readLayer(directory, index) if os.path.exists(layerPath(directory, index)) else None
+              for index in range(depth + 1)]
+    return layers, checkpoint['sizes']
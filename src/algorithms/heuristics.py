@@ -27,22 +27,133 @@ def null_heuristic(state, problem=None):
     return 0
 
 
+def goal_tables(rows, cols=None, goal=None):
+    """
+    Per-tile lookup tables for a board size and goal layout.
+
+    Args:
+        rows (int): Height of the board
+        cols (int): Width of the board; defaults to rows
+        goal (sequence): Flat goal layout; defaults to tiles 1..n followed
+            by the blank
+
+    Returns:
+        dict: 'goal_cell', 'goal_row' and 'goal_col' map each tile to its
+        goal cell, row and column.  'manhattan' and 'euclidean' map each
+        tile to a list of its distance from every cell to its goal cell;
+        the blank's lists are all zeros.
+    """
+    if cols is None:
+        cols = rows
+    size = rows * cols
+    if goal is None:
+        goal = list(range(1, size)) + [0]
+    if sorted(goal) != list(range(size)):
+        raise ValueError(f"Goal must be a permutation of 0..{size - 1}")
+
+    goal_cell = [0] * size
+    for cell, tile in enumerate(goal):
+        goal_cell[tile] = cell
+    goal_row = [goal_cell[tile] // cols for tile in range(size)]
+    goal_col = [goal_cell[tile] % cols for tile in range(size)]
+
+    manhattan = [[0] * size for _ in range(size)]
+    euclidean = [[0.0] * size for _ in range(size)]
+    for tile in range(1, size):
+        for cell in range(size):
+            row, col = divmod(cell, cols)
+            d_row, d_col = row - goal_row[tile], col - goal_col[tile]
+            manhattan[tile][cell] = abs(d_row) + abs(d_col)
+            euclidean[tile][cell] = math.sqrt(d_row ** 2 + d_col ** 2)
+
+    return {
+        'goal_cell': goal_cell,
+        'goal_row': goal_row,
+        'goal_col': goal_col,
+        'manhattan': manhattan,
+        'euclidean': euclidean,
+    }
+
+
+def make_heuristics(rows, cols=None, goal=None):
+    """
+    Builds the four heuristics for one board size and goal layout.
+
+    All goal positions and distances are looked up in tables built once
+    here, so each heuristic is a single pass over the state's flat tiles.
+
+    Args:
+        rows (int): Height of the board
+        cols (int): Width of the board; defaults to rows
+        goal (sequence): Flat goal layout; defaults to tiles 1..n followed
+            by the blank
+
+    Returns:
+        dict: Maps 'misplaced_tiles', 'euclidean_distance',
+        'manhattan_distance' and 'row_column_misplacements' to heuristic
+        functions taking (state, problem=None)
+    """
+    if cols is None:
+        cols = rows
+    tables = goal_tables(rows, cols, goal)
+    goal_cell = tables['goal_cell']
+    manhattan = tables['manhattan']
+    euclidean = tables['euclidean']
+    # row and column of every cell
+    row_of = [cell // cols for cell in range(rows * cols)]
+    col_of = [cell % cols for cell in range(rows * cols)]
+    goal_row = tables['goal_row']
+    goal_col = tables['goal_col']
+
+    def misplaced_tiles(state, problem=None):
+        "Counts the tiles that are not on their goal cell"
+        return sum(1 for cell, tile in enumerate(state.tiles) if tile and goal_cell[tile] != cell)
+
+    def euclidean_distance(state, problem=None):
+        "Sums the straight-line distances of the tiles to their goal cells"
+        return sum([euclidean[tile][cell] for cell, tile in enumerate(state.tiles)])
+
+    def manhattan_distance(state, problem=None):
+        "Sums the Manhattan distances of the tiles to their goal cells"
+        return sum([manhattan[tile][cell] for cell, tile in enumerate(state.tiles)])
+
+    def row_column_misplacements(state, problem=None):
+        "Counts the tiles outside their goal row plus those outside their goal column"
+        total = 0
+        for cell, tile in enumerate(state.tiles):
+            if tile:
+                total += (row_of[cell] != goal_row[tile]) + (col_of[cell] != goal_col[tile])
+        return total
+
+    return {
+        'misplaced_tiles': misplaced_tiles,
+        'euclidean_distance': euclidean_distance,
+        'manhattan_distance': manhattan_distance,
+        'row_column_misplacements': row_column_misplacements,
+    }
+
+
+_heuristic_cache = {}
+
+
+def heuristics_for(state):
+    """
+    Returns the make_heuristics functions for the size and goal of a
+    SlidingPuzzleState, building them on first use.
+    """
+    key = (state.rows, state.cols, state.goal)
+    heuristics = _heuristic_cache.get(key)
+    if heuristics is None:
+        heuristics = _heuristic_cache[key] = make_heuristics(state.rows, state.cols, state.goal)
+    return heuristics
+
+
 def h1_misplaced_tiles(state, problem=None):
     """
     Heuristic 1: Misplaced Tiles
     Counts the number of tiles that are not in the correct position.
     """
-    misplaced = 0
-    goal = [[1, 2, 3, 4],
-            [5, 6, 7, 8],
-            [9, 10, 11, 12],
-            [13, 14, 15, 0]]
-
-    for i in range(4):
-        for j in range(4):
-            if state.cells[i][j] != 0 and state.cells[i][j] != goal[i][j]:
-                misplaced += 1
-    return misplaced
+    return heuristics_for(state)['misplaced_tiles'](state, problem)
 
 
 def h2_euclidean_distance(state, problem=None):
@@ -51,14 +162,7 @@ def h2_euclidean_distance(state, problem=None):
     Calculates the sum of Euclidean distances from each tile's current 
     position to its goal position.
     """
-    total_distance = 0
-    for i in range(4):
-        for j in range(4):
-            tile = state.cells[i][j]
-            if tile != 0:
-                goal_row, goal_col = divmod(tile - 1, 4)
-                total_distance += math.sqrt((goal_row - i) ** 2 + (goal_col - j) ** 2)
-    return total_distance
+    return heuristics_for(state)['euclidean_distance'](state, problem)
 
 
 def h3_manhattan_distance(state, problem=None):
@@ -68,14 +172,7 @@ def h3_manhattan_distance(state, problem=None):
     position to its goal position.
     This is the most commonly used heuristic for N-puzzle problems.
     """
-    total_distance = 0
-    for i in range(4):
-        for j in range(4):
-            tile = state.cells[i][j]
-            if tile != 0:
-                goal_row, goal_col = divmod(tile - 1, 4)
-                total_distance += abs(goal_row - i) + abs(goal_col - j)
-    return total_distance
+    return heuristics_for(state)['manhattan_distance'](state, problem)
 
 
 def h4_row_column_misplacements(state, problem=None):
@@ -83,18 +180,48 @@ def h4_row_column_misplacements(state, problem=None):
     Heuristic 4: Row-Column Misplacements
     Sums the number of tiles that are out of their correct row and column.
     """
-    row_misplaced = 0
-    col_misplaced = 0
-    for i in range(4):
-        for j in range(4):
-            tile = state.cells[i][j]
-            if tile != 0:
-                goal_row, goal_col = divmod(tile - 1, 4)
-                if i != goal_row:
-                    row_misplaced += 1
-                if j != goal_col:
-                    col_misplaced += 1
-    return row_misplaced + col_misplaced
+    return heuristics_for(state)['row_column_misplacements'](state, problem)
+
+
+def manhattan_operator_table(rows=4, cols=None, goal=None):
+    """
+    Operator-selection table for the Manhattan distance heuristic.
+
+    Moving the blank from a cell slides the tile on the neighbouring cell
+    into it, so the change in Manhattan distance depends only on the blank
+    position, the move and the tile being slid.  This lets Enhanced Partial
+    Expansion A* know how each move changes h before it builds the successor.
+
+    Args:
+        rows (int): Height of the board
+        cols (int): Width of the board; defaults to rows
+        goal (list): Flat goal layout; defaults to tiles 1..n followed by the
+            blank, the layout h3_manhattan_distance measures against
+
+    Returns:
+        list: For each blank cell (row-major index), a list of
+        (move, neighbourCell, deltas) for every legal move, where
+        deltas[tile] is the change in h caused by sliding that tile
+    """
+    if cols is None:
+        cols = rows
+    size = rows * cols
+    manhattan = goal_tables(rows, cols, goal)['manhattan']
+
+    offsets = [('up', -1, 0), ('down', 1, 0), ('left', 0, -1), ('right', 0, 1)]
+    table = []
+    for cell in range(size):
+        row, col = divmod(cell, cols)
+        operators = []
+        for move, d_row, d_col in offsets:
+            n_row, n_col = row + d_row, col + d_col
+            if not (0 <= n_row < rows and 0 <= n_col < cols):
+                continue
+            neighbour = n_row * cols + n_col
+            deltas = [manhattan[tile][cell] - manhattan[tile][neighbour] for tile in range(size)]
+            operators.append((move, neighbour, deltas))
+        table.append(operators)
+    return table
 
 
 # Dictionary of available heuristics for easy access
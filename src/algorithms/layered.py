@@ -0,0 +1,155 @@
+# layered.py
+# ----------
+# Breadth-first search on packed layers with delayed duplicate detection.
+
+"""
+Layer-by-layer breadth-first search over packed states.
+
+Looking every generated state up in a Python set costs far more than
+generating it.  This engine instead keeps each BFS layer as a sorted NumPy
+array of states packed into uint64 codes.  A whole layer is expanded at
+once, the successors are sorted and deduplicated with np.unique, and the
+states already seen are removed by merging against the previous two
+layers.  That is enough on an undirected graph such as a sliding-tile
+puzzle: a successor of layer d lies in layer d - 1, d or d + 1.
+
+Sliding-tile boards of up to 16 cells are packed four bits per cell, the
+tile on cell i in bits 4i..4i+3.
+"""
+
+import numpy as np
+
+_OFFSETS = [('up', -1, 0), ('down', 1, 0), ('left', 0, -1), ('right', 0, 1)]
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def packTiles(tiles):
+    "Packs a flat board of at most 16 cells into an int, 4 bits per cell"
+    if len(tiles) > 16:
+        raise ValueError("Only boards of at most 16 cells can be packed")
+    code = 0
+    for cell, tile in enumerate(tiles):
+        code |= tile << (4 * cell)
+    return code
+
+
+def unpackTiles(code, cellCount):
+    "Returns the flat board packed into 'code' by packTiles"
+    return tuple((int(code) >> (4 * cell)) & 15 for cell in range(cellCount))
+
+
+def slidingTileSuccessors(codes, rows, cols):
+    """
+    Returns the packed successors of every packed board in 'codes', one per
+    legal blank move, in no particular order and with repeats.
+    """
+    codes = np.asarray(codes, dtype=np.uint64)
+    cellCount = rows * cols
+    shifts = np.arange(cellCount, dtype=np.uint64) * np.uint64(4)
+    nibbles = (codes[:, None] >> shifts) & np.uint64(15)
+    # the blank is the only zero nibble
+    blank = np.argmin(nibbles, axis=1)
+    blankRow, blankCol = blank // cols, blank % cols
+
+    successors = []
+    for move, dRow, dCol in _OFFSETS:
+        valid = ((blankRow + dRow >= 0) & (blankRow + dRow < rows)
+                 & (blankCol + dCol >= 0) & (blankCol + dCol < cols))
+        index = np.nonzero(valid)[0]
+        source = blank[index]
+        target = source + dRow * cols + dCol
+        tile = nibbles[index, target]
+        # slide the tile from 'target' onto the blank at 'source'
+        successors.append(codes[index]
+                          - (tile << (target.astype(np.uint64) * np.uint64(4)))
+                          + (tile << (source.astype(np.uint64) * np.uint64(4))))
+    return np.concatenate(successors)
+
+
+def subtractSorted(values, seen):
+    "Returns the entries of sorted 'values' that are not in sorted 'seen'"
+    if len(seen) == 0 or len(values) == 0:
+        return values
+    index = np.searchsorted(seen, values)
+    index[index == len(seen)] = 0
+    return values[seen[index] != values]
+
+
+def containsSorted(values, code):
+    "Returns True if sorted 'values' contains 'code'"
+    index = np.searchsorted(values, np.uint64(code))
+    return index < len(values) and values[index] == code
+
+
+def expandLayer(layer, successors, chunkSize=DEFAULT_CHUNK_SIZE):
+    """
+    Returns the sorted, duplicate-free successors of a layer, expanding it
+    'chunkSize' states at a time to bound the temporary arrays.
+    """
+    parts = [np.unique(successors(layer[start:start + chunkSize]))
+             for start in range(0, len(layer), chunkSize)]
+    if not parts:
+        return np.empty(0, dtype=np.uint64)
+    return np.unique(np.concatenate(parts)) if len(parts) > 1 else parts[0]
+
+
+def layeredBreadthFirstSearch(start, successors, goal=None, maxDepth=None, keepLayers=True,
+                              chunkSize=DEFAULT_CHUNK_SIZE, onLayer=None):
+    """
+    Breadth-first search from the packed state 'start'.
+
+    successors: maps a uint64 array of packed states to the array of their
+      successors (for example slidingTileSuccessors with the board size)
+    goal: a packed goal; the search stops at the first layer containing it
+    maxDepth: stop after this many layers below the start
+    keepLayers: keep every layer (needed by reconstructPath); otherwise
+      only the last two are kept in memory
+    onLayer: called as onLayer(depth, layer) with each new sorted layer
+
+    Returns (layers, sizes): the kept layers, and the number of states at
+    each depth.  The goal was found if it is in the last layer.
+    """
+    current = np.array([start], dtype=np.uint64)
+    previous = np.empty(0, dtype=np.uint64)
+    layers = [current]
+    sizes = [1]
+    if onLayer is not None:
+        onLayer(0, current)
+
+    depth = 0
+    while len(current) and (maxDepth is None or depth < maxDepth):
+        if goal is not None and containsSorted(current, goal):
+            break
+        nextLayer = expandLayer(current, successors, chunkSize)
+        nextLayer = subtractSorted(subtractSorted(nextLayer, current), previous)
+        if len(nextLayer) == 0:
+            break
+        depth += 1
+        previous, current = current, nextLayer
+        sizes.append(len(current))
+        if keepLayers:
+            layers.append(current)
+        else:
+            layers = [previous, current]
+        if onLayer is not None:
+            onLayer(depth, current)
+    return layers, sizes
+
+
+def reconstructPath(layers, goal, successors):
+    """
+    Returns the packed states of a shortest path from the start (layers[0])
+    to 'goal', which must be in the last layer.  Walks backwards, picking at
+    each depth a state of the previous layer that is a neighbour; moves are
+    reversible, so the neighbours of a state are its predecessors.
+    """
+    path = [np.uint64(goal)]
+    for layer in reversed(layers[:-1]):
+        neighbours = successors(np.array([path[-1]], dtype=np.uint64))
+        index = np.searchsorted(layer, neighbours)
+        index[index == len(layer)] = 0
+        found = neighbours[layer[index] == neighbours]
+        path.append(found[0])
+    path.reverse()
+    return [int(code) for code in path]
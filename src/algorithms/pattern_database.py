@@ -0,0 +1,315 @@
+# pattern_database.py
+# -------------------
+# Pattern databases for the sliding-tile puzzles, and a parallel builder.
+
+"""
+Pattern databases (PDBs) for sliding-tile puzzles.
+
+A pattern database abstracts a board to the cells of a few pattern tiles
+and the blank, ignoring every other tile.  The distance of each abstract
+board to the abstract goal, found by one breadth-first search, is an
+admissible and consistent heuristic for the full puzzle.  An abstract board
+with k pattern tiles on n cells is ranked as a partial permutation of k + 1
+cells out of n (the pattern tiles' cells in pattern order, then the blank's),
+so the table is a flat array of n! / (n - k - 1)! bytes.
+
+The builder expands each BFS layer in parallel: the rank range is split
+between a pool of processes that all write into one table in shared
+memory.  Workers only ever write the next depth into unseen entries, so
+their concurrent writes agree.  After each layer the table and depth are
+checkpointed, and an interrupted build resumes from the last full layer.
+
+Build a database from the command line:
+
+    python src/algorithms/pattern_database.py --pattern 1,2,3,4,5 output.pdb
+
+On-disk format, little-endian:
+
+    magic b'NPDB', version (uint16), rows, cols, pattern size k (uint8 each),
+    k pattern tiles (uint8), rows * cols goal tiles (uint8),
+    entry count (uint64), then one distance byte per rank
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+if __name__ == '__main__':
+    # Allow running this file directly as a script from the repository root.
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import util
+
+MAGIC = b'NPDB'
+VERSION = 1
+UNSEEN = 255
+
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+_HEADER = struct.Struct('<4sHBBB')
+
+
+class PatternDatabase:
+    """
+      Exact distances of the abstract boards of one tile pattern.
+
+      distances[rank] is the distance to the goal of the abstract board with
+      that rank (see rankOf), or UNSEEN for boards the search did not reach.
+    """
+
+    def __init__(self, rows, cols, pattern, goal, distances):
+        self.rows = rows
+        self.cols = cols
+        self.pattern = tuple(pattern)
+        self.goal = tuple(goal)
+        self.distances = distances
+        expected = util.permutationCount(rows * cols, len(self.pattern) + 1)
+        if len(distances) != expected:
+            raise ValueError(f"Expected {expected} entries, got {len(distances)}")
+
+    def rankOf(self, tiles):
+        "Returns the rank of the abstract board of a flat board 'tiles'"
+        cells = [0] * len(tiles)
+        for cell, tile in enumerate(tiles):
+            cells[tile] = cell
+        return util.rankPartialPermutation([cells[tile] for tile in self.pattern] + [cells[0]],
+                                           self.rows * self.cols)
+
+    def distance(self, state):
+        "Returns the pattern distance of a SlidingPuzzleState or flat board"
+        return self.distances[self.rankOf(getattr(state, 'tiles', state))]
+
+    def heuristic(self, state, problem=None):
+        "The pattern distance, as a heuristic for the searches"
+        return self.distances[self.rankOf(state.tiles)]
+
+    def histogram(self):
+        "Returns the number of abstract boards at each distance"
+        counts = [int(count) for count in np.bincount(np.frombuffer(self.distances, dtype=np.uint8),
+                                                      minlength=UNSEEN + 1)[:UNSEEN]]
+        while counts and counts[-1] == 0:
+            counts.pop()
+        return counts
+
+    def save(self, path):
+        "Writes the database in the on-disk format described above"
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, self.rows, self.cols, len(self.pattern)))
+            file.write(bytes(self.pattern))
+            file.write(bytes(self.goal))
+            file.write(struct.pack('<Q', len(self.distances)))
+            file.write(self.distances)
+
+    @classmethod
+    def load(cls, path):
+        "Reads a database written by save"
+        with open(path, 'rb') as file:
+            magic, version, rows, cols, size = _HEADER.unpack(file.read(_HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} pattern database")
+            pattern = tuple(file.read(size))
+            goal = tuple(file.read(rows * cols))
+            count, = struct.unpack('<Q', file.read(8))
+            distances = bytearray(file.read(count))
+        return cls(rows, cols, pattern, goal, distances)
+
+
+def _abstractSuccessors(ranks, rows, cols, patternSize):
+    "Returns the ranks of the successors of abstract boards, with repeats"
+    cellCount = rows * cols
+    boards = util.unrankPartialPermutations(ranks, patternSize + 1, cellCount)
+    blank = boards[:, -1]
+    blankRow, blankCol = blank // cols, blank % cols
+    successors = []
+    for dRow, dCol in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        valid = ((blankRow + dRow >= 0) & (blankRow + dRow < rows)
+                 & (blankCol + dCol >= 0) & (blankCol + dCol < cols))
+        moved = boards[valid]
+        source = blank[valid]
+        target = source + dRow * cols + dCol
+        # a pattern tile on the target cell slides onto the blank's cell
+        tiles = moved[:, :-1]
+        hit = tiles == target[:, None]
+        tiles[hit] = np.broadcast_to(source[:, None], tiles.shape)[hit]
+        moved[:, -1] = target
+        successors.append(util.rankPartialPermutations(moved, cellCount))
+    return np.concatenate(successors)
+
+
+def _expandRange(task):
+    """
+    Expands the boards at 'depth' with ranks in [first, last) of the shared
+    table, marking unseen successors with depth + 1.  Runs in a worker.
+    Returns the number of boards expanded.
+    """
+    name, size, rows, cols, patternSize, depth, first, last, chunkSize = task
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        table = np.ndarray((size,), dtype=np.uint8, buffer=memory.buf)
+        expanded = 0
+        for begin in range(first, last, chunkSize):
+            end = min(begin + chunkSize, last)
+            frontier = np.nonzero(table[begin:end] == depth)[0].astype(np.int64) + begin
+            if len(frontier) == 0:
+                continue
+            expanded += len(frontier)
+            successors = np.unique(_abstractSuccessors(frontier, rows, cols, patternSize))
+            fresh = successors[table[successors] == UNSEEN]
+            table[fresh] = depth + 1
+        del table
+        return expanded
+    finally:
+        memory.close()
+
+
+def _saveCheckpoint(directory, table, depth, histogram, config):
+    """
+    Saves the table, the finished depth and the build's 'config' (rows,
+    cols, pattern and goal), each file replaced atomically
+    """
+    tablePath = os.path.join(directory, 'table.bin')
+    table.tofile(tablePath + '.tmp')
+    os.replace(tablePath + '.tmp', tablePath)
+    statePath = os.path.join(directory, 'checkpoint.json')
+    with open(statePath + '.tmp', 'w') as file:
+        json.dump(dict(config, depth=depth, histogram=histogram), file)
+    os.replace(statePath + '.tmp', statePath)
+
+
+def _loadCheckpoint(directory, size, config):
+    """
+    Returns (table, depth, histogram) of a checkpoint, or None.  Raises
+    ValueError if the checkpoint was saved for another build 'config'.
+    """
+    statePath = os.path.join(directory, 'checkpoint.json')
+    if not os.path.exists(statePath):
+        return None
+    with open(statePath) as file:
+        state = json.load(file)
+    saved = {key: state.get(key) for key in config}
+    if saved != config:
+        raise ValueError(f"The checkpoint in {directory} is for a different pattern database: {saved}, "
+                         f"expected {config}")
+    table = np.fromfile(os.path.join(directory, 'table.bin'), dtype=np.uint8)
+    if len(table) != size:
+        raise ValueError(f"The checkpoint table in {directory} has {len(table)} entries, expected {size}")
+    return table, state['depth'], state['histogram']
+
+
+def buildPatternDatabase(rows, cols, pattern, goal=None, workers=1, checkpointDir=None,
+                         chunkSize=DEFAULT_CHUNK_SIZE, onLayer=None):
+    """
+    Builds the pattern database of 'pattern' (a list of tiles) for a
+    rows x cols puzzle with the given flat goal (default: blank last).
+
+    workers: number of processes expanding each layer (1 runs in-process)
+    checkpointDir: directory for per-layer checkpoints; a build started on
+      a directory with a checkpoint resumes after its last finished layer
+    onLayer: called as onLayer(depth, count, seconds) after each layer,
+      with the number of boards found and the time the layer took
+    """
+    cellCount = rows * cols
+    if goal is None:
+        goal = list(range(1, cellCount)) + [0]
+    if 0 in pattern or len(set(pattern)) != len(pattern):
+        raise ValueError("The pattern must list distinct, non-blank tiles")
+    size = util.permutationCount(cellCount, len(pattern) + 1)
+
+    database = PatternDatabase(rows, cols, pattern, goal, bytearray(size))
+    memory = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        table = np.ndarray((size,), dtype=np.uint8, buffer=memory.buf)
+        config = {'rows': rows, 'cols': cols, 'pattern': list(pattern), 'goal': list(goal)}
+        checkpoint = _loadCheckpoint(checkpointDir, size, config) if checkpointDir else None
+        if checkpoint is None:
+            table[:] = UNSEEN
+            table[database.rankOf(goal)] = 0
+            depth, histogram = 0, [1]
+            if checkpointDir:
+                os.makedirs(checkpointDir, exist_ok=True)
+                _saveCheckpoint(checkpointDir, table, depth, histogram, config)
+        else:
+            saved, depth, histogram = checkpoint
+            table[:] = saved
+            del saved
+
+        # split the ranks into a few ranges per worker to balance the load
+        parts = max(1, workers * 4)
+        bounds = [size * part // parts for part in range(parts + 1)]
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while True:
+                started = time.time()
+                tasks = [(memory.name, size, rows, cols, len(pattern), depth, first, last, chunkSize)
+                         for first, last in zip(bounds, bounds[1:]) if first < last]
+                if pool is None:
+                    for task in tasks:
+                        _expandRange(task)
+                else:
+                    list(pool.map(_expandRange, tasks))
+                found = int(np.count_nonzero(table == depth + 1))
+                if found == 0:
+                    break
+                depth += 1
+                histogram.append(found)
+                if checkpointDir:
+                    _saveCheckpoint(checkpointDir, table, depth, histogram, config)
+                if onLayer is not None:
+                    onLayer(depth, found, time.time() - started)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        database.distances[:] = table.tobytes()
+        del table
+    finally:
+        memory.close()
+        memory.unlink()
+    return database
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a sliding-tile pattern database.")
+    parser.add_argument('output', help="file to write the database to")
+    parser.add_argument('--pattern', required=True, help="comma-separated pattern tiles, e.g. 1,2,3,4,5")
+    parser.add_argument('--rows', type=int, default=4)
+    parser.add_argument('--cols', type=int, default=None, help="defaults to --rows")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--checkpoint-dir', default=None,
+                        help="directory for per-layer checkpoints (default: OUTPUT.checkpoint)")
+    args = parser.parse_args(argv)
+
+    cols = args.cols or args.rows
+    pattern = [int(tile) for tile in args.pattern.split(',')]
+    checkpointDir = args.checkpoint_dir or args.output + '.checkpoint'
+    size = util.permutationCount(args.rows * cols, len(pattern) + 1)
+    print(f"Building a {args.rows}x{cols} pattern database for tiles {pattern}: "
+          f"{size} entries, {args.workers} worker(s)")
+
+    started = time.time()
+    total = [0]
+
+    def report(depth, count, seconds):
+        total[0] += count
+        print(f"depth {depth:3d}: {count:12d} new  {total[0] / size:6.1%} done  "
+              f"{count / max(seconds, 1e-9):12.0f} states/s  {time.time() - started:8.1f}s")
+        sys.stdout.flush()
+
+    database = buildPatternDatabase(args.rows, cols, pattern, workers=args.workers,
+                                    checkpointDir=checkpointDir, onLayer=report)
+    database.save(args.output)
+    for name in ('table.bin', 'checkpoint.json'):
+        os.remove(os.path.join(checkpointDir, name))
+    os.rmdir(checkpointDir)
+    print(f"Saved {args.output} in {time.time() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+# perimeter.py
+# ------------
+# Perimeter search support for the sliding-tile puzzles.
+
+"""
+Perimeter databases for solving many queries towards one fixed goal.
+
+A PerimeterDatabase holds every state within 'depth' moves of the goal, with
+its exact distance and the first move of a shortest path to the goal.  It is
+built once by a breadth-first search backwards from the goal, saved to disk
+and shared by every later solve: a search may stop as soon as it reaches the
+perimeter, and every state outside it is known to be more than 'depth' moves
+from the goal.
+"""
+
+import os
+import pickle
+
+REVERSE_MOVES = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+
+
+def stateKey(state):
+    "Returns a hashable, picklable key for a puzzle state: its tiles in row order"
+    return state.tiles
+
+
+class PerimeterDatabase:
+    """
+      The states within a fixed distance of the goal.
+
+      distances maps stateKey(state) to the exact number of moves to the goal,
+      and moves maps it to the first move of a shortest path (None at the goal).
+    """
+
+    def __init__(self, goalKey, depth, distances, moves):
+        self.goalKey = goalKey
+        self.depth = depth
+        self.distances = distances
+        self.moves = moves
+
+    @classmethod
+    def build(cls, goalState, depth):
+        """
+        Builds the perimeter of 'goalState' by breadth-first search from the
+        goal.  Puzzle moves are reversible, so the search can follow
+        legalMoves/result forwards and record the reverse of each move.
+        """
+        goalKey = stateKey(goalState)
+        distances = {goalKey: 0}
+        moves = {goalKey: None}
+        layer = [goalState]
+        for distance in range(1, depth + 1):
+            nextLayer = []
+            for state in layer:
+                for move in state.legalMoves():
+                    successor = state.result(move)
+                    key = stateKey(successor)
+                    if key not in distances:
+                        distances[key] = distance
+                        moves[key] = REVERSE_MOVES[move]
+                        nextLayer.append(successor)
+            layer = nextLayer
+        return cls(goalKey, depth, distances, moves)
+
+    def save(self, path):
+        "Writes the database to 'path'"
+        with open(path, 'wb') as file:
+            pickle.dump((self.goalKey, self.depth, self.distances, self.moves), file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        "Reads a database written by save"
+        with open(path, 'rb') as file:
+            goalKey, depth, distances, moves = pickle.load(file)
+        return cls(goalKey, depth, distances, moves)
+
+    def __len__(self):
+        return len(self.distances)
+
+    def checkGoal(self, state):
+        """
+        Raises ValueError unless 'state' is a puzzle with the goal this
+        perimeter was built for; distances to another goal are meaningless.
+        """
+        if tuple(state.goal) != self.goalKey:
+            raise ValueError(f"The perimeter was built for the goal {self.goalKey}, "
+                             f"not {tuple(state.goal)}")
+
+    def contains(self, state):
+        "Returns True if 'state' is within the perimeter"
+        return stateKey(state) in self.distances
+
+    def distance(self, state):
+        "Returns the exact distance of a perimeter state to the goal"
+        return self.distances[stateKey(state)]
+
+    def pathToGoal(self, state):
+        "Returns a shortest list of moves from a perimeter state to the goal"
+        actions = []
+        move = self.moves[stateKey(state)]
+        while move is not None:
+            actions.append(move)
+            state = state.result(move)
+            move = self.moves[stateKey(state)]
+        return actions
+
+    def heuristic(self, heuristic):
+        """
+        Wraps 'heuristic' with the perimeter: states inside it get their exact
+        distance, and states outside it at least depth + 1.  The result stays
+        admissible whenever 'heuristic' is.
+        """
+        distances = self.distances
+        outside = self.depth + 1
+
+        def perimeterHeuristic(state, problem=None):
+            distance = distances.get(stateKey(state))
+            if distance is not None:
+                return distance
+            return max(heuristic(state, problem), outside)
+
+        return perimeterHeuristic
+
+
+_loadedPerimeters = {}
+
+
+def loadPerimeter(path, goalState=None, depth=12):
+    """
+    Returns the perimeter database stored at 'path', reading each file only
+    once per process.  If the file does not exist yet and 'goalState' is
+    given, the database is built to 'depth' and saved there first, so later
+    runs pay nothing for it.  With 'goalState', a database found for another
+    goal or depth raises ValueError.
+    """
+    path = os.path.abspath(path)
+    if path not in _loadedPerimeters:
+        if not os.path.exists(path):
+            if goalState is None:
+                raise FileNotFoundError(f"No perimeter database at {path}")
+            PerimeterDatabase.build(goalState, depth).save(path)
+        _loadedPerimeters[path] = PerimeterDatabase.load(path)
+    perimeter = _loadedPerimeters[path]
+    if goalState is not None and (perimeter.goalKey, perimeter.depth) != (stateKey(goalState), depth):
+        raise ValueError(f"{path} holds the perimeter of {perimeter.goalKey} to depth {perimeter.depth}, "
+                         f"not of {stateKey(goalState)} to depth {depth}")
+    return perimeter
@@ -0,0 +1,170 @@
+# pruning.py
+# ----------
+# Move pruning for depth-first searches.
+
+"""
+Move pruning with a duplicate-detecting finite-state machine.
+
+A MovePruner is an automaton over action names that rejects any move sequence
+containing a forbidden substring.  The forbidden substrings are the short
+cycles of the domain -- move sequences that lead back to a state already on
+the path, such as 'up' followed by 'down'.  They are found once by a bounded
+breadth-first enumeration of move sequences, so depth-first searches can skip
+those successors without storing any visited states.
+"""
+
+from collections import deque
+
+
+class MovePruner:
+    """
+      Finite-state machine that recognises forbidden move sequences.
+
+      Walk it alongside a search path: start from MovePruner.START and call
+      step(machineState, action) for every move.  The result is the machine
+      state after the move, or MovePruner.PRUNED if the path now ends with a
+      forbidden sequence and the move should be skipped.
+    """
+    START = 0
+    PRUNED = -1
+
+    def __init__(self, actions, forbidden):
+        """
+          actions: every action name the domain uses
+          forbidden: an iterable of forbidden action sequences
+        """
+        self.actions = list(actions)
+        self.forbidden = [tuple(sequence) for sequence in forbidden]
+
+        # trie of the forbidden sequences (Aho-Corasick goto function)
+        goto = [{}]
+        terminal = [False]
+        for sequence in self.forbidden:
+            node = 0
+            for action in sequence:
+                if action not in goto[node]:
+                    goto.append({})
+                    terminal.append(False)
+                    goto[node][action] = len(goto) - 1
+                node = goto[node][action]
+            terminal[node] = True
+
+        # breadth-first over the trie to fill in failure links, turning the
+        # trie into a complete transition table
+        self.transitions = [dict() for _ in goto]
+        fail = [0] * len(goto)
+        queue = deque()
+        for action in self.actions:
+            child = goto[0].get(action)
+            if child is None:
+                self.transitions[0][action] = 0
+            else:
+                self.transitions[0][action] = child
+                queue.append(child)
+        while queue:
+            node = queue.popleft()
+            terminal[node] = terminal[node] or terminal[fail[node]]
+            for action in self.actions:
+                child = goto[node].get(action)
+                if child is None:
+                    self.transitions[node][action] = self.transitions[fail[node]][action]
+                else:
+                    fail[child] = self.transitions[fail[node]][action]
+                    self.transitions[node][action] = child
+                    queue.append(child)
+
+        for node in range(len(self.transitions)):
+            for action in self.actions:
+                if terminal[self.transitions[node][action]]:
+                    self.transitions[node][action] = self.PRUNED
+
+    def step(self, machineState, action):
+        """
+        Returns the machine state after 'action', or PRUNED if the move
+        completes a forbidden sequence.
+        """
+        return self.transitions[machineState][action]
+
+    def allows(self, actions):
+        "Returns True if no forbidden sequence occurs in 'actions'"
+        machineState = self.START
+        for action in actions:
+            machineState = self.step(machineState, action)
+            if machineState == self.PRUNED:
+                return False
+        return True
+
+    @classmethod
+    def fromCycles(cls, startState, successors, depth):
+        """
+          startState: a hashable domain state
+          successors: function state -> list of (action, nextState)
+          depth: longest cycle to look for
+
+        Enumerates move sequences from 'startState' breadth-first and forbids
+        every sequence that ends on a state already visited along it.  The
+        cycles found must not depend on where they start, so 'startState'
+        should leave room for every sequence of length 'depth' (for a sliding
+        puzzle: the blank at least 'depth' cells away from each edge).
+        """
+        actions = []
+        forbidden = []
+        # membership tests; the lists keep the order the moves were found in
+        seenActions = set()
+        seenCycles = set()
+        layer = [((), (startState,))]
+        for _ in range(depth):
+            nextLayer = []
+            for sequence, path in layer:
+                for action, nextState in successors(path[-1]):
+                    if action not in seenActions:
+                        seenActions.add(action)
+                        actions.append(action)
+                    extended = sequence + (action,)
+                    if nextState in path:
+                        # the cycle is the suffix that starts at the repeated state
+                        cycle = extended[path.index(nextState):]
+                        if cycle not in seenCycles:
+                            seenCycles.add(cycle)
+                            forbidden.append(cycle)
+                    else:
+                        nextLayer.append((extended, path + (nextState,)))
+            layer = nextLayer
+        return cls(actions, forbidden)
+
+
+_MOVES = [('up', -1, 0), ('down', 1, 0), ('left', 0, -1), ('right', 0, 1)]
+
+_slidingTilePruners = {}
+
+
+def slidingTilePruner(depth=4):
+    """
+    Returns the move pruner for sliding-tile puzzles of any size, which
+    forbids every cycle of at most 'depth' blank moves.  Pruners are built
+    once per depth and shared.
+
+    Depth 2 already captures moves that undo the previous one; the shortest
+    longer cycle of a sliding puzzle takes the blank three times around a
+    2x2 block (12 moves).
+    """
+    if depth not in _slidingTilePruners:
+        width = 2 * depth + 1
+
+        def successors(state):
+            cells, blank = state
+            row, col = divmod(blank, width)
+            result = []
+            for move, dRow, dCol in _MOVES:
+                newRow, newCol = row + dRow, col + dCol
+                if 0 <= newRow < width and 0 <= newCol < width:
+                    target = newRow * width + newCol
+                    newCells = list(cells)
+                    newCells[blank], newCells[target] = newCells[target], newCells[blank]
+                    result.append((move, (tuple(newCells), target)))
+            return result
+
+        centre = depth * width + depth
+        start = (tuple(range(width * width)), centre)
+        _slidingTilePruners[depth] = MovePruner.fromCycles(start, successors, depth)
+    return _slidingTilePruners[depth]
@@ -17,7 +17,13 @@ In search.py, we implement generic search algorithms which are called by
 Pacman agents (in searchAgents.py).
 """
 
-import util
+from time import perf_counter, perf_counter_ns
+
+from utils import util
+from algorithms import layered, external
+# The heuristics live in heuristics.py; these names are kept for older imports.
+from algorithms.heuristics import (h1_misplaced_tiles, h2_euclidean_distance,
+                                   h3_manhattan_distance, h4_row_column_misplacements)
 
 
 class SearchProblem:
@@ -60,6 +66,310 @@ class SearchProblem:
         """
         util.raiseNotDefined()
 
+    def getActions(self, state):
+        """
+          state: Search state
+
+        Returns the actions that are legal in 'state'.  The default reads them
+        off getSuccessors; problems should override it when listing actions is
+        cheaper than building every successor.
+        """
+        return [succAction for succState, succAction, succCost in self.getSuccessors(state)]
+
+    def getResult(self, state, action):
+        """
+          state: Search state
+          action: An action that is legal in 'state'
+
+        Returns the successor reached by taking 'action' in 'state'.  The
+        default looks the action up in getSuccessors; problems that can build
+        a single successor cheaply should override it.
+        """
+        for succState, succAction, succCost in self.getSuccessors(state):
+            if succAction == action:
+                return succState
+        raise ValueError("Illegal action: %s" % action)
+
+    def getOperatorDeltas(self, state):
+        """
+          state: Search state
+
+        Returns a list of triples, (action, stepCost, deltaH), one for every
+        legal action, where 'deltaH' is the change in heuristic value the
+        action causes.  It lets enhancedPartialExpansionAStarSearch decide
+        which successors to build without building them.
+        """
+        util.raiseNotDefined()
+
+    def getMovePruner(self):
+        """
+        Returns a pruning.MovePruner recognising the move sequences that only
+        lead back to an earlier state, or None if the problem has none.
+        Depth-first searches use it to skip those successors.
+        """
+        return None
+
+
+class SearchStats:
+    """
+    What every search returns: the actions it found and counts of the work
+    it did to find them.
+
+      actions: the moves from the start state to a goal, [] if none was found
+      solved: whether a goal was reached
+      nodesExpanded: nodes whose successors were generated
+      nodesGenerated: successor nodes built
+      duplicates: nodes dropped because their state had already been reached
+        at no greater cost, whether when generated or when popped
+      reopenings: states expanded again after a cheaper path to them was found
+      maxOpen: peak number of nodes on the fringe (for IDA*, the deepest path)
+      maxClosed: peak number of states kept for duplicate detection (for
+        IDA*, the entries of its transposition table)
+      heuristicCalls: heuristic evaluations
+      heuristicTime: seconds spent in the heuristic
+      wallTime: seconds the whole search took
+      iterations: depth-first iterations of IDA*, 1 for the other searches
+      tableProbes, tableHits, tableHitRate: lookups in the transposition
+        table of IDA*, the lookups that found a bound, and their ratio; 0
+        without a table
+      profile: the PhaseProfile of a search run with profiling, else None
+    """
+    FIELDS = ('actions', 'solved', 'nodesExpanded', 'nodesGenerated', 'duplicates', 'reopenings',
+              'maxOpen', 'maxClosed', 'heuristicCalls', 'heuristicTime', 'wallTime', 'iterations', 'tableProbes', 'tableHits', 'tableHitRate',
+              'profile')
+    __slots__ = FIELDS
+
+    def __init__(self, actions=(), solved=False, profile=None, **counts):
+        self.actions = list(actions)
+        self.solved = solved
+        self.profile = profile
+        for field in self.FIELDS[2:-1]:
+            setattr(self, field, counts.pop(field, 0))
+        if counts:
+            raise TypeError(f"Unknown search statistics: {', '.join(sorted(counts))}")
+
+    @property
+    def depth(self):
+        "Length of the solution, or None if no goal was reached"
+        return len(self.actions) if self.solved else None
+
+    def asDict(self):
+        stats = {field: getattr(self, field) for field in self.FIELDS}
+        if self.profile is not None:
+            stats['profile'] = self.profile.asDict()
+        return stats
+
+    def __repr__(self):
+        return 'SearchStats(' + ', '.join(f'{field}={getattr(self, field)!r}' for field in self.FIELDS) + ')'
+
+
+class CountingHeuristic:
+    """
+    Wraps a heuristic to count its calls and the time spent in them, two
+    counter updates and two clock reads per call.
+    """
+    __slots__ = ('heuristic', 'calls', 'nanoseconds')
+
+    def __init__(self, heuristic):
+        self.heuristic = heuristic
+        self.calls = 0
+        self.nanoseconds = 0
+
+    def __call__(self, state, problem=None):
+        start = perf_counter_ns()
+        value = self.heuristic(state, problem)
+        self.nanoseconds += perf_counter_ns() - start
+        self.calls += 1
+        return value
+
+
+DEFAULT_PROFILE_INTERVAL = 1024
+
+
+class PhaseProfile:
+    """
+    Sampled timings of the phases of a best-first search's main loop.
+
+    One iteration of the loop in every 'interval', starting with the first,
+    is timed phase by phase with perf_counter_ns; an iteration runs from one
+    pop of the fringe to the next.  The phases are:
+
+      successors: building successors (getSuccessors, getOperatorDeltas
+        and getResult)
+      hashing: closed-list lookups and stores, which hash and compare states
+      heuristic: heuristic evaluations
+      queue: pushes to, updates of and pops from the fringe
+      other: the rest of the sampled iterations, such as the goal test and
+        building the nodes
+
+    The profile is collected through wrappers around the problem, the
+    heuristic, the fringe and the closed list, which only read the clock in
+    sampled iterations.  A search run without a profile has no wrappers.
+    """
+    PHASES = ('successors', 'hashing', 'heuristic', 'queue', 'other')
+
+    def __init__(self, interval=DEFAULT_PROFILE_INTERVAL):
+        if interval < 1:
+            raise ValueError("The sampling interval must be at least 1")
+        self.interval = interval
+        self.iterations = 0
+        self.samples = 0
+        self.nanoseconds = dict.fromkeys(self.PHASES[:-1], 0)
+        self.sampledTime = 0
+        self.active = False
+        self._countdown = 1
+        self._iterationStart = 0
+
+    def startIteration(self):
+        "Ends the iteration being sampled, if any, and decides whether to sample the next"
+        now = perf_counter_ns()
+        if self.active:
+            self.sampledTime += now - self._iterationStart
+        self.iterations += 1
+        self._countdown -= 1
+        self.active = self._countdown == 0
+        if self.active:
+            self._countdown = self.interval
+            self.samples += 1
+            self._iterationStart = now
+
+    def finish(self):
+        "Ends the iteration being sampled when the search stops"
+        if self.active:
+            self.sampledTime += perf_counter_ns() - self._iterationStart
+            self.active = False
+
+    def timed(self, phase, function, *args):
+        "Calls function(*args), adding its time to 'phase' in sampled iterations"
+        if not self.active:
+            return function(*args)
+        start = perf_counter_ns()
+        value = function(*args)
+        self.nanoseconds[phase] += perf_counter_ns() - start
+        return value
+
+    def breakdown(self):
+        """
+        Returns {phase: (nanoseconds per sampled iteration, share of the
+        sampled time)} for every phase.
+        """
+        totals = dict(self.nanoseconds)
+        totals['other'] = max(0, self.sampledTime - sum(self.nanoseconds.values()))
+        return {phase: (totals[phase] / self.samples if self.samples else 0.0,
+                        totals[phase] / self.sampledTime if self.sampledTime else 0.0)
+                for phase in self.PHASES}
+
+    def asDict(self):
+        return {
+            'interval': self.interval,
+            'iterations': self.iterations,
+            'samples': self.samples,
+            'phases': {phase: {'nsPerIteration': perIteration, 'share': share}
+                       for phase, (perIteration, share) in self.breakdown().items()},
+        }
+
+    def __str__(self):
+        lines = ['%d of %d iterations sampled (1 in %d)' % (self.samples, self.iterations, self.interval)]
+        for phase, (perIteration, share) in self.breakdown().items():
+            lines.append('  %-10s %10.0f ns/iteration %6.1f%%' % (phase, perIteration, share * 100))
+        return '\n'.join(lines)
+
+
+class _ProfiledProblem:
+    "Delegates to a problem, timing successor generation"
+
+    def __init__(self, problem, profile):
+        self._problem = problem
+        self._profile = profile
+
+    def __getattr__(self, name):
+        value = getattr(self._problem, name)
+        if callable(value):
+            # keep the method, such as isGoalState, for the next calls
+            setattr(self, name, value)
+        return value
+
+    def getSuccessors(self, state):
+        return self._profile.timed('successors', self._problem.getSuccessors, state)
+
+    def getOperatorDeltas(self, state):
+        return self._profile.timed('successors', self._problem.getOperatorDeltas, state)
+
+    def getResult(self, state, action):
+        return self._profile.timed('successors', self._problem.getResult, state, action)
+
+
+class _ProfiledQueue:
+    "Delegates to a fringe, timing its operations; every pop starts an iteration"
+
+    def __init__(self, queue, profile):
+        self._queue = queue
+        self._profile = profile
+
+    def __getattr__(self, name):
+        return getattr(self._queue, name)
+
+    @property
+    def heap(self):
+        return self._queue.heap
+
+    def isEmpty(self):
+        return self._queue.isEmpty()
+
+    def push(self, item, priority):
+        self._profile.timed('queue', self._queue.push, item, priority)
+
+    def update(self, item, priority):
+        self._profile.timed('queue', self._queue.update, item, priority)
+
+    def pop(self):
+        self._profile.startIteration()
+        return self._profile.timed('queue', self._queue.pop)
+
+
+class _ProfiledClosed(dict):
+    "A closed list (state: cost) whose lookups and stores are timed"
+
+    def __init__(self, profile):
+        dict.__init__(self)
+        self._profile = profile
+
+    def get(self, state, default=None):
+        return self._profile.timed('hashing', dict.get, self, state, default)
+
+    def __contains__(self, state):
+        return self._profile.timed('hashing', dict.__contains__, self, state)
+
+    def __getitem__(self, state):
+        return self._profile.timed('hashing', dict.__getitem__, self, state)
+
+    def __setitem__(self, state, cost):
+        self._profile.timed('hashing', dict.__setitem__, self, state, cost)
+
+
+def _finishProfile(profile):
+    "Ends the sampling of 'profile', if the search has one, and returns it"
+    if profile is not None:
+        profile.finish()
+    return profile
+
+
+def _instrument(interval, problem, heuristic, fringe):
+    """
+    Returns (profile, problem, heuristic, fringe, closed list) for a
+    best-first search: with a sampling 'interval', a new PhaseProfile and
+    the timed wrappers; with None, no profile and the arguments unchanged.
+    """
+    if interval is None:
+        return None, problem, heuristic, fringe, {}
+    profile = PhaseProfile(interval)
+
+    def timedHeuristic(state, problem=None):
+        return profile.timed('heuristic', heuristic, state, problem)
+
+    return (profile, _ProfiledProblem(problem, profile), timedHeuristic, _ProfiledQueue(fringe, profile),
+            _ProfiledClosed(profile))
+
 
 def tinyMazeSearch(problem):
     """
@@ -79,6 +389,21 @@ def nullHeuristic(state, problem=None):
     return 0
 
 
+def prunedSuccessors(problem, state, pruner, machineState):
+    """
+    Returns (successor, action, stepCost, nextMachineState) for the actions in
+    'state' that the move pruner allows after reaching 'machineState'.  Pruned
+    successors are never built.
+    """
+    successors = []
+    for action in problem.getActions(state):
+        nextMachineState = pruner.step(machineState, action)
+        if nextMachineState != pruner.PRUNED:
+            succState = problem.getResult(state, action)
+            successors.append((succState, action, problem.getCostOfActions([action]), nextMachineState))
+    return successors
+
+
 # =====Start Change Task 2 & 3 & 4=====
 def depthFirstSearch(problem):
     """Search the deepest nodes in the search tree first."""
@@ -86,40 +411,55 @@ def depthFirstSearch(problem):
     # states to be explored (LIFO). holds nodes in form (state, action)
     frontier = util.Stack()
     # previously explored states (for path checking), holds states
-    exploredNodes = []
+    exploredNodes = set()
 
     max_depth = 10  # Set a maximum depth to prevent infinite loops
 
+    # skips move sequences that only return to an earlier state
+    pruner = problem.getMovePruner()
+
+    startTime = perf_counter()
     maxFringeSize = 0
     nodesExpanded = 0
+    nodesGenerated = 0
+    duplicates = 0
     # define start node
     startState = problem.getStartState()
-    startNode = (startState, [],0)
+    startNode = (startState, [], 0, pruner.START if pruner else None)
 
     frontier.push(startNode)
 
     while not frontier.isEmpty():
         maxFringeSize = max(maxFringeSize, len(frontier.list))
         # begin exploring last (most-recently-pushed) node on frontier
-        currentState, actions, current_depth = frontier.pop()
-        nodesExpanded += 1
+        currentState, actions, current_depth, machineState = frontier.pop()
 
-        if currentState not in exploredNodes:
+        if currentState in exploredNodes:
+            duplicates += 1
+        else:
             # mark current node as explored
-            exploredNodes.append(currentState)
+            exploredNodes.add(currentState)
 
             if problem.isGoalState(currentState):
-                return actions, maxFringeSize, nodesExpanded
+                return SearchStats(actions, True, nodesExpanded=nodesExpanded, nodesGenerated=nodesGenerated,
+                                   duplicates=duplicates, maxOpen=maxFringeSize, maxClosed=len(exploredNodes),
+                                   wallTime=perf_counter() - startTime, iterations=1)
             else:
+                nodesExpanded += 1
                 # get list of possible successor nodes in
-                # form (successor, action, stepCost)
-                successors = problem.getSuccessors(currentState)
+                # form (successor, action, stepCost, machineState)
+                if pruner is None:
+                    successors = [(succState, succAction, succCost, None)
+                                  for succState, succAction, succCost in problem.getSuccessors(currentState)]
+                else:
+                    successors = prunedSuccessors(problem, currentState, pruner, machineState)
+                nodesGenerated += len(successors)
 
                 # push each successor to frontier
-                for succState, succAction, succCost in successors:
+                for succState, succAction, succCost, succMachineState in successors:
                     newAction = actions + [succAction]
                     new_depth = current_depth + 1
-                    newNode = (succState, newAction,new_depth)
+                    newNode = (succState, newAction, new_depth, succMachineState)
 
                     # Prevent exceeding the maximum depth
                     if new_depth <= max_depth:
@@ -127,20 +467,39 @@ def depthFirstSearch(problem):
 
 
 
-    return [], maxFringeSize, nodesExpanded
+    return SearchStats([], False, nodesExpanded=nodesExpanded, nodesGenerated=nodesGenerated,
+                       duplicates=duplicates, maxOpen=maxFringeSize, maxClosed=len(exploredNodes),
+                       wallTime=perf_counter() - startTime, iterations=1)
 
 
-def breadthFirstSearch(problem):
-    """Search the shallowest nodes in the search tree first."""
+def breadthFirstSearch(problem, layered=False, directory=None):
+    """
+    Search the shallowest nodes in the search tree first.
+
+    With layered=True and a start state that supports the packed encoding
+    (canPack, pack, unpack, packedGoal and packedSuccessors, as on
+    SlidingPuzzleState), whole layers are expanded as sorted NumPy arrays
+    with delayed duplicate detection (see layered.py), searching towards
+    the state's own goal.  Other states fall back to the node-by-node search.
+    Given a 'directory' as well, the layers are kept on disk there instead
+    and the search resumes from its last finished layer (see external.py).
+    """
+    if layered:
+        startState = problem.getStartState()
+        if hasattr(startState, 'canPack') and startState.canPack():
+            return layeredSearchToGoal(startState, directory)
 
     # to be explored (FIFO)
     frontier = util.Queue()
 
     # previously expanded states (for cycle checking), holds states
-    exploredNodes = []
+    exploredNodes = set()
 
+    startTime = perf_counter()
     maxFringeSize = 0
     nodesExpanded = 0
+    nodesGenerated = 0
+    duplicates = 0
 
     startState = problem.getStartState()
     startNode = (startState, [], 0)  # (state, action, cost)
@@ -152,17 +511,22 @@ def breadthFirstSearch(problem):
         maxFringeSize = max(maxFringeSize, len(frontier.list))
         # begin exploring first (earliest-pushed) node on frontier
         currentState, actions, currentCost = frontier.pop()
-        nodesExpanded += 1
 
-        if currentState not in exploredNodes:
-            # put popped node state into explored list
-            exploredNodes.append(currentState)
+        if currentState in exploredNodes:
+            duplicates += 1
+        else:
+            # put popped node state into explored set
+            exploredNodes.add(currentState)
 
             if problem.isGoalState(currentState):
-                return actions, maxFringeSize, nodesExpanded
+                return SearchStats(actions, True, nodesExpanded=nodesExpanded, nodesGenerated=nodesGenerated,
+                                   duplicates=duplicates, maxOpen=maxFringeSize, maxClosed=len(exploredNodes),
+                                   wallTime=perf_counter() - startTime, iterations=1)
             else:
+                nodesExpanded += 1
                 # list of (successor, action, stepCost)
                 successors = problem.getSuccessors(currentState)
+                nodesGenerated += len(successors)
 
                 for succState, succAction, succCost in successors:
                     newAction = actions + [succAction]
@@ -171,43 +535,94 @@ def breadthFirstSearch(problem):
 
                     frontier.push(newNode)
 
-    return [], maxFringeSize, nodesExpanded
+    return SearchStats([], False, nodesExpanded=nodesExpanded, nodesGenerated=nodesGenerated,
+                       duplicates=duplicates, maxOpen=maxFringeSize, maxClosed=len(exploredNodes),
+                       wallTime=perf_counter() - startTime, iterations=1)
+
 
 
+def layeredSearchToGoal(startState, directory=None):
+    """
+    Layered breadth-first search from a packable state to its goal, in
+    memory or, with a 'directory', on disk.  Returns a SearchStats like
+    breadthFirstSearch, where the open list is the largest layer, the
+    closed states are all the layers, and every state of every layer before
+    the goal's counts as expanded.
+    """
+    startTime = perf_counter()
+    goal = startState.packedGoal()
+    if directory is None:
+        layers, sizes = layered.layeredBreadthFirstSearch(startState.pack(), startState.packedSuccessors, goal=goal)
+    else:
+        config = {'rows': startState.rows, 'cols': startState.cols}
+        layers, sizes = external.externalBreadthFirstSearch(startState.pack(), startState.packedSuccessors,
+                                                            directory, goal=goal, config=config)
+    if not layered.containsSorted(layers[-1], goal):
+        return SearchStats([], False, nodesExpanded=sum(sizes), maxOpen=max(sizes), maxClosed=sum(sizes),
+                           wallTime=perf_counter() - startTime, iterations=1)
+
+    actions = []
+    state = startState
+    for code in layered.reconstructPath(layers, goal, startState.packedSuccessors)[1:]:
+        for action in state.legalMoves():
+            successor = state.result(action)
+            if successor.pack() == code:
+                actions.append(action)
+                state = successor
+                break
+    return SearchStats(actions, True, nodesExpanded=sum(sizes[:-1]), nodesGenerated=sum(sizes[1:]),
+                       maxOpen=max(sizes), maxClosed=sum(sizes), wallTime=perf_counter() - startTime,
+                       iterations=1)
+
         
-def uniformCostSearch(problem):
-    """Search the node of least total cost first."""
+def uniformCostSearch(problem, profile=None):
+    """
+    Search the node of least total cost first.
 
-    #to be explored (FIFO): holds (item, cost)
-    frontier = util.PriorityQueue()
+    profile: a sampling interval, such as DEFAULT_PROFILE_INTERVAL, to time
+    the phases of one iteration in that many (see PhaseProfile); the
+    result's profile then holds the breakdown.
+    """
+    startTime = perf_counter()
 
+    #to be explored (FIFO): holds (item, cost)
     #previously expanded states (for cycle checking), holds state:cost
-    exploredNodes = {}
+    profile, problem, _, frontier, exploredNodes = _instrument(profile, problem, None, util.PriorityQueue())
 
     maxFringeSize = 0
     nodesExpanded = 0
-    
+    nodesGenerated = 0
+    duplicates = 0
+    reopenings = 0
+
     startState = problem.getStartState()
     startNode = (startState, [], 0) #(state, action, cost)
-    
+
     frontier.push(startNode, 0)
-    
+
     while not frontier.isEmpty():
         maxFringeSize = max(maxFringeSize, len(frontier.heap))
         #begin exploring first (lowest-cost) node on frontier
         currentState, actions, currentCost = frontier.pop()
-        nodesExpanded += 1
 
-        if (currentState not in exploredNodes) or (currentCost < exploredNodes[currentState]):
+        exploredCost = exploredNodes.get(currentState)
+        if exploredCost is None or currentCost < exploredCost:
+            if exploredCost is not None:
+                reopenings += 1
             #put popped node's state into explored list
             exploredNodes[currentState] = currentCost
 
             if problem.isGoalState(currentState):
-                return actions, maxFringeSize, nodesExpanded
+                return SearchStats(actions, True, nodesExpanded=nodesExpanded, nodesGenerated=nodesGenerated,
+                                   duplicates=duplicates, reopenings=reopenings, maxOpen=maxFringeSize,
+                                   maxClosed=len(exploredNodes), wallTime=perf_counter() - startTime,
+                                   iterations=1, profile=_finishProfile(profile))
             else:
+                nodesExpanded += 1
                 #list of (successor, action, stepCost)
                 successors = problem.getSuccessors(currentState)
-                
+                nodesGenerated += len(successors)
+
                 for succState, succAction, succCost in successors:
 
                     newAction = actions + [succAction]
@@ -215,73 +630,47 @@ def uniformCostSearch(problem):
                     newNode = (succState, newAction, newCost)
 
                     frontier.update(newNode, newCost)
+        else:
+            duplicates += 1
 
-    return [], maxFringeSize, nodesExpanded
+    return SearchStats([], False, nodesExpanded=nodesExpanded, nodesGenerated=nodesGenerated,
+                       duplicates=duplicates, reopenings=reopenings, maxOpen=maxFringeSize,
+                       maxClosed=len(exploredNodes), wallTime=perf_counter() - startTime, iterations=1,
+                       profile=_finishProfile(profile))
 
-# search.py
-
-def h1_misplaced_tiles(state, problem=None):
-    """Counts the number of tiles that are not in the correct position."""
-    misplaced = 0
-    goal = [[1, 2, 3, 4],
-            [5, 6, 7, 8],
-            [9, 10, 11, 12],
-            [13, 14, 15, 0]]
-
-    for i in range(4):
-        for j in range(4):
-            if state.cells[i][j] != 0 and state.cells[i][j] != goal[i][j]:
-                misplaced += 1
-    return misplaced
-
-def h2_euclidean_distance(state, problem=None):
-    """Calculates the sum of Euclidean distances from each tile's current position to its goal position."""
-    import math
-    total_distance = 0
-    for i in range(4):
-        for j in range(4):
-            tile = state.cells[i][j]
-            if tile != 0:
-                goal_row, goal_col = divmod(tile - 1, 4)
-                total_distance += math.sqrt((goal_row - i) ** 2 + (goal_col - j) ** 2)
-    return total_distance
-
-
-def h3_manhattan_distance(state, problem=None):
-    """Calculates the sum of Manhattan distances from each tile's current position to its goal position."""
-    total_distance = 0
-    for i in range(4):
-        for j in range(4):
-            tile = state.cells[i][j]
-            if tile != 0:
-                goal_row, goal_col = divmod(tile - 1, 4)
-                total_distance += abs(goal_row - i) + abs(goal_col - j)
-    return total_distance
-
-
-def h4_row_column_misplacements(state, problem=None):
-    """Sums the number of tiles that are out of their correct row and column."""
-    row_misplaced = 0
-    col_misplaced = 0
-    for i in range(4):
-        for j in range(4):
-            tile = state.cells[i][j]
-            if tile != 0:
-                goal_row, goal_col = divmod(tile - 1, 4)
-                if i != goal_row:
-                    row_misplaced += 1
-                if j != goal_col:
-                    col_misplaced += 1
-    return row_misplaced + col_misplaced
-
-
-def aStarSearch(problem, heuristic=nullHeuristic, track_fringe=None, track_expansion=None):
+def aStarSearch(problem, heuristic=nullHeuristic, perimeter=None, profile=None):
     """
         A* Search algorithm that uses a heuristic function to guide the search.
+
+        perimeter: an optional perimeter.PerimeterDatabase for the problem's
+        goal.  The search then stops at the first perimeter state it pops and
+        finishes along the stored shortest path.  A perimeter of another goal
+        raises ValueError.
+
+        profile: a sampling interval, as for uniformCostSearch
     """
-    fringe = util.PriorityQueue()
+    startTime = perf_counter()
+    if perimeter is not None:
+        perimeter.checkGoal(problem.getStartState())
+        heuristic = perimeter.heuristic(heuristic)
 
-    exploredNodes = []  # Holds explored states along with the cost
+    # exploredNodes holds the cheapest cost each state was expanded at
+    profile, problem, heuristic, fringe, exploredNodes = _instrument(profile, problem, heuristic,
+                                                                     util.PriorityQueue())
+    heuristic = CountingHeuristic(heuristic)
+
+    maxFringeSize = 1
+    nodesExpanded = 0
+    nodesGenerated = 0
+    duplicates = 0
+    reopenings = 0
+
+    def result(actions, solved):
+        return SearchStats(actions, solved, nodesExpanded=nodesExpanded, nodesGenerated=nodesGenerated,
+                           duplicates=duplicates, reopenings=reopenings, maxOpen=maxFringeSize,
+                           maxClosed=len(exploredNodes), heuristicCalls=heuristic.calls,
+                           heuristicTime=heuristic.nanoseconds / 1e9, wallTime=perf_counter() - startTime,
+                           iterations=1, profile=_finishProfile(profile))
 
     startState = problem.getStartState()
     startNode = (startState, [], 0)  # Initial state, no actions, zero cost
@@ -289,42 +678,258 @@ def aStarSearch(problem, heuristic=nullHeuristic, track_fringe=None, track_expan
     fringe.push(startNode, heuristic(startState, problem))
 
     while not fringe.isEmpty():
-        if track_fringe:
-            track_fringe(fringe)  # Track fringe size
-
         currentState, actions, currentCost = fringe.pop()
 
+        # a stale copy of a state expanded since at no greater cost
+        exploredCost = exploredNodes.get(currentState)
+        if exploredCost is not None and currentCost >= exploredCost:
+            duplicates += 1
+            continue
+
         if problem.isGoalState(currentState):
-            return actions
+            return result(actions, True)
 
-        exploredNodes.append((currentState, currentCost))
+        if perimeter is not None and perimeter.contains(currentState):
+            return result(actions + perimeter.pathToGoal(currentState), True)
 
-        if track_expansion:
-            track_expansion()  # Track expanded nodes
+        if exploredCost is not None:
+            reopenings += 1
+        exploredNodes[currentState] = currentCost
+        nodesExpanded += 1
 
         successors = problem.getSuccessors(currentState)
+        nodesGenerated += len(successors)
 
         for succState, succAction, succCost in successors:
             newActions = actions + [succAction]
             newCost = currentCost + succCost
             newNode = (succState, newActions, newCost)
 
-            already_explored = False
-            for exploredState, exploredCost in exploredNodes:
-                if succState == exploredState and newCost >= exploredCost:
-                    already_explored = True
-                    break
-
-            if not already_explored:
+            exploredCost = exploredNodes.get(succState)
+            if exploredCost is None or newCost < exploredCost:
                 priority = newCost + heuristic(succState, problem)
                 fringe.push(newNode, priority)
+            else:
+                duplicates += 1
 
-    return []  # Return an empty path if no solution is found
+        if len(fringe.heap) > maxFringeSize:
+            maxFringeSize = len(fringe.heap)
+
+    return result([], False)  # Return an empty path if no solution is found
 
 # =====End Change Task 2 & 3 & 4=====
 
+def enhancedPartialExpansionAStarSearch(problem, heuristic=nullHeuristic, profile=None):
+    """
+    Enhanced Partial Expansion A* (EPEA*).
+
+    Each fringe node stores a value F, initially its f = g + h.  Expanding
+    a node builds only the successors whose f equals F, using
+    problem.getOperatorDeltas to know every child's f in advance, and then
+    puts the node back on the fringe with the next larger child f.  Children
+    that would never be expanded are never generated.
+
+    'heuristic' is only evaluated on the start state; the h of every other
+    node is derived from its parent through the operator deltas, so it must
+    be the heuristic those deltas describe (h3_manhattan_distance for the
+    fifteen puzzle).
+
+    profile: a sampling interval, as for uniformCostSearch
+    """
+    startTime = perf_counter()
+    # bestCost holds the cheapest known cost of each state, for duplicate detection
+    profile, problem, heuristic, fringe, bestCost = _instrument(profile, problem, heuristic, util.PriorityQueue())
+    heuristic = CountingHeuristic(heuristic)
+
+    # states expanded at least once, to recognise reopenings
+    expandedStates = set()
+
+    maxFringeSize = 0
+    nodesExpanded = 0
+    nodesGenerated = 0
+    duplicates = 0
+    reopenings = 0
+
+    def result(actions, solved):
+        return SearchStats(actions, solved, nodesExpanded=nodesExpanded, nodesGenerated=nodesGenerated,
+                           duplicates=duplicates, reopenings=reopenings, maxOpen=maxFringeSize,
+                           maxClosed=len(bestCost), heuristicCalls=heuristic.calls,
+                           heuristicTime=heuristic.nanoseconds / 1e9, wallTime=perf_counter() - startTime,
+                           iterations=1, profile=_finishProfile(profile))
+
+    startState = problem.getStartState()
+    startH = heuristic(startState, problem)
+    startNode = (startState, [], 0, startH, startH)  # (state, actions, g, h, F)
+
+    bestCost[startState] = 0
+    fringe.push(startNode, startH)
+
+    while not fringe.isEmpty():
+        maxFringeSize = max(maxFringeSize, len(fringe.heap))
+        currentState, actions, currentCost, currentH, storedF = fringe.pop()
+
+        # a cheaper path to this state was found after the node was queued
+        if currentCost > bestCost[currentState]:
+            duplicates += 1
+            continue
+
+        if problem.isGoalState(currentState):
+            return result(actions, True)
+
+        # the node's first expansion, not the re-queued rest of an earlier one
+        firstExpansion = storedF == currentCost + currentH
+        if firstExpansion:
+            if currentState in expandedStates:
+                reopenings += 1
+            else:
+                expandedStates.add(currentState)
+        nodesExpanded += 1
+        nextF = None
+        for action, stepCost, deltaH in problem.getOperatorDeltas(currentState):
+            childF = currentCost + stepCost + currentH + deltaH
+            # children below F only exist with an inconsistent heuristic;
+            # they are built on the first expansion, as A* would build them
+            if childF == storedF or (firstExpansion and childF < storedF):
+                succState = problem.getResult(currentState, action)
+                nodesGenerated += 1
+                newCost = currentCost + stepCost
+                if succState not in bestCost or newCost < bestCost[succState]:
+                    bestCost[succState] = newCost
+                    newNode = (succState, actions + [action], newCost, currentH + deltaH, childF)
+                    fringe.push(newNode, childF)
+                else:
+                    duplicates += 1
+            elif childF > storedF and (nextF is None or childF < nextF):
+                nextF = childF
+
+        # re-queue the parent for the children it has not generated yet
+        if nextF is not None:
+            fringe.push((currentState, actions, currentCost, currentH, nextF), nextF)
+
+    return result([], False)
+
+def iterativeDeepeningAStarSearch(problem, heuristic=nullHeuristic, perimeter=None, transpositions=None):
+    """
+    Iterative Deepening A* (IDA*).
+
+    Runs depth-first searches bounded by f = g + h, raising the bound to the
+    smallest f that exceeded it until a goal is found.  Memory use is
+    proportional to the solution depth.  Cycles are avoided with the
+    problem's move pruner when it has one, and by checking the current path
+    otherwise.
+
+    With a perimeter.PerimeterDatabase for the problem's goal, any perimeter
+    state within the bound ends the search, and the solution is completed
+    along the stored shortest path.  A perimeter of another goal raises
+    ValueError.
+
+    With a transposition.TranspositionTable, the lower bound learned for
+    each fully searched subtree is stored under the hash of its root (and
+    the move pruner's state, which decides the moves searched below it) and
+    replaces the heuristic when that root is reached again.  The result's
+    tableProbes, tableHits and tableHitRate count the lookups this search
+    made.  The table needs the problem's move pruner: checking the current
+    path instead would make a subtree's bound depend on the path that led
+    to it, and reusing it from another path could cut off a solution, so
+    ValueError is raised for a problem without one.
+
+    Returns a SearchStats whose maxOpen is the deepest path searched, the
+    only open list IDA* keeps, and whose duplicates are the successors
+    dropped for being on the current path.
+    """
+    startTime = perf_counter()
+    if perimeter is not None:
+        perimeter.checkGoal(problem.getStartState())
+        heuristic = perimeter.heuristic(heuristic)
+    heuristic = CountingHeuristic(heuristic)
+
+    pruner = problem.getMovePruner()
+    if transpositions is not None and pruner is None:
+        raise ValueError("A transposition table needs a problem with a move pruner")
+    startState = problem.getStartState()
+
+    counts = {'expanded': 0, 'generated': 0, 'duplicates': 0, 'maxDepth': 0, 'iteration': 0}
+    if transpositions is not None:
+        # the table may be shared with earlier searches
+        startProbes, startHits = transpositions.probes, transpositions.hits
+    path = [startState]
+    actions = []
+
+    def boundedSearch(state, cost, bound, machineState):
+        """Returns the goal cost if found, else the smallest f above bound."""
+        h = heuristic(state, problem)
+        if transpositions is not None:
+            key = hash((hash(state), machineState))
+            stored = transpositions.probe(key)
+            if stored is not None and stored > h:
+                h = stored
+        f = cost + h
+        if f > bound:
+            return f
+        if problem.isGoalState(state):
+            return -1
+        if perimeter is not None and perimeter.contains(state):
+            # h is exact inside the perimeter, so f is the solution cost
+            return -1
+
+        counts['expanded'] += 1
+        counts['maxDepth'] = max(counts['maxDepth'], len(actions))
+
+        if pruner is None:
+            generated = problem.getSuccessors(state)
+            successors = [(succState, succAction, succCost, None)
+                          for succState, succAction, succCost in generated
+                          if succState not in path]
+            counts['generated'] += len(generated)
+            counts['duplicates'] += len(generated) - len(successors)
+        else:
+            successors = prunedSuccessors(problem, state, pruner, machineState)
+            counts['generated'] += len(successors)
+
+        nextBound = None
+        for succState, succAction, succCost, succMachineState in successors:
+            path.append(succState)
+            actions.append(succAction)
+            result = boundedSearch(succState, cost + succCost, bound, succMachineState)
+            if result == -1:
+                return -1
+            path.pop()
+            actions.pop()
+            # a subtree with no successors returns None
+            if result is not None and (nextBound is None or result < nextBound):
+                nextBound = result
+        if transpositions is not None and nextBound is not None:
+            transpositions.store(key, nextBound - cost, bound - cost, counts['iteration'])
+        return nextBound
+
+    def result(actions, solved):
+        probes = hits = 0
+        if transpositions is not None:
+            probes, hits = transpositions.probes - startProbes, transpositions.hits - startHits
+        return SearchStats(actions, solved, nodesExpanded=counts['expanded'], nodesGenerated=counts['generated'],
+                           duplicates=counts['duplicates'], maxOpen=counts['maxDepth'],
+                           maxClosed=len(transpositions) if transpositions is not None else 0,
+                           heuristicCalls=heuristic.calls, heuristicTime=heuristic.nanoseconds / 1e9,
+                           wallTime=perf_counter() - startTime, iterations=counts['iteration'],
+                           tableProbes=probes, tableHits=hits, tableHitRate=hits / probes if probes else 0.0)
+
+    bound = heuristic(startState, problem)
+    machineState = pruner.START if pruner else None
+    while bound is not None:
+        counts['iteration'] += 1
+        bound = boundedSearch(startState, 0, bound, machineState)
+        if bound == -1:
+            if perimeter is not None and perimeter.contains(path[-1]):
+                actions.extend(perimeter.pathToGoal(path[-1]))
+            return result(actions, True)
+
+    return result([], False)
+
+
 # Abbreviations
 bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
 ucs = uniformCostSearch
+epea = enhancedPartialExpansionAStarSearch
+idastar = iterativeDeepeningAStarSearch
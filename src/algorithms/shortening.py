@@ -0,0 +1,169 @@
+# shortening.py
+# -------------
+# Post-processing for solutions found by suboptimal solvers.
+
+"""
+Solution shortening for suboptimal solvers.
+
+Solutions from bounded or constructive solvers often wander: a move followed
+by its inverse, or a longer loop that comes back to an earlier state.
+shortenSolution replays a list of moves on a compact board, cuts out every
+loop, and replaces each short window of moves with an optimal path between
+its two end states found by a small IDA* run.  It repeats until nothing
+changes.  The result is never longer than the input, but need not be optimal.
+"""
+
+_OFFSETS = {'up': (-1, 0), 'down': (1, 0), 'left': (0, -1), 'right': (0, 1)}
+_REVERSE = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+
+
+def _flatten(puzzle):
+    """
+    Returns (cells, rows, cols) for a SlidingPuzzleState, a list of rows, or
+    a flat list of a square board.
+    """
+    if hasattr(puzzle, 'tiles'):
+        return list(puzzle.tiles), puzzle.rows, puzzle.cols
+    puzzle = list(puzzle)
+    if puzzle and isinstance(puzzle[0], (list, tuple)):
+        return [tile for row in puzzle for tile in row], len(puzzle), len(puzzle[0])
+    size = int(round(len(puzzle) ** 0.5))
+    return puzzle, size, size
+
+
+def _replay(start, cols, actions):
+    "Returns the board tuples visited by 'actions', 'start' included"
+    cells = list(start)
+    blank = cells.index(0)
+    states = [tuple(cells)]
+    for action in actions:
+        dRow, dCol = _OFFSETS[action]
+        target = blank + dRow * cols + dCol
+        cells[blank], cells[target] = cells[target], 0
+        blank = target
+        states.append(tuple(cells))
+    return states
+
+
+def _removeCycles(cells, cols, actions):
+    "Returns 'actions' from board 'cells' without any loops"
+    states = _replay(cells, cols, actions)
+
+    kept = []
+    keptStates = [states[0]]
+    position = {states[0]: 0}
+    for action, state in zip(actions, states[1:]):
+        if state in position:
+            # back at an earlier state: drop the loop in between
+            index = position[state]
+            for dropped in keptStates[index + 1:]:
+                del position[dropped]
+            del kept[index:]
+            del keptStates[index + 1:]
+        else:
+            kept.append(action)
+            keptStates.append(state)
+            position[state] = len(kept)
+    return kept
+
+
+def removeCycles(puzzle, actions):
+    """
+    Returns 'actions' with every loop removed: whenever the solution returns
+    to a state it visited before, the moves in between are dropped.
+    """
+    cells, rows, cols = _flatten(puzzle)
+    return _removeCycles(cells, cols, actions)
+
+
+def _shortcut(start, goal, rows, cols, limit):
+    """
+    Returns a shortest list of moves from board 'start' to board 'goal' if
+    one of at most 'limit' moves exists, else None.  Runs IDA* with the
+    Manhattan distance between the two boards.
+    """
+    goalRow = [0] * len(goal)
+    goalCol = [0] * len(goal)
+    for index, tile in enumerate(goal):
+        goalRow[tile], goalCol[tile] = divmod(index, cols)
+
+    cells = list(start)
+    h = 0
+    for index, tile in enumerate(cells):
+        if tile != 0:
+            row, col = divmod(index, cols)
+            h += abs(row - goalRow[tile]) + abs(col - goalCol[tile])
+    if h > limit:
+        return None
+
+    path = []
+
+    def boundedSearch(blank, cost, h, bound, previous):
+        f = cost + h
+        if f > bound:
+            return f
+        if h == 0:
+            return -1
+        nextBound = None
+        row, col = divmod(blank, cols)
+        for move, (dRow, dCol) in _OFFSETS.items():
+            if move == _REVERSE.get(previous):
+                continue
+            newRow, newCol = row + dRow, col + dCol
+            if not (0 <= newRow < rows and 0 <= newCol < cols):
+                continue
+            target = newRow * cols + newCol
+            tile = cells[target]
+            # the tile slides from (newRow, newCol) to (row, col)
+            delta = (abs(row - goalRow[tile]) + abs(col - goalCol[tile])
+                     - abs(newRow - goalRow[tile]) - abs(newCol - goalCol[tile]))
+            cells[blank], cells[target] = tile, 0
+            path.append(move)
+            result = boundedSearch(target, cost + 1, h + delta, bound, move)
+            if result == -1:
+                return -1
+            path.pop()
+            cells[blank], cells[target] = 0, tile
+            if nextBound is None or result < nextBound:
+                nextBound = result
+        return nextBound
+
+    bound = h
+    while bound is not None and bound <= limit:
+        bound = boundedSearch(cells.index(0), 0, h, bound, None)
+        if bound == -1:
+            return path
+    return None
+
+
+def shortenSolution(puzzle, actions, window=8):
+    """
+    Returns a solution no longer than 'actions' that reaches the same final
+    state from 'puzzle'.
+
+    puzzle: a SlidingPuzzleState, a list of rows, or a flat square board
+    actions: a list of blank moves, as returned by the searches in search.py
+    window: length of the move windows replaced by optimal sub-solutions;
+      larger windows find more shortcuts at a higher cost
+    """
+    cells, rows, cols = _flatten(puzzle)
+    actions = list(actions)
+
+    changed = True
+    while changed:
+        shortened = _removeCycles(cells, cols, actions)
+        changed = len(shortened) < len(actions)
+        actions = shortened
+
+        states = _replay(cells, cols, actions)
+        index = 0
+        while index < len(actions) - 1:
+            length = min(window, len(actions) - index)
+            path = _shortcut(states[index], states[index + length], rows, cols, length - 2)
+            if path is None:
+                index += 1
+                continue
+            actions[index:index + length] = path
+            states[index:index + length + 1] = _replay(states[index], cols, path)
+            changed = True
+    return actions
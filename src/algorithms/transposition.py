@@ -0,0 +1,123 @@
+# transposition.py
+# ----------------
+# Fixed-size transposition table for the depth-first searches.
+
+"""
+Bounded transposition table for IDA*.
+
+IDA* reaches the same state along many paths and again in every threshold
+iteration.  After a subtree has been searched without finding the goal, the
+smallest f that exceeded the threshold, minus the cost of reaching the
+subtree's root, is a lower bound on that root's distance to the goal, and
+usually a better one than the heuristic.  The table remembers these bounds
+so later visits can cut off earlier.
+
+The table has a fixed number of slots, chosen by the caller, and each key
+maps to one slot.  When two keys collide the replacement policy decides
+which entry stays:
+
+  'depth'   keeps the entry backed by the deeper search (ties, entries from
+            older iterations and empty slots are replaced)
+  'always'  keeps the most recent entry
+"""
+
+from array import array
+
+POLICIES = ('depth', 'always')
+
+_EMPTY = -1
+
+
+class TranspositionTable:
+    """
+      Maps state hash keys to lower bounds on the distance to the goal.
+
+      Each slot holds the full key (to detect collisions), the bound, the
+      remaining depth of the search that produced it and the iteration that
+      found it.  probes and hits count lookups and successful lookups, and
+      entries the occupied slots.
+    """
+
+    def __init__(self, capacity=1 << 20, policy='depth'):
+        """
+          capacity: number of slots; memory use is memoryBytes(), about 24
+            bytes per slot, and never grows
+          policy: 'depth' or 'always', see the module docstring
+        """
+        if capacity < 1:
+            raise ValueError("The capacity must be at least 1")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}. Available policies: {list(POLICIES)}")
+        self.capacity = capacity
+        self.policy = policy
+        self.keys = array('q', [0]) * capacity
+        self.bounds = array('d', [_EMPTY]) * capacity
+        self.depths = array('i', [0]) * capacity
+        self.iterations = array('i', [0]) * capacity
+        self.entries = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def probe(self, key):
+        "Returns the stored lower bound for 'key', or None"
+        self.probes += 1
+        slot = key % self.capacity
+        if self.bounds[slot] != _EMPTY and self.keys[slot] == key:
+            self.hits += 1
+            return self.bounds[slot]
+        return None
+
+    def store(self, key, bound, depth, iteration):
+        """
+        Records a lower bound for 'key' found by a search of the given
+        remaining depth in the given iteration.  Returns True if the entry
+        was written, False if the policy kept the existing one.
+        """
+        slot = key % self.capacity
+        occupied = self.bounds[slot] != _EMPTY
+        if occupied and self.keys[slot] != key:
+            if (self.policy == 'depth' and depth < self.depths[slot]
+                    and iteration == self.iterations[slot]):
+                return False
+            self.replacements += 1
+        elif occupied and bound < self.bounds[slot]:
+            # never weaken a bound already known for this key
+            return False
+        elif not occupied:
+            self.entries += 1
+        self.keys[slot] = key
+        self.bounds[slot] = bound
+        self.depths[slot] = depth
+        self.iterations[slot] = iteration
+        self.stores += 1
+        return True
+
+    def clear(self):
+        "Empties every slot and resets the counters"
+        self.__init__(self.capacity, self.policy)
+
+    def __len__(self):
+        return self.entries
+
+    def memoryBytes(self):
+        "Returns the size of the slot arrays in bytes"
+        return self.capacity * sum(table.itemsize for table in (self.keys, self.bounds, self.depths, self.iterations))
+
+    def hitRate(self):
+        "Returns the fraction of probes that found an entry"
+        return self.hits / self.probes if self.probes else 0.0
+
+    def stats(self):
+        "Returns the table counters as a dict"
+        return {
+            'capacity': self.capacity,
+            'policy': self.policy,
+            'entries': len(self),
+            'probes': self.probes,
+            'hits': self.hits,
+            'hitRate': self.hitRate(),
+            'stores': self.stores,
+            'replacements': self.replacements,
+        }
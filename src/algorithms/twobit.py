@@ -0,0 +1,148 @@
+# twobit.py
+# ---------
+# Breadth-first enumeration of whole puzzles in two bits per state.
+
+"""
+Two-bit breadth-first search over a ranked state space.
+
+When every board of a puzzle can be ranked into range(n!), a breadth-first
+search needs no open or closed lists: a bytearray with two bits per rank is
+enough.  Following Korf, the two bits hold the state's depth modulo 3, with
+the fourth value marking states not yet seen.  Expanding depth d means
+scanning for value d % 3, unranking those states, generating their
+successors and giving the unseen ones value (d + 1) % 3; on an undirected
+graph every other neighbour is at depth d - 1 or d, whose values differ.
+
+Only the states two levels up share the value of the new layer.  Before
+each layer is expanded, a vectorized pass over the table folds them into
+the level above (rewriting (d - 2) % 3 as (d - 1) % 3), so that the scan
+for depth d finds exactly the frontier.
+
+A 3x4 board needs 12! / 4 bytes, about 120 MB; the optional four-bit
+distance table needs twice that.
+"""
+
+import numpy as np
+
+from utils import util
+
+UNSEEN = 3
+SATURATED = 15
+
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+
+def _twoBitValues(table, first, count):
+    "Returns the two-bit values of ranks first..first+count-1 (first divisible by 4)"
+    data = table[first // 4:(first + count + 3) // 4]
+    values = (data[:, None] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3
+    return values.reshape(-1)[:count]
+
+
+def _foldValue(table, old, new):
+    "Rewrites every two-bit value 'old' in the table as 'new'"
+    for shift in (0, 2, 4, 6):
+        for begin in range(0, len(table), DEFAULT_CHUNK_SIZE):
+            data = table[begin:begin + DEFAULT_CHUNK_SIZE]
+            match = ((data >> shift) & 3) == old
+            data[match] = (data[match] & ~np.uint8(3 << shift)) | np.uint8(new << shift)
+
+
+def _setUnseen(table, ranks, value):
+    """
+    Gives every rank in the unique array 'ranks' whose value is UNSEEN the
+    two-bit value 'value'.  Returns the ranks that changed.
+    """
+    shifts = ((ranks & 3) * 2).astype(np.uint8)
+    current = (table[ranks >> 2] >> shifts) & 3
+    fresh = ranks[current == UNSEEN]
+    shifts = shifts[current == UNSEEN]
+    # UNSEEN ^ (UNSEEN ^ value) == value; ufunc.at copes with shared bytes
+    np.bitwise_xor.at(table, fresh >> 2, (np.uint8(UNSEEN ^ value) << shifts).astype(np.uint8))
+    return fresh
+
+
+def _successorRanks(ranks, rows, cols):
+    "Returns the ranks of all successors of the boards with the given ranks"
+    cellCount = rows * cols
+    boards = util.unrankPartialPermutations(ranks, cellCount, cellCount)
+    blank = np.argmin(boards, axis=1)
+    blankRow, blankCol = blank // cols, blank % cols
+    successors = []
+    for dRow, dCol in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        valid = ((blankRow + dRow >= 0) & (blankRow + dRow < rows)
+                 & (blankCol + dCol >= 0) & (blankCol + dCol < cols))
+        index = np.nonzero(valid)[0]
+        moved = boards[index]
+        source = blank[index]
+        target = source + dRow * cols + dCol
+        moved[np.arange(len(index)), source] = moved[np.arange(len(index)), target]
+        moved[np.arange(len(index)), target] = 0
+        successors.append(util.rankPartialPermutations(moved, cellCount))
+    return np.unique(np.concatenate(successors))
+
+
+def readNibble(table, rank):
+    "Returns the four-bit entry for 'rank' of a distance table"
+    return (table[rank >> 1] >> ((rank & 1) * 4)) & 15
+
+
+def twoBitBreadthFirstSearch(rows, cols, start=None, distanceTable=False,
+                             chunkSize=DEFAULT_CHUNK_SIZE, onLayer=None):
+    """
+    Enumerates every board reachable from 'start' on a rows x cols puzzle.
+
+    start: the flat board to search from; defaults to the blank-last goal
+    distanceTable: also build a table of four bits per rank holding each
+      board's distance from 'start', saturated at 15 (so it is an
+      admissible heuristic towards 'start'), or 15 for unreachable boards
+    chunkSize: number of ranks scanned and expanded at a time
+    onLayer: called as onLayer(depth, count) after each layer
+
+    Returns (histogram, distances): the number of boards at each depth, and
+    the distance table as a bytearray (index with readNibble) or None.
+    """
+    cellCount = rows * cols
+    if start is None:
+        start = list(range(1, cellCount)) + [0]
+    size = util.permutationCount(cellCount)
+
+    table = np.full((size + 3) // 4, 0xFF, dtype=np.uint8)
+    distances = np.full((size + 1) // 2, 0xFF, dtype=np.uint8) if distanceTable else None
+
+    startRank = np.array([util.rankPermutation(list(start))], dtype=np.int64)
+    _setUnseen(table, startRank, 0)
+    if distances is not None:
+        np.bitwise_xor.at(distances, startRank >> 1, (np.uint8(15) << ((startRank & 1) * 4).astype(np.uint8)))
+    histogram = [1]
+    if onLayer is not None:
+        onLayer(0, 1)
+
+    # chunks start on a byte boundary of the two-bit table
+    chunkSize = max(4, chunkSize - chunkSize % 4)
+    depth = 0
+    while True:
+        if depth >= 2:
+            _foldValue(table, (depth - 2) % 3, (depth - 1) % 3)
+        current, following = depth % 3, (depth + 1) % 3
+        found = 0
+        for first in range(0, size, chunkSize):
+            values = _twoBitValues(table, first, min(chunkSize, size - first))
+            frontier = np.nonzero(values == current)[0].astype(np.int64) + first
+            if len(frontier) == 0:
+                continue
+            fresh = _setUnseen(table, _successorRanks(frontier, rows, cols), following)
+            found += len(fresh)
+            if distances is not None and len(fresh):
+                # unseen nibbles are 15; XOR in the saturated distance
+                distance = min(depth + 1, SATURATED)
+                shifts = ((fresh & 1) * 4).astype(np.uint8)
+                np.bitwise_xor.at(distances, fresh >> 1, (np.uint8(15 ^ distance) << shifts).astype(np.uint8))
+        if found == 0:
+            break
+        depth += 1
+        histogram.append(found)
+        if onLayer is not None:
+            onLayer(depth, found)
+
+    return histogram, (bytearray(distances.tobytes()) if distances is not None else None)
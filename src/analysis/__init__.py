@@ -4,10 +4,14 @@ Analysis tools for N-Puzzle Solver performance evaluation.
 
 from .automate import run_heuristic_comparison, analyze_results
 from .task4 import run_strategic_comparison, analyze_result
+from .pipeline import P2Quantile, RunningSummary, summarize
 
 __all__ = [
     'run_heuristic_comparison',
     'analyze_results',
     'run_strategic_comparison', 
-    'analyze_result'
+    'analyze_result',
+    'P2Quantile',
+    'RunningSummary',
+    'summarize'
 ]
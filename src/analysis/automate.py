@@ -1,11 +1,14 @@
-import csv
 import os
-import time
-import pandas as pd
-from fifteenpuzzle import FifteenPuzzleState, FifteenPuzzleSearchProblem
-from generate import generate_and_save_scenarios
-from search import aStarSearch
-from search import h1_misplaced_tiles, h2_euclidean_distance, h3_manhattan_distance, h4_row_column_misplacements
+import sys
+
+# Allow running this file directly as a script from the repository root.
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from puzzles.fifteen_puzzle import FifteenPuzzleState
+from utils.generator import generate_and_save_scenarios, load_scenarios
+from analysis.pipeline import (write_rows, read_rows, finished_jobs, current_rows, solved_rows, summarize,
+                               print_outcomes, print_summary)
+from analysis.runner import Job, Limits, config_hash, run_jobs
 
 def validate_and_prepare_puzzle(puzzle_state):
     """
@@ -23,131 +26,116 @@ def validate_and_prepare_puzzle(puzzle_state):
 
     return puzzle_state
 
-def run_heuristic_comparison(puzzles, results_file):
+# (name, algorithm, heuristic), keys of analysis.runner.SEARCHES and HEURISTICS
+HEURISTICS = [
+    ("A* with Misplaced Tiles", "A*", "misplaced"),
+    ("A* with Euclidean Distance", "A*", "euclidean"),
+    ("A* with Manhattan Distance", "A*", "manhattan"),
+    ("A* with Row-Column Misplacements", "A*", "row_column")
+]
+
+RESULTS_HEADER = ["PuzzleID", "Heuristic", "Solved", "Outcome", "Solution Depth", "Expanded Nodes", "Max Fringe Size",
+                  "Execution Time", "Config"]
+
+# Columns identifying a job in the results log
+KEY_COLUMNS = ["PuzzleID", "Heuristic", "Config"]
+
+# Per-job limits used when the script is run
+LIMITS = Limits(seconds=60, memory_mb=4096)
+
+METRICS = {"expanded_nodes": "Expanded Nodes", "execution_time": "Execution Time", "max_fringe": "Max Fringe Size"}
+
+
+def heuristic_jobs(puzzles):
+    """
+    Yields a runner Job for each puzzle of the iterable 'puzzles' and each
+    heuristic.  Puzzles are read one at a time, so 'puzzles' can be a lazy
+    scenario stream.
+    """
+    for idx, puzzle_state in enumerate(puzzles, 1):
+        print(f"Running comparisons for puzzle {idx}...")
+
+        try:
+            # Validate and prepare the puzzle state
+            valid_puzzle_state = validate_and_prepare_puzzle(puzzle_state)
+            puzzle = FifteenPuzzleState(valid_puzzle_state)
+        except ValueError as e:
+            print(f"Error processing puzzle {idx}: {e}")
+            continue
+
+        for name, algorithm, heuristic in HEURISTICS:
+            yield Job(idx, algorithm, heuristic, puzzle.pack())
+
+
+def heuristic_rows(puzzles, workers=1, limits=None, finished=frozenset(), configs=None):
+    """
+    Solves each puzzle with A* and every heuristic on 'workers' processes,
+    each job under 'limits' (a runner Limits), yielding the result rows in
+    puzzle and heuristic order as they finish.  Jobs whose KEY_COLUMNS
+    values are in the set 'finished' are skipped.  The Config of every job,
+    run or skipped, is added to the set 'configs' if one is given.
+    """
+    names = {(algorithm, heuristic): name for name, algorithm, heuristic in HEURISTICS}
+
+    def key(job):
+        return str(job.scenario), names[job.algorithm, job.heuristic], config_hash(job, limits)
+
+    def pending():
+        for job in heuristic_jobs(puzzles):
+            job_key = key(job)
+            if configs is not None:
+                configs.add(job_key[2])
+            if job_key not in finished:
+                yield job
+
+    jobs = pending()
+    for job, result in run_jobs(jobs, workers, limits=limits):
+        scenario, name, config = key(job)
+        depth = result.depth if result.solved else "N/A"
+        yield [job.scenario, name, result.solved, result.outcome, depth,
+               result.expanded_nodes, result.max_fringe_size, result.execution_time, config]
+
+
+def run_heuristic_comparison(puzzles, results_file, workers=1, limits=None, resume=True):
     """
     Run comparisons for A* using different heuristics and write results to a CSV file.
+    Each row is written and flushed as soon as it and every earlier row are done.
+
+    The results file is an append-only log keyed by KEY_COLUMNS: with resume=True, jobs
+    already in it are skipped and the others are appended, so an interrupted sweep picks
+    up where it stopped.  With resume=False the file is started afresh.
+
+    Returns the set of Config values of this job set, to analyze only its rows.
     """
-    heuristics = [
-        ("A* with Misplaced Tiles", h1_misplaced_tiles),
-        ("A* with Euclidean Distance", h2_euclidean_distance),
-        ("A* with Manhattan Distance", h3_manhattan_distance),
-        ("A* with Row-Column Misplacements", h4_row_column_misplacements)
-    ]
-
-    # Open the CSV file to write the results
-    with open(results_file, mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(
-            ["PuzzleID", "Heuristic", "Solved", "Solution Depth", "Expanded Nodes", "Max Fringe Size", "Execution Time"]
-        )
-
-        # Iterate through the list of puzzles and run the comparisons
-        for idx, puzzle_state in enumerate(puzzles, 1):
-            print(f"Running comparisons for puzzle {idx}...")
-
-            try:
-                # Validate and prepare the puzzle state
-                valid_puzzle_state = validate_and_prepare_puzzle(puzzle_state)
-                puzzle = FifteenPuzzleState(valid_puzzle_state)
-
-                # Create the search problem
-                problem = FifteenPuzzleSearchProblem(puzzle)
-
-                # Track expanded nodes and fringe size locally
-                for name, heuristic in heuristics:
-                    expanded_nodes = 0  # Reset expanded node count
-                    max_fringe_size = 0  # Reset max fringe size
-
-                    def track_fringe(fringe):
-                        """Utility to update the max fringe size."""
-                        nonlocal max_fringe_size
-                        max_fringe_size = max(max_fringe_size, fringe.count)
-
-                    def track_expansion():
-                        """Utility to increment the expanded node counter."""
-                        nonlocal expanded_nodes
-                        expanded_nodes += 1
-
-                    start_time = time.time()
-                    solution = aStarSearch(problem, heuristic, track_fringe, track_expansion)
-                    end_time = time.time()
-
-                    solved = bool(solution)
-                    depth = len(solution) if solved else "N/A"
-                    execution_time = end_time - start_time
-                    writer.writerow([idx, name, solved, depth, expanded_nodes, max_fringe_size, execution_time])
-
-            except ValueError as e:
-                print(f"Error processing puzzle {idx}: {e}")
-
-
-def analyze_results(results_file):
+    finished = finished_jobs(results_file, KEY_COLUMNS) if resume else frozenset()
+    configs = set()
+    for _ in write_rows(heuristic_rows(puzzles, workers, limits, finished, configs), results_file, RESULTS_HEADER,
+                        append=resume):
+        pass
+    return configs
+
+
+def analyze_results(results_file, configs=None):
     """
     Analyze the results from the CSV file to find the heuristic that expanded the least nodes,
-    had the least execution time, and the least max fringe size.
+    had the least execution time, and the least max fringe size.  The file is read in one
+    streaming pass; percentiles are estimated without keeping the rows.  Only solved jobs
+    are scored; the outcomes of all jobs are listed first.  With 'configs', the set returned
+    by run_heuristic_comparison, only the rows of that job set are read; the log may also
+    hold rows from earlier runs with other limits or scenarios.
     """
-    heuristics_scores = {
-        "A* with Misplaced Tiles": {"expanded_nodes": 0, "execution_time": 0, "max_fringe": 0, "count": 0},
-        "A* with Euclidean Distance": {"expanded_nodes": 0, "execution_time": 0, "max_fringe": 0, "count": 0},
-        "A* with Manhattan Distance": {"expanded_nodes": 0, "execution_time": 0, "max_fringe": 0, "count": 0},
-        "A* with Row-Column Misplacements": {"expanded_nodes": 0, "execution_time": 0, "max_fringe": 0, "count": 0},
-    }
-
-    # Read the CSV results file
-    with open(results_file, mode='r') as file:
-        reader = csv.DictReader(file)
-
-        # Analyze each row
-        for row in reader:
-            heuristic = row['Heuristic']
-            expanded_nodes = int(row['Expanded Nodes'])
-            execution_time = float(row['Execution Time'])
-            max_fringe_size = int(row['Max Fringe Size'])
-
-            # Accumulate scores
-            heuristics_scores[heuristic]["expanded_nodes"] += expanded_nodes
-            heuristics_scores[heuristic]["execution_time"] += execution_time
-            heuristics_scores[heuristic]["max_fringe"] += max_fringe_size
-            heuristics_scores[heuristic]["count"] += 1
-
-    # Calculate average scores
-    for heuristic in heuristics_scores:
-        if heuristics_scores[heuristic]["count"] > 0:
-            heuristics_scores[heuristic]["expanded_nodes"] /= heuristics_scores[heuristic]["count"]
-            heuristics_scores[heuristic]["execution_time"] /= heuristics_scores[heuristic]["count"]
-            heuristics_scores[heuristic]["max_fringe"] /= heuristics_scores[heuristic]["count"]
-
-    # Determine winners for each metric
-    expanded_winner = min(heuristics_scores, key=lambda h: heuristics_scores[h]["expanded_nodes"])
-    time_winner = min(heuristics_scores, key=lambda h: heuristics_scores[h]["execution_time"])
-    fringe_winner = min(heuristics_scores, key=lambda h: heuristics_scores[h]["max_fringe"])
-
-    # Print final scores and winners
-    print("\nFinal Scores (Total Expanded Nodes):")
-    for heuristic, metrics in heuristics_scores.items():
-        print(f"{heuristic}: {metrics['expanded_nodes']}")
-
-    print(
-        f"\nWinner for Least Expanded Nodes: {expanded_winner} with {heuristics_scores[expanded_winner]['expanded_nodes']} total expanded nodes")
-
-    print("\nFinal Scores (Average Execution Time):")
-    for heuristic, metrics in heuristics_scores.items():
-        print(f"{heuristic}: {metrics['execution_time']:.4f} seconds")
-
-    print(
-        f"\nWinner for Least Execution Time: {time_winner} with {heuristics_scores[time_winner]['execution_time']:.4f} seconds")
-
-    print("\nFinal Scores (Average Max Fringe Size):")
-    for heuristic, metrics in heuristics_scores.items():
-        print(f"{heuristic}: {metrics['max_fringe']}")
-
-    print(
-        f"\nWinner for Least Max Fringe Size: {fringe_winner} with {heuristics_scores[fringe_winner]['max_fringe']} size")
+    outcomes = {}
+    rows = read_rows(results_file)
+    if configs is not None:
+        rows = current_rows(rows, configs)
+    summaries = summarize(solved_rows(rows, "Heuristic", outcomes), "Heuristic", METRICS)
+    print_outcomes(outcomes)
+    print_summary(summaries)
 
 
 # Include the call to analyze_results at the end of your script
 if __name__ == "__main__":
-    scenarios_file = "scenarios.csv"
+    scenarios_file = "scenarios.bin"
     results_file = "results_task3.csv"
 
     # If the scenarios file does not exist, we generate it.
@@ -155,10 +143,12 @@ if __name__ == "__main__":
         print(f"{scenarios_file} not found. Generating random puzzles...")
         generate_and_save_scenarios(scenarios_file, num_puzzles=500, moves=25)
 
-    puzzles_df = pd.read_csv(scenarios_file)
-    puzzles = puzzles_df['State'].apply(eval).tolist()
-
-    run_heuristic_comparison(puzzles, results_file)
+    # Scenarios are streamed from the file while the comparison runs
+    try:
+        configs = run_heuristic_comparison(load_scenarios(scenarios_file), results_file,
+                                           workers=os.cpu_count() or 1, limits=LIMITS)
+    except ValueError as e:
+        sys.exit(f"Cannot resume: {e}")
 
-    # Analyze the results after running the comparisons
-    analyze_results(results_file)
+    # Analyze the results of this job set after running the comparisons
+    analyze_results(results_file, configs)
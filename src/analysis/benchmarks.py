@@ -0,0 +1,286 @@
+"""
+Standard benchmark suite with a JSON baseline and regression gating.
+
+Random 25-move scrambles are easy; this module runs solvers on standard
+instance sets instead:
+
+  korf100          Korf's 100 15-puzzle instances (data/korf100.txt),
+                   each with its known optimal solution length
+  korf-easy        the Korf instances IDA* with the Manhattan distance
+                   solves fastest, run by default under a node limit so
+                   that the gate always covers hard 15-puzzle boards
+  eight-puzzle-dN  every 8-puzzle state exactly N moves from the goal,
+                   enumerated with the layered breadth-first search
+
+For each (suite, solver) it records the instances solved, the nodes
+expanded, the time, nodes per second and the peak resident memory, each
+(suite, solver) run in a fresh process so that the peaks are its own, and
+writes them to a JSON baseline.  Compared with an earlier
+baseline, a run fails when the nodes grow or the throughput drops by more
+than a tolerance.
+
+    python src/analysis/benchmarks.py --suite eight-puzzle-d20 --solver A*:manhattan \\
+        --baseline benchmarks.json              # compare, exit 1 on a regression
+    python src/analysis/benchmarks.py ... --update   # write a new baseline
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+if __name__ == '__main__':
+    # Allow running this file directly as a script from the repository root.
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from algorithms.layered import layeredBreadthFirstSearch, packTiles, slidingTileSuccessors
+from analysis.runner import Job, Limits, run_job
+from utils.generator import unpack_boards
+
+KORF_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'korf100.txt')
+KORF_GOAL = tuple(range(16))
+
+# The Korf instances IDA* with the Manhattan distance solves in under
+# 500,000 nodes each, and the node limit they are run under by default
+KORF_EASY = (12, 55, 79)
+KORF_EASY_NODES = 1000000
+EIGHT_PUZZLE_GOAL = tuple(range(9))
+
+# Searches that return optimal solutions (with an admissible heuristic)
+OPTIMAL_SEARCHES = {"BFS", "UCS", "A*", "EPEA*", "IDA*"}
+
+BASELINE_VERSION = 1
+DEFAULT_TOLERANCE = 0.10
+
+Instance = namedtuple('Instance', ['name', 'tiles', 'rows', 'cols', 'goal', 'optimal'])
+Instance.__doc__ = "One benchmark board; 'optimal' is its optimal solution length, or None if unknown"
+
+
+def load_korf_instances(path=KORF_PATH):
+    "Returns the Korf instances listed in 'path' as Instances"
+    instances = []
+    with open(path) as file:
+        for line in file:
+            line = line.split('#', 1)[0].split()
+            if not line:
+                continue
+            number, optimal, tiles = int(line[0]), int(line[1]), tuple(int(tile) for tile in line[2:])
+            if sorted(tiles) != list(range(16)):
+                raise ValueError(f"Korf instance {number} in {path} is not a 15-puzzle board")
+            instances.append(Instance(f"korf-{number}", tiles, 4, 4, KORF_GOAL, optimal))
+    return instances
+
+
+def eight_puzzle_set(depth, sample=None):
+    """
+    Returns every 8-puzzle state exactly 'depth' moves from the blank-first
+    goal as Instances, in order of their packed boards.  With 'sample', only
+    that many states, evenly spaced through the set, are returned.
+    """
+    layers, sizes = layeredBreadthFirstSearch(packTiles(EIGHT_PUZZLE_GOAL),
+                                              lambda codes: slidingTileSuccessors(codes, 3, 3),
+                                              maxDepth=depth, keepLayers=False)
+    if len(sizes) <= depth:
+        return []
+    layer = layers[-1]
+    if sample is not None and sample < len(layer):
+        layer = layer[np.linspace(0, len(layer) - 1, sample).astype(np.int64)]
+    return [Instance(f"eight-d{depth}-{index}", tuple(board.tolist()), 3, 3, EIGHT_PUZZLE_GOAL, depth)
+            for index, board in enumerate(unpack_boards(layer, 9))]
+
+
+SUITES = {
+    "korf100": load_korf_instances,
+    "korf-easy": lambda: [instance for instance in load_korf_instances()
+                          if int(instance.name.split('-')[1]) in KORF_EASY],
+    "eight-puzzle-d12": lambda: eight_puzzle_set(12),
+    "eight-puzzle-d20": lambda: eight_puzzle_set(20, sample=200),
+    "eight-puzzle-d26": lambda: eight_puzzle_set(26, sample=200),
+}
+
+# Suites run when none is named.  The full Korf set takes hours in pure
+# Python, so it is only run on request, e.g. --suite korf100 --solver
+# IDA*:manhattan.
+DEFAULT_SUITES = sorted(suite for suite in SUITES if suite != "korf100")
+
+DEFAULT_SOLVER = "A*:manhattan"
+
+# (solver, Limits) for suites run differently when no --solver is given:
+# A* runs out of memory on 15-puzzle boards this hard, and the node limit
+# keeps a regression from stalling the gate
+SUITE_DEFAULTS = {
+    "korf-easy": ("IDA*:manhattan", Limits(nodes=KORF_EASY_NODES)),
+}
+
+
+def _peak_rss_mb():
+    "Peak resident memory of this process so far, in MB"
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_suite(instances, algorithm, heuristic=None, limits=None, on_instance=None):
+    """
+    Solves every instance with one solver, serially in this process so that
+    timings are comparable, and returns the suite's metrics as a dict.
+    'peak_rss_mb' is the peak of this whole process, so it only describes
+    the suite when the process ran nothing else (see run_suite_isolated).
+
+    on_instance: called as on_instance(instance, result) after each one
+    """
+    solved = nodes = 0
+    seconds = 0.0
+    outcomes = {}
+    not_optimal = []
+    for index, instance in enumerate(instances):
+        job = Job(index, algorithm, heuristic, packTiles(instance.tiles), instance.rows, instance.cols,
+                  instance.goal)
+        result = run_job(job, limits)
+        outcomes[result.outcome] = outcomes.get(result.outcome, 0) + 1
+        nodes += result.expanded_nodes
+        seconds += result.execution_time
+        if result.solved:
+            solved += 1
+            if algorithm in OPTIMAL_SEARCHES and instance.optimal is not None and result.depth != instance.optimal:
+                not_optimal.append(instance.name)
+        if on_instance is not None:
+            on_instance(instance, result)
+    return {
+        "instances": len(instances),
+        "solved": solved,
+        "outcomes": outcomes,
+        "not_optimal": not_optimal,
+        "nodes": nodes,
+        "seconds": seconds,
+        "nodes_per_second": nodes / seconds if seconds > 0 else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_suite_isolated(instances, algorithm, heuristic=None, limits=None):
+    """
+    Runs run_suite in a fresh process and returns its metrics, so that the
+    peak memory is the suite's own rather than the largest of everything
+    run before it in this process.
+    """
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_suite, instances, algorithm, heuristic, limits).result()
+
+
+def result_key(suite, algorithm, heuristic=None):
+    "Key of a (suite, solver) entry in a baseline, e.g. 'korf100/IDA*:manhattan'"
+    return f"{suite}/{algorithm}:{heuristic}" if heuristic else f"{suite}/{algorithm}"
+
+
+def save_baseline(path, results):
+    "Writes {key: metrics} results as a JSON baseline with the machine's details"
+    baseline = {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(path + '.tmp', 'w') as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def load_baseline(path):
+    "Returns the results of a baseline written by save_baseline"
+    with open(path) as file:
+        baseline = json.load(file)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path} is not a version {BASELINE_VERSION} benchmark baseline")
+    return baseline["results"]
+
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares results with a baseline's and returns a message for each
+    regression: more nodes or fewer nodes per second than the baseline by
+    more than 'tolerance' (a fraction), fewer instances solved, or a
+    non-optimal solution.  Keys missing from the baseline are not compared.
+    """
+    regressions = []
+    for key, metrics in results.items():
+        if metrics["not_optimal"]:
+            regressions.append(f"{key}: non-optimal solutions for {', '.join(metrics['not_optimal'])}")
+        if key not in baseline:
+            continue
+        base = baseline[key]
+        if metrics["instances"] != base["instances"]:
+            regressions.append(f"{key}: {metrics['instances']} instances, baseline has {base['instances']}")
+            continue
+        if metrics["solved"] < base["solved"]:
+            regressions.append(f"{key}: solved {metrics['solved']} instances, baseline {base['solved']}")
+        if metrics["nodes"] > base["nodes"] * (1 + tolerance):
+            regressions.append(f"{key}: {metrics['nodes']} nodes, baseline {base['nodes']} "
+                               f"(+{metrics['nodes'] / max(base['nodes'], 1) - 1:.1%})")
+        if metrics["nodes_per_second"] < base["nodes_per_second"] * (1 - tolerance):
+            regressions.append(f"{key}: {metrics['nodes_per_second']:.0f} nodes/s, baseline "
+                               f"{base['nodes_per_second']:.0f} "
+                               f"({metrics['nodes_per_second'] / base['nodes_per_second'] - 1:.1%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and check it against a baseline.")
+    parser.add_argument('--suite', action='append', choices=sorted(SUITES),
+                        help="suite to run; repeat for several (default: %s)" % ", ".join(DEFAULT_SUITES))
+    parser.add_argument('--solver', action='append',
+                        help="ALGORITHM[:HEURISTIC] from analysis.runner, e.g. A*:manhattan; repeat for "
+                             "several (default: %s, or IDA*:manhattan under a node limit for korf-easy)"
+                             % DEFAULT_SOLVER)
+    parser.add_argument('--instances', type=int, default=None, help="run only the first N instances of each suite")
+    parser.add_argument('--baseline', default='benchmarks.json', help="baseline JSON file")
+    parser.add_argument('--update', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed fractional regression (default: %(default)s)")
+    parser.add_argument('--seconds', type=float, default=None, help="time limit per instance")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for suite in args.suite or DEFAULT_SUITES:
+        instances = SUITES[suite]()[:args.instances]
+        solvers, limits = args.solver, Limits()
+        if not solvers:
+            solver, limits = SUITE_DEFAULTS.get(suite, (DEFAULT_SOLVER, Limits()))
+            solvers = [solver]
+        limits = limits._replace(seconds=args.seconds) if args.seconds else limits
+        if limits == Limits():
+            limits = None
+        for solver in solvers:
+            algorithm, _, heuristic = solver.partition(':')
+            key = result_key(suite, algorithm, heuristic or None)
+            metrics = run_suite_isolated(instances, algorithm, heuristic or None, limits)
+            results[key] = metrics
+            print(f"{key}: {metrics['solved']}/{metrics['instances']} solved, {metrics['nodes']} nodes, "
+                  f"{metrics['seconds']:.2f}s, {metrics['nodes_per_second']:.0f} nodes/s, "
+                  f"{metrics['peak_rss_mb']:.0f} MB")
+            sys.stdout.flush()
+
+    if args.update or not os.path.exists(args.baseline):
+        save_baseline(args.baseline, results)
+        print(f"Saved the baseline to {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, load_baseline(args.baseline), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Microbenchmarks for the hot operations of the searches.
+
+Measures operations per second, with a 95% confidence interval, of:
+
+  state.*   SlidingPuzzleState.result, hash() and == on 15-puzzle states
+  heuristic.<name>   every entry of algorithms.heuristics.HEURISTICS
+  queue.<Queue>.<op>   push and pop on each queue of utils.util, and
+                       update on the priority queues
+
+Each benchmark times one batch of operations per sample on fresh data from
+its setup, which is not timed, after a couple of warm-up batches.  Only
+the standard library is used for timing and statistics, and the results
+are written as sorted, indented JSON so that two runs can be diffed:
+
+    python src/analysis/microbench.py -o microbench.json
+    python src/analysis/microbench.py --filter heuristic --repeat 50
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+if __name__ == '__main__':
+    # Allow running this file directly as a script from the repository root.
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from puzzles.fifteen_puzzle import FifteenPuzzleState
+from algorithms.heuristics import HEURISTICS
+from utils import util
+from utils.generator import generate_scenarios
+
+RESULTS_VERSION = 1
+DEFAULT_BATCH = 2000
+DEFAULT_REPEAT = 20
+UPDATE_QUEUE_SIZE = 200
+WARMUP = 2
+
+# Two-sided 95% critical values of Student's t, by degrees of freedom
+_T95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def _t95(samples):
+    degrees = samples - 1
+    return _T95[degrees - 1] if degrees <= len(_T95) else 1.96
+
+
+def _states(count, seed):
+    "Returns 'count' random 15-puzzle states"
+    return [FifteenPuzzleState(board.tolist()) for board in generate_scenarios(count, moves=40, seed=seed)]
+
+
+def _state_benchmarks():
+    def result_setup(batch, rng):
+        states = _states(batch, rng.randrange(1 << 30))
+        return [(state, rng.choice(state.legalMoves())) for state in states]
+
+    def result_run(pairs):
+        for state, move in pairs:
+            state.result(move)
+
+    def hash_setup(batch, rng):
+        return _states(batch, rng.randrange(1 << 30))
+
+    def hash_run(states):
+        for state in states:
+            hash(state)
+
+    def eq_setup(batch, rng):
+        states = _states(batch, rng.randrange(1 << 30))
+        # half equal copies, half different boards
+        others = [FifteenPuzzleState(list(state.tiles)) if index % 2 else states[index - 1]
+                  for index, state in enumerate(states)]
+        return list(zip(states, others))
+
+    def eq_run(pairs):
+        for first, second in pairs:
+            first == second
+
+    return {
+        "state.result": (result_setup, result_run),
+        "state.hash": (hash_setup, hash_run),
+        "state.eq": (eq_setup, eq_run),
+    }
+
+
+def _heuristic_benchmarks():
+    benchmarks = {}
+    for name, heuristic in HEURISTICS.items():
+        def setup(batch, rng):
+            return _states(batch, rng.randrange(1 << 30))
+
+        def run(states, heuristic=heuristic):
+            for state in states:
+                heuristic(state)
+
+        benchmarks[f"heuristic.{name}"] = (setup, run)
+    return benchmarks
+
+
+def _queue_benchmarks():
+    def items(batch, rng):
+        return [(rng.random(), index) for index in range(batch)]
+
+    def filled(queue, entries, priority):
+        for entry in entries:
+            if priority:
+                queue.push(entry, entry[0])
+            else:
+                queue.push(entry)
+        return queue
+
+    factories = {
+        "Stack": (util.Stack, False),
+        "Queue": (util.Queue, False),
+        "PriorityQueue": (util.PriorityQueue, True),
+        "PriorityQueueWithFunction": (lambda: util.PriorityQueueWithFunction(lambda entry: entry[0]), False),
+    }
+    benchmarks = {}
+    for name, (factory, priority) in factories.items():
+        def push_setup(batch, rng, factory=factory):
+            return factory(), items(batch, rng)
+
+        def push_run(context, priority=priority):
+            filled(*context, priority)
+
+        def pop_setup(batch, rng, factory=factory, priority=priority):
+            return filled(factory(), items(batch, rng), priority), batch
+
+        def pop_run(context):
+            queue, count = context
+            for _ in range(count):
+                queue.pop()
+
+        benchmarks[f"queue.{name}.push"] = (push_setup, push_run)
+        benchmarks[f"queue.{name}.pop"] = (pop_setup, pop_run)
+
+        if hasattr(factory(), 'update'):
+            def update_setup(batch, rng, factory=factory, priority=priority):
+                # update scans the heap, so a smaller queue keeps samples short
+                entries = items(min(batch, UPDATE_QUEUE_SIZE), rng)
+                queue = filled(factory(), entries, priority)
+                # half of the updates lower a priority, half leave it
+                return queue, [(entry, entry[0] - 0.5 if index % 2 else entry[0] + 0.5)
+                               for index, entry in enumerate(rng.sample(entries, len(entries)))]
+
+            def update_run(context):
+                queue, updates = context
+                for entry, priority in updates:
+                    queue.update(entry, priority)
+                return len(updates)
+
+            benchmarks[f"queue.{name}.update"] = (update_setup, update_run)
+    return benchmarks
+
+
+def all_benchmarks():
+    """
+    Returns {name: (setup, run)}.  setup(batch, rng) builds the data that
+    run(data) is timed on; run returns the number of operations it did, or
+    None for 'batch'.
+    """
+    benchmarks = {}
+    benchmarks.update(_state_benchmarks())
+    benchmarks.update(_heuristic_benchmarks())
+    benchmarks.update(_queue_benchmarks())
+    return benchmarks
+
+
+def measure(setup, run, batch=DEFAULT_BATCH, repeat=DEFAULT_REPEAT, seed=0):
+    """
+    Times 'repeat' batches of 'batch' operations and returns the operations
+    per second: mean, standard deviation, median, and the 95% confidence
+    interval of the mean.
+    """
+    rng = random.Random(seed)
+    rates = []
+    for sample in range(WARMUP + repeat):
+        context = setup(batch, rng)
+        start = time.perf_counter_ns()
+        operations = run(context) or batch
+        elapsed = time.perf_counter_ns() - start
+        if sample >= WARMUP:
+            rates.append(operations * 1e9 / max(elapsed, 1))
+    mean = statistics.mean(rates)
+    stdev = statistics.stdev(rates) if len(rates) > 1 else 0.0
+    half_width = _t95(len(rates)) * stdev / len(rates) ** 0.5 if len(rates) > 1 else 0.0
+    return {
+        "ops_per_sec": mean,
+        "stdev": stdev,
+        "median": statistics.median(rates),
+        "ci95": [mean - half_width, mean + half_width],
+        "samples": len(rates),
+        "batch": batch,
+    }
+
+
+def run_benchmarks(pattern=None, batch=DEFAULT_BATCH, repeat=DEFAULT_REPEAT, on_result=None):
+    """
+    Runs every benchmark whose name contains 'pattern' (all by default) and
+    returns {name: measure(...) result}.
+
+    on_result: called as on_result(name, result) after each benchmark
+    """
+    results = {}
+    for name, (setup, run) in all_benchmarks().items():
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(setup, run, batch, repeat)
+        if on_result is not None:
+            on_result(name, results[name])
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the microbenchmarks and write the results as JSON.")
+    parser.add_argument('-o', '--output', default='microbench.json', help="JSON file to write")
+    parser.add_argument('--filter', default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument('--batch', type=int, default=DEFAULT_BATCH, help="operations per sample")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="samples per benchmark")
+    args = parser.parse_args(argv)
+
+    def report(name, result):
+        low, high = result["ci95"]
+        print(f"{name:45s} {result['ops_per_sec']:14,.0f} ops/s  (95% CI {low:,.0f} - {high:,.0f})")
+        sys.stdout.flush()
+
+    results = run_benchmarks(args.filter, args.batch, args.repeat, report)
+    with open(args.output, 'w') as file:
+        json.dump({
+            "version": RESULTS_VERSION,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "benchmarks": results,
+        }, file, indent=2, sort_keys=True)
+        file.write('\n')
+    print(f"Saved the results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
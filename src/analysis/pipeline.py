@@ -0,0 +1,265 @@
+"""
+Streaming building blocks for the comparison scripts.
+
+A sweep is a chain of generators: scenarios are read lazily (see
+utils.generator.load_scenarios), each one is solved as soon as it is read,
+and every result row is written and flushed before the next job starts, so
+the first results are on disk at once and memory does not grow with the
+number of scenarios.  Summaries are computed in one pass over the rows,
+with percentiles estimated by the P-square algorithm of Jain and Chlamtac
+(five markers per percentile instead of the whole sample).
+"""
+
+import csv
+import math
+import os
+from bisect import insort
+from collections import Counter
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class P2Quantile:
+    """
+    Streaming estimate of the p-quantile of a sequence of numbers in
+    constant memory (the P-square algorithm).  Exact for up to five values.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value):
+        self.count += 1
+        heights, positions = self.heights, self.positions
+        if self.count <= 5:
+            insort(heights, value)
+            return
+
+        # find the cell k with heights[k] <= value < heights[k + 1]
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= heights[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # move the middle markers towards their desired positions
+        for i in range(1, 4):
+            offset = self.desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i, step):
+        heights, positions = self.heights, self.positions
+        return heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+            (positions[i] - positions[i - 1] + step) * (heights[i + 1] - heights[i]) / (positions[i + 1] - positions[i])
+            + (positions[i + 1] - positions[i] - step) * (heights[i] - heights[i - 1]) / (positions[i] - positions[i - 1]))
+
+    def value(self):
+        "Returns the current estimate, or NaN before the first value"
+        if self.count == 0:
+            return math.nan
+        if self.count <= 5:
+            # linear interpolation between the closest ranks of the sample
+            rank = self.p * (self.count - 1)
+            low = int(rank)
+            high = min(low + 1, self.count - 1)
+            return self.heights[low] + (rank - low) * (self.heights[high] - self.heights[low])
+        return self.heights[2]
+
+
+class RunningSummary:
+    """
+    Count, mean, minimum, maximum and percentiles of a stream of numbers.
+    """
+
+    def __init__(self, percentiles=PERCENTILES):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.quantiles = {p: P2Quantile(p) for p in percentiles}
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        for quantile in self.quantiles.values():
+            quantile.add(value)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    def percentile(self, p):
+        return self.quantiles[p].value()
+
+
+def _drop_partial_line(path):
+    "Truncates a file written by an interrupted run after its last complete line"
+    with open(path, 'rb+') as file:
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - 4096)
+            file.seek(start)
+            block = file.read(position - start)
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                if start + newline + 1 != end:
+                    file.truncate(start + newline + 1)
+                return
+            position = start
+        file.truncate(0)
+
+
+def write_rows(rows, results_file, header, append=False):
+    """
+    Writes 'header' and then each row of the iterable 'rows' to a CSV file,
+    flushing after every row, and yields the rows on as they are written.
+
+    With append=True an existing file is treated as an append-only log: a
+    line cut short by an interrupted run is dropped and the new rows are
+    added after the others.  Its header must match 'header'.
+    """
+    if append and os.path.exists(results_file):
+        _drop_partial_line(results_file)
+    if append and os.path.exists(results_file) and os.path.getsize(results_file):
+        with open(results_file, mode='r', newline='') as file:
+            existing = next(csv.reader(file))
+        if existing != list(header):
+            raise ValueError(f"{results_file} has the columns {existing}, expected {list(header)}; it was "
+                             f"written by an older version.  Move it aside, or run with resume=False to "
+                             f"start it afresh.")
+        mode = 'a'
+    else:
+        mode = 'w'
+
+    with open(results_file, mode=mode, newline='') as file:
+        writer = csv.writer(file)
+        if mode == 'w':
+            writer.writerow(header)
+            file.flush()
+        for row in rows:
+            writer.writerow(row)
+            file.flush()
+            yield row
+
+
+def read_rows(results_file):
+    "Yields the rows of a results CSV one at a time, as dicts"
+    with open(results_file, mode='r', newline='') as file:
+        yield from csv.DictReader(file)
+
+
+def finished_jobs(results_file, key_columns):
+    """
+    Returns the set of key tuples, the values of 'key_columns' as strings,
+    of the complete rows already in a results log.
+    """
+    if not os.path.exists(results_file):
+        return set()
+    return {key for key in (tuple(row.get(column) for column in key_columns) for row in read_rows(results_file))
+            if None not in key}
+
+
+def summarize(rows, group, metrics):
+    """
+    Summarizes a stream of result dicts in one pass.
+
+    Args:
+        rows (iterable): Result rows, e.g. from read_rows
+        group (str): Column naming the compared method, e.g. 'Heuristic'
+        metrics (dict): Maps a summary name to the column it reads, parsed
+            as a float; rows whose value is not a number are skipped
+
+    Returns:
+        dict: {method: {summary name: RunningSummary}}, methods in the order
+        they first appear
+    """
+    summaries = {}
+    for row in rows:
+        method = summaries.setdefault(row[group], {name: RunningSummary() for name in metrics})
+        for name, column in metrics.items():
+            try:
+                value = float(row[column])
+            except (TypeError, ValueError):
+                continue
+            method[name].add(value)
+    return summaries
+
+
+def solved_rows(rows, group, outcomes):
+    """
+    Yields the rows whose 'Outcome' is 'solved', counting the outcomes of
+    all rows per method into the dict 'outcomes' ({method: Counter}).
+    Rows without an 'Outcome' column count as solved.
+    """
+    for row in rows:
+        outcome = row.get('Outcome') or 'solved'
+        outcomes.setdefault(row[group], Counter())[outcome] += 1
+        if outcome == 'solved':
+            yield row
+
+
+def current_rows(rows, configs):
+    """
+    Yields the rows whose 'Config' is in the set 'configs', dropping rows
+    an append-only log keeps from earlier job sets (other limits or other
+    scenarios under the same ids).
+    """
+    for row in rows:
+        if row.get('Config') in configs:
+            yield row
+
+
+def print_outcomes(outcomes):
+    "Prints the number of jobs of each method that ended in each outcome"
+    print("\nOutcomes:")
+    for method, counts in outcomes.items():
+        print(f"{method}: " + ", ".join(f"{count} {outcome}" for outcome, count in counts.most_common()))
+
+
+def print_summary(summaries):
+    """
+    Prints the mean and percentiles of each metric of summarize's output
+    and the method with the lowest mean for each.
+    """
+    titles = {
+        'expanded_nodes': ("Expanded Nodes", "{:.1f}"),
+        'execution_time': ("Execution Time", "{:.4f} seconds"),
+        'max_fringe': ("Max Fringe Size", "{:.1f}"),
+    }
+    metrics = next(iter(summaries.values()), {})
+    for metric in metrics:
+        title, fmt = titles.get(metric, (metric, "{:.4f}"))
+        print(f"\nFinal Scores (Average {title}):")
+        for method, method_metrics in summaries.items():
+            summary = method_metrics[metric]
+            percentiles = "  ".join(f"p{round(p * 100)} {fmt.format(summary.percentile(p))}"
+                                    for p in summary.quantiles)
+            print(f"{method}: {fmt.format(summary.mean)}  ({percentiles})")
+        measured = [method for method in summaries if summaries[method][metric].count]
+        if measured:
+            winner = min(measured, key=lambda method: summaries[method][metric].mean)
+            print(f"\nWinner for Least {title}: {winner} with {fmt.format(summaries[winner][metric].mean)}")
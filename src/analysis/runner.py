@@ -0,0 +1,249 @@
+"""
+Parallel runner for benchmark jobs.
+
+A job is one search on one scenario: a (scenario id, algorithm, heuristic)
+triple plus the packed board it starts from.  Algorithms and heuristics
+are named by the keys of SEARCHES and HEURISTICS, so jobs are small tuples
+that pickle cheaply.  run_jobs hands them to a pool of processes a chunk at
+a time, keeps a bounded number of chunks in flight, and yields the results
+in the order of the jobs however the workers finish.
+
+Each job can run under Limits: a wall-clock limit (util.TimeoutFunction),
+a limit on how much the process's resident memory grows during the job,
+and a limit on the nodes the search visits.  The memory and node limits are checked every time the
+search tests a node for the goal.  A job stopped by a limit is not an
+error: its result records the outcome ('timeout', 'memory_out' or
+'node_limit') with the nodes visited and the time spent until then.
+
+The nodes and fringe size of a finished job are the SearchStats'
+nodesExpanded and maxOpen, the same counts for every search.
+"""
+
+import hashlib
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from puzzles.sliding_puzzle import SlidingPuzzleState, SlidingPuzzleSearchProblem
+from utils import util
+from algorithms.layered import unpackTiles
+from algorithms.search import (aStarSearch, breadthFirstSearch, depthFirstSearch,
+                               enhancedPartialExpansionAStarSearch, iterativeDeepeningAStarSearch,
+                               nullHeuristic, uniformCostSearch)
+from algorithms.heuristics import (h1_misplaced_tiles, h2_euclidean_distance,
+                                   h3_manhattan_distance, h4_row_column_misplacements)
+
+SEARCHES = {
+    "DFS": depthFirstSearch,
+    "BFS": breadthFirstSearch,
+    "UCS": uniformCostSearch,
+    "A*": aStarSearch,
+    "EPEA*": enhancedPartialExpansionAStarSearch,
+    "IDA*": iterativeDeepeningAStarSearch,
+}
+
+# Searches that take a heuristic
+INFORMED = {"A*", "EPEA*", "IDA*"}
+
+HEURISTICS = {
+    None: nullHeuristic,
+    "misplaced": h1_misplaced_tiles,
+    "euclidean": h2_euclidean_distance,
+    "manhattan": h3_manhattan_distance,
+    "row_column": h4_row_column_misplacements,
+}
+
+DEFAULT_CHUNK_SIZE = 4
+
+# Nodes visited between two checks of the resident memory
+MEMORY_CHECK_INTERVAL = 1024
+
+OUTCOMES = ("solved", "unsolved", "timeout", "memory_out", "node_limit")
+
+Job = namedtuple('Job', ['scenario', 'algorithm', 'heuristic', 'board', 'rows', 'cols', 'goal'],
+                 defaults=[4, 4, None])
+Job.__doc__ = """
+One benchmark search.  'board' is the start board packed by
+algorithms.layered.packTiles; 'goal' is a flat goal board, or None for
+the tiles in order with the blank last.
+"""
+
+
+class JobResult(namedtuple('JobResult', ['outcome', 'depth', 'expanded_nodes', 'max_fringe_size', 'execution_time'])):
+    """
+    The result of one job.  'outcome' is one of OUTCOMES; 'depth' is None
+    unless the job was solved.
+    """
+    __slots__ = ()
+
+    @property
+    def solved(self):
+        return self.outcome == "solved"
+
+
+Limits = namedtuple('Limits', ['seconds', 'memory_mb', 'nodes'], defaults=[None, None, None])
+Limits.__doc__ = """
+Per-job limits, each None for no limit: wall-clock 'seconds', growth of
+the resident memory of the process running the job in 'memory_mb', and
+nodes visited.  The memory is measured from the job's start, so memory a
+reused worker kept from earlier jobs does not count against later ones.
+"""
+
+
+class MemoryLimitExceeded(Exception):
+    """Raised when a job's process grows past its memory limit"""
+    pass
+
+
+class NodeLimitExceeded(Exception):
+    """Raised when a job's search visits more nodes than its limit"""
+    pass
+
+
+def _resident_bytes():
+    "Returns the resident memory of this process, or None where unknown"
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _LimitedProblem:
+    """
+    Wraps a search problem and checks the node and memory limits each time
+    the search tests a node for the goal.  Everything else is delegated.
+    """
+
+    def __init__(self, problem, limits):
+        self._problem = problem
+        self._node_limit = limits.nodes
+        self._memory_limit = None
+        if limits.memory_mb:
+            # Python seldom returns freed memory, so only the job's growth counts
+            baseline = _resident_bytes()
+            if baseline is not None:
+                self._memory_limit = baseline + limits.memory_mb * (1 << 20)
+        self.visited = 0
+
+    def __getattr__(self, name):
+        return getattr(self._problem, name)
+
+    def isGoalState(self, state):
+        if self._node_limit is not None and self.visited >= self._node_limit:
+            raise NodeLimitExceeded()
+        self.visited += 1
+        if self._memory_limit is not None and self.visited % MEMORY_CHECK_INTERVAL == 0:
+            resident = _resident_bytes()
+            if resident is not None and resident > self._memory_limit:
+                raise MemoryLimitExceeded()
+        return self._problem.isGoalState(state)
+
+
+def _search(job, problem):
+    "Runs the search of 'job' on 'problem' and returns its SearchStats"
+    search = SEARCHES[job.algorithm]
+    if job.algorithm in INFORMED:
+        return search(problem, HEURISTICS[job.heuristic])
+    return search(problem)
+
+
+def run_job(job, limits=None):
+    "Runs one job in this process under 'limits' (a Limits) and returns its JobResult"
+    tiles = unpackTiles(job.board, job.rows * job.cols)
+    unlimited = SlidingPuzzleSearchProblem(SlidingPuzzleState(tiles, job.rows, job.cols, job.goal))
+    problem = unlimited
+    if limits is not None:
+        # also counts the nodes visited, reported if the search is stopped
+        problem = _LimitedProblem(unlimited, limits)
+    search = _search
+    if limits is not None and limits.seconds:
+        search = util.TimeoutFunction(_search, limits.seconds)
+
+    start_time = time.perf_counter()
+    try:
+        stats = search(job, problem)
+    except (util.TimeoutFunctionException, MemoryLimitExceeded, MemoryError, NodeLimitExceeded) as e:
+        execution_time = time.perf_counter() - start_time
+        if isinstance(e, util.TimeoutFunctionException):
+            outcome = "timeout"
+        elif isinstance(e, NodeLimitExceeded):
+            outcome = "node_limit"
+        else:
+            outcome = "memory_out"
+        return JobResult(outcome, None, problem.visited, None, execution_time)
+    execution_time = time.perf_counter() - start_time
+
+    return JobResult("solved" if stats.solved else "unsolved", stats.depth,
+                     stats.nodesExpanded, stats.maxOpen, execution_time)
+
+
+def config_hash(job, limits=None):
+    """
+    Returns a short hash of everything but the scenario id that determines
+    a job's result: the search, the heuristic, the board, its size and
+    goal, and the limits.  Results logs key finished jobs by it.
+    """
+    config = repr((tuple(job[1:]), tuple(limits) if limits is not None else None))
+    return hashlib.sha1(config.encode('utf-8')).hexdigest()[:12]
+
+
+def _run_chunk(jobs, limits):
+    "Runs a chunk of jobs in a worker process"
+    return [run_job(job, limits) for job in jobs]
+
+
+def run_jobs(jobs, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, limits=None):
+    """
+    Runs the jobs of the iterable 'jobs' and yields (job, result) pairs in
+    the order of 'jobs'.
+
+    Args:
+        jobs (iterable): Job tuples; read lazily, a few chunks ahead
+        workers (int): Worker processes; 1 runs every job in the calling
+            process instead, one after another, so its limits and memory
+            are shared with the caller (and the time limit, which uses
+            SIGALRM, only works from the main thread)
+        chunk_size (int): Jobs sent to a worker at a time, to amortize the
+            cost of each round trip
+        limits (Limits): Limits applied to every job
+
+    Results that finish early wait, at most a few chunks per worker, until
+    every earlier job has been yielded.
+    """
+    jobs = iter(jobs)
+    if workers <= 1:
+        for job in jobs:
+            yield job, run_job(job, limits)
+        return
+
+    max_in_flight = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}  # future -> (chunk index, chunk)
+        finished = {}  # chunk index -> (chunk, results)
+        submitted = 0
+        next_chunk = 0
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) + len(finished) < max_in_flight:
+                chunk = list(islice(jobs, chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending[pool.submit(_run_chunk, chunk, limits)] = (submitted, chunk)
+                submitted += 1
+
+            if next_chunk in finished:
+                chunk, results = finished.pop(next_chunk)
+                next_chunk += 1
+                yield from zip(chunk, results)
+                continue
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, chunk = pending.pop(future)
+                finished[index] = (chunk, future.result())
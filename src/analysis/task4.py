@@ -1,11 +1,14 @@
-import csv
 import os
-import time
-import pandas as pd
-from fifteenpuzzle import FifteenPuzzleState, FifteenPuzzleSearchProblem
-from generate import generate_and_save_scenarios
-from search import aStarSearch
-from search import depthFirstSearch, breadthFirstSearch, uniformCostSearch, h3_manhattan_distance
+import sys
+
+# Allow running this file directly as a script from the repository root.
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from puzzles.fifteen_puzzle import FifteenPuzzleState
+from utils.generator import generate_and_save_scenarios, load_scenarios
+from analysis.pipeline import (write_rows, read_rows, finished_jobs, current_rows, solved_rows, summarize,
+                               print_outcomes, print_summary)
+from analysis.runner import Job, Limits, config_hash, run_jobs
 
 def validate_and_prepare_puzzle(puzzle_state):
     """
@@ -23,144 +26,117 @@ def validate_and_prepare_puzzle(puzzle_state):
 
     return puzzle_state
 
-def run_strategic_comparison(puzzles, results_file):
+# (name, algorithm, heuristic), keys of analysis.runner.SEARCHES and HEURISTICS
+STRATEGIES = [
+    ("DFS", "DFS", None),
+    ("BFS", "BFS", None),
+    ("UCS", "UCS", None),
+    ("A* with Manhattan Distance", "A*", "manhattan")
+]
+
+RESULTS_HEADER = ["PuzzleID", "Strategy", "Solved", "Outcome", "Solution Depth", "Expanded Nodes", "Max Fringe Size",
+                  "Execution Time", "Config"]
+
+# Columns identifying a job in the results log
+KEY_COLUMNS = ["PuzzleID", "Strategy", "Config"]
+
+# Per-job limits used when the script is run
+LIMITS = Limits(seconds=60, memory_mb=4096)
+
+METRICS = {"expanded_nodes": "Expanded Nodes", "execution_time": "Execution Time", "max_fringe": "Max Fringe Size"}
+
+
+def strategy_jobs(puzzles):
+    """
+    Yields a runner Job for each puzzle of the iterable 'puzzles' and each
+    strategy.  Puzzles are read one at a time, so 'puzzles' can be a lazy
+    scenario stream.
+    """
+    for idx, puzzle_state in enumerate(puzzles, 1):
+        print(f"Running comparisons for puzzle {idx}...")
+
+        try:
+            # Validate and prepare the puzzle state
+            valid_puzzle_state = validate_and_prepare_puzzle(puzzle_state)
+            puzzle = FifteenPuzzleState(valid_puzzle_state)
+        except ValueError as e:
+            print(f"Error processing puzzle {idx}: {e}")
+            continue
+
+        for name, algorithm, heuristic in STRATEGIES:
+            yield Job(idx, algorithm, heuristic, puzzle.pack())
+
+
+def strategy_rows(puzzles, workers=1, limits=None, finished=frozenset(), configs=None):
+    """
+    Solves each puzzle with every strategy on 'workers' processes, each job
+    under 'limits' (a runner Limits), yielding the result rows in puzzle and
+    strategy order as they finish.  Every job gets a row; one stopped by a
+    limit records its outcome, so a stuck DFS no longer hides the others.
+    Jobs whose KEY_COLUMNS values are in the set 'finished' are skipped.  The Config of every job,
+    run or skipped, is added to the set 'configs' if one is given.
+    """
+    names = {(algorithm, heuristic): name for name, algorithm, heuristic in STRATEGIES}
+
+    def key(job):
+        return str(job.scenario), names[job.algorithm, job.heuristic], config_hash(job, limits)
+
+    def pending():
+        for job in strategy_jobs(puzzles):
+            job_key = key(job)
+            if configs is not None:
+                configs.add(job_key[2])
+            if job_key not in finished:
+                yield job
+
+    jobs = pending()
+    for job, result in run_jobs(jobs, workers, limits=limits):
+        scenario, name, config = key(job)
+        depth = result.depth if result.solved else "N/A"
+        yield [job.scenario, name, result.solved, result.outcome, depth,
+               result.expanded_nodes, result.max_fringe_size, result.execution_time, config]
+
+
+def run_strategic_comparison(puzzles, results_file, workers=1, limits=None, resume=True):
     """
-    Run comparisons for A* using different heuristics and write results to a CSV file.
+    Run comparisons for the uninformed strategies and A* with Manhattan distance and write
+    results to a CSV file.  Each row is written and flushed as soon as it and every earlier
+    row are done.
+
+    The results file is an append-only log keyed by KEY_COLUMNS: with resume=True, jobs
+    already in it are skipped and the others are appended, so an interrupted sweep picks
+    up where it stopped.  With resume=False the file is started afresh.
+
+    Returns the set of Config values of this job set, to analyze only its rows.
     """
-    Strategies = [
-        ("DFS", depthFirstSearch),
-        ("BFS", breadthFirstSearch),
-        ("UCS", uniformCostSearch),
-        ("A* with Manhattan Distance", h3_manhattan_distance)
-    ]
-
-    # Open the CSV file to write the results
-    with open(results_file, mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(
-            ["PuzzleID", "Strategy", "Solved", "Solution Depth", "Expanded Nodes", "Max Fringe Size", "Execution Time"]
-        )
-
-        # Iterate through the list of puzzles and run the comparisons
-        for idx, puzzle_state in enumerate(puzzles, 1):
-            print(f"Running comparisons for puzzle {idx}...")
-
-            try:
-                # Validate and prepare the puzzle state
-                valid_puzzle_state = validate_and_prepare_puzzle(puzzle_state)
-                puzzle = FifteenPuzzleState(valid_puzzle_state)
-
-                # Create the search problem
-                problem = FifteenPuzzleSearchProblem(puzzle)
-
-
-                i=0
-                name="UFS"
-                best_heuristic=[0,0,0,0]
-                # Track expanded nodes and fringe size locally
-                for name, strategy in Strategies:
-                    expanded_nodes = 0  # Reset expanded node count
-                    max_fringe_size = 0  # Reset max fringe size
-
-                    def track_fringe(fringe):
-                        """Utility to update the max fringe size."""
-                        nonlocal max_fringe_size
-                        max_fringe_size = max(max_fringe_size, fringe.count)
-
-                    def track_expansion():
-                        """Utility to increment the expanded node counter."""
-                        nonlocal expanded_nodes
-                        expanded_nodes += 1
-
-                    start_time = time.perf_counter()
-
-                    if(i%4!=3):
-                        solution, max_fringe_size, expanded_nodes = strategy(problem)
-                    else:
-                        solution = aStarSearch(problem, strategy, track_fringe, track_expansion)
-
-                    end_time = time.perf_counter()
-
-
-                    solved = bool(solution)
-                    depth = len(solution) if solved else "N/A"
-                    execution_time = end_time - start_time
-                    if not solved:
-                        break
-
-                    i=i+1
-                    writer.writerow([idx, name, solved, depth, expanded_nodes, max_fringe_size, execution_time])
-
-            except ValueError as e:
-                print(f"Error processing puzzle {idx}: {e}")
-
-def analyze_result(results_file):
+    finished = finished_jobs(results_file, KEY_COLUMNS) if resume else frozenset()
+    configs = set()
+    for _ in write_rows(strategy_rows(puzzles, workers, limits, finished, configs), results_file, RESULTS_HEADER,
+                        append=resume):
+        pass
+    return configs
+
+def analyze_result(results_file, configs=None):
         """
-        Analyze the results from the CSV file to find the heuristic that expanded the least nodes,
-        had the least execution time, and the least max fringe size.
+        Analyze the results from the CSV file to find the strategy that expanded the least nodes,
+        had the least execution time, and the least max fringe size.  The file is read in one
+        streaming pass; percentiles are estimated without keeping the rows.  Only solved jobs
+        are scored; the outcomes of all jobs are listed first.  With 'configs', the set returned
+        by run_strategic_comparison, only the rows of that job set are read; the log may also
+        hold rows from earlier runs with other limits or scenarios.
         """
-        Strategies_scores = {
-            "DFS": {"expanded_nodes": 0, "execution_time": 0, "max_fringe": 0, "count": 0},
-            "BFS": {"expanded_nodes": 0, "execution_time": 0, "max_fringe": 0, "count": 0},
-            "UCS": {"expanded_nodes": 0, "execution_time": 0, "max_fringe": 0, "count": 0},
-            "A* with Manhattan Distance": {"expanded_nodes": 0, "execution_time": 0, "max_fringe": 0, "count": 0},
-        }
-
-        # Read the CSV results file
-        with open(results_file, mode='r') as file:
-            reader = csv.DictReader(file)
-
-            # Analyze each row
-            for row in reader:
-                strategy = row['Strategy']
-                expanded_nodes = int(row['Expanded Nodes'])
-                execution_time = float(row['Execution Time'])
-                max_fringe_size = int(row['Max Fringe Size'])
-
-                # Accumulate scores
-                Strategies_scores[strategy]["expanded_nodes"] += expanded_nodes
-                Strategies_scores[strategy]["execution_time"] += execution_time
-                Strategies_scores[strategy]["max_fringe"] += max_fringe_size
-                Strategies_scores[strategy]["count"] += 1
-
-        # Calculate average scores
-        for strategy in Strategies_scores:
-            if  Strategies_scores[strategy]["count"] > 0:
-                Strategies_scores[strategy]["expanded_nodes"] /= Strategies_scores[strategy]["count"]
-                Strategies_scores[strategy]["execution_time"] /= Strategies_scores[strategy]["count"]
-                Strategies_scores[strategy]["max_fringe"] /= Strategies_scores[strategy]["count"]
-
-        # Determine winners for each metric
-        expanded_winner = min(Strategies_scores, key=lambda h: Strategies_scores[h]["expanded_nodes"])
-        time_winner = min(Strategies_scores, key=lambda h: Strategies_scores[h]["execution_time"])
-        fringe_winner = min(Strategies_scores, key=lambda h: Strategies_scores[h]["max_fringe"])
-
-        # Print final scores and winners
-        print("\nFinal Scores (Total Expanded Nodes):")
-        for heuristic, metrics in Strategies_scores.items():
-            print(f"{heuristic}: {metrics['expanded_nodes']}")
-
-        print(
-            f"\nWinner for Least Expanded Nodes: {expanded_winner} with {Strategies_scores[expanded_winner]['expanded_nodes']} total expanded nodes")
-
-        print("\nFinal Scores (Average Execution Time):")
-        for heuristic, metrics in Strategies_scores.items():
-            print(f"{heuristic}: {metrics['execution_time']:.4f} seconds")
-
-        print(
-            f"\nWinner for Least Execution Time: {time_winner} with {Strategies_scores[time_winner]['execution_time']:.4f} seconds")
-
-        print("\nFinal Scores (Average Max Fringe Size):")
-        for heuristic, metrics in Strategies_scores.items():
-            print(f"{heuristic}: {metrics['max_fringe']}")
-
-        print(
-            f"\nWinner for Least Max Fringe Size: {fringe_winner} with {Strategies_scores[fringe_winner]['max_fringe']} size")
+        outcomes = {}
+        rows = read_rows(results_file)
+        if configs is not None:
+            rows = current_rows(rows, configs)
+        summaries = summarize(solved_rows(rows, "Strategy", outcomes), "Strategy", METRICS)
+        print_outcomes(outcomes)
+        print_summary(summaries)
 
 
 if __name__ == "__main__":
-    # Example usage, reading scenarios from a CSV
-    scenarios_file = "scenarios.csv"
+    # Example usage, reading scenarios from a scenario file
+    scenarios_file = "scenarios.bin"
     results_file = "results_task4.csv"
 
     # If the scenarios file does not exist, we generate it.
@@ -168,10 +144,10 @@ if __name__ == "__main__":
         print(f"{scenarios_file} not found. Generating random puzzles...")
         generate_and_save_scenarios(scenarios_file, num_puzzles=100, moves=25)
 
-    # Read the puzzles from CSV (assuming they're formatted as arrays)
-    puzzles_df = pd.read_csv(scenarios_file)
-    puzzles = puzzles_df['State'].apply(eval).tolist()
-
-    # Run the comparison
-    run_strategic_comparison(puzzles, results_file)
-    analyze_result(results_file)
+    # Run the comparison, streaming the puzzles from the scenario file
+    try:
+        configs = run_strategic_comparison(load_scenarios(scenarios_file), results_file,
+                                           workers=os.cpu_count() or 1, limits=LIMITS)
+    except ValueError as e:
+        sys.exit(f"Cannot resume: {e}")
+    analyze_result(results_file, configs)
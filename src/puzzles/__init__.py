@@ -2,12 +2,17 @@
 Puzzle implementations for N-Puzzle Solver.
 """
 
+from .sliding_puzzle import SlidingPuzzleState, SlidingPuzzleSearchProblem
 from .eight_puzzle import EightPuzzleState, EightPuzzleSearchProblem
 from .fifteen_puzzle import FifteenPuzzleState, FifteenPuzzleSearchProblem
+from .eight_puzzle_table import EightPuzzleDistanceTable
 
 __all__ = [
+    'SlidingPuzzleState',
+    'SlidingPuzzleSearchProblem',
     'EightPuzzleState',
     'EightPuzzleSearchProblem', 
     'FifteenPuzzleState',
-    'FifteenPuzzleSearchProblem'
+    'FifteenPuzzleSearchProblem',
+    'EightPuzzleDistanceTable'
 ]
@@ -0,0 +1,154 @@
+# eight_puzzle_table.py
+# ---------------------
+# Complete distance table for the eight puzzle.
+
+"""
+Complete distance table for the eight puzzle.
+
+The eight puzzle has only 181,440 reachable states, so every one of them can
+be solved in advance.  A single breadth-first search backwards from the goal
+of EightPuzzleState.isGoal records each state's optimal distance in a
+bytearray indexed by the rank of the state's permutation (362,880 bytes, 255
+for the unreachable half).  An optimal solution is then a greedy descent
+through the table: from each state take a move whose result is one step
+closer, so a query costs one table lookup per move and no search at all.
+
+Run this module as a script to build the table file:
+
+    python src/puzzles/eight_puzzle_table.py [path]
+"""
+
+import os
+import sys
+from collections import deque
+
+if __name__ == '__main__':
+    # Allow running this file directly as a script from the repository root.
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.util import rankPermutation
+from puzzles.sliding_puzzle import moveTable
+
+GOAL = (0, 1, 2, 3, 4, 5, 6, 7, 8)
+UNREACHABLE = 255
+TABLE_SIZE = 362880  # 9!
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'eight_puzzle_distances.bin')
+
+# (move, neighbouring cell) for each blank cell of the 3x3 board
+_MOVES = moveTable(3, 3)
+
+
+def _flatten(puzzle):
+    "Returns the tiles of an EightPuzzleState or a flat list as a list"
+    return list(getattr(puzzle, 'tiles', puzzle))
+
+
+class EightPuzzleDistanceTable:
+    """
+      Optimal distance to the goal of every eight puzzle state.
+
+      distances[rankPermutation(tiles)] is the number of moves in an optimal
+      solution, or UNREACHABLE for boards of the wrong parity.
+    """
+
+    def __init__(self, distances):
+        if len(distances) != TABLE_SIZE:
+            raise ValueError(f"Expected {TABLE_SIZE} entries, got {len(distances)}")
+        self.distances = distances
+
+    @classmethod
+    def build(cls):
+        "Runs the breadth-first search from the goal and returns the table"
+        distances = bytearray([UNREACHABLE]) * TABLE_SIZE
+        distances[rankPermutation(GOAL)] = 0
+        queue = deque([(list(GOAL), 0)])
+        while queue:
+            cells, blank = queue.popleft()
+            distance = distances[rankPermutation(cells)] + 1
+            for move, target in _MOVES[blank]:
+                successor = cells[:]
+                successor[blank], successor[target] = successor[target], 0
+                rank = rankPermutation(successor)
+                if distances[rank] == UNREACHABLE:
+                    distances[rank] = distance
+                    queue.append((successor, target))
+        return cls(distances)
+
+    def save(self, path=DEFAULT_TABLE_PATH):
+        "Writes the raw table, one byte per permutation rank"
+        with open(path, 'wb') as file:
+            file.write(self.distances)
+
+    @classmethod
+    def load(cls, path=DEFAULT_TABLE_PATH):
+        """
+        Reads a table written by save.  If there is no file at 'path' yet, the
+        table is built and saved there first.
+        """
+        if not os.path.exists(path):
+            table = cls.build()
+            table.save(path)
+            return table
+        with open(path, 'rb') as file:
+            return cls(bytearray(file.read()))
+
+    def distance(self, puzzle):
+        "Returns the optimal solution length of a puzzle, or None if unsolvable"
+        distance = self.distances[rankPermutation(_flatten(puzzle))]
+        return None if distance == UNREACHABLE else distance
+
+    def heuristic(self, state, problem=None):
+        """
+        The exact distance, as a (perfect) heuristic for the searches.
+
+        Raises ValueError for a board of the wrong parity, which no search can
+        solve; UNREACHABLE is not a distance.
+        """
+        distance = self.distances[rankPermutation(_flatten(state))]
+        if distance == UNREACHABLE:
+            raise ValueError("The puzzle is not solvable")
+        return distance
+
+    def solve(self, puzzle):
+        """
+        Returns an optimal list of moves for an EightPuzzleState or a flat list
+        of its tiles, found by greedy descent through the table.
+
+        Raises ValueError if the puzzle is not solvable.
+        """
+        cells = _flatten(puzzle)
+        distance = self.distances[rankPermutation(cells)]
+        if distance == UNREACHABLE:
+            raise ValueError("The puzzle is not solvable")
+
+        blank = cells.index(0)
+        actions = []
+        while distance > 0:
+            for move, target in _MOVES[blank]:
+                cells[blank], cells[target] = cells[target], 0
+                if self.distances[rankPermutation(cells)] == distance - 1:
+                    actions.append(move)
+                    blank = target
+                    distance -= 1
+                    break
+                cells[target], cells[blank] = cells[blank], 0
+        return actions
+
+    def histogram(self):
+        "Returns the number of states at each distance from the goal"
+        counts = [0] * (max(d for d in self.distances if d != UNREACHABLE) + 1)
+        for distance in self.distances:
+            if distance != UNREACHABLE:
+                counts[distance] += 1
+        return counts
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TABLE_PATH
+    table = EightPuzzleDistanceTable.build()
+    table.save(path)
+    counts = table.histogram()
+    print(f"Saved the distances of {sum(counts)} states to {path}")
+    for distance, count in enumerate(counts):
+        print(f"{distance:3d}: {count}")
@@ -11,19 +11,22 @@
 # Student side autograding was added by Brad Miller, Nick Hay, and
 # Pieter Abbeel (pabbeel@cs.berkeley.edu).
 
-import search
+from puzzles.sliding_puzzle import SlidingPuzzleState, SlidingPuzzleSearchProblem, blankLastGoal
 import random
 
+FIFTEEN_PUZZLE_GOAL = blankLastGoal(4, 4)
+
 
 # Module Classes
 
-class FifteenPuzzleState:
+class FifteenPuzzleState(SlidingPuzzleState):
     """
     The Fifteen Puzzle (4x4 grid) is an extension of the 8-puzzle.
 
     This class defines the mechanics of the 15-puzzle itself.
     The task of recasting this puzzle as a search problem is left to
-    the FifteenPuzzleSearchProblem class.
+    the FifteenPuzzleSearchProblem class.  The moves, comparison and
+    display come from the generic SlidingPuzzleState.
     """
 
     def __init__(self, numbers):
@@ -33,174 +36,23 @@ class FifteenPuzzleState:
         numbers: a list of integers from 0 to 15 representing an
         instance of the fifteen puzzle. 0 represents the blank space.
 
-        Example configuration (solved state):
-        -------------
-        | 1 | 2 | 3 | 4 |
-        -------------
-        | 5 | 6 | 7 | 8 |
-        -------------
-        | 9 | 10| 11| 12|
-        -------------
-        | 13| 14| 15|   |  <-- 0 represents the blank space
-        -------------
-        """
-        # Initialize the grid and blank space location
-        self.cells = []
-        numbers = numbers[:]  # Make a copy to avoid side-effects.
-        numbers.reverse()
-
-        # =====Start Change Task 1.1=====
-        # Adjust for 4x4 grid (Fifteen Puzzle)
-        for row in range(4):  # Change from 3 to 4 rows
-            self.cells.append([])
-            for col in range(4):  # Change from 3 to 4 columns
-                self.cells[row].append(numbers.pop())
-                if self.cells[row][col] == 0:
-                    self.blankLocation = row, col  # Track blank space
-        # =====End Change Task 1.1=====
-
-    def isGoal(self):
-        """
-        Checks if the puzzle is in its goal state (solved state) for a 4x4 grid:
-
-        -------------
-        | 1 | 2 | 3 | 4 |
-        -------------
-        | 5 | 6 | 7 | 8 |
-        -------------
-        | 9 | 10| 11| 12|
-        -------------
-        | 13| 14| 15| 0 |  <-- 0 represents the blank space
-        -------------
-
-        Returns True if the current state is the goal state.
-        """
-        current = 1  # Start with 1 since 0 is the blank space.
-
-        # /*=====Start Change Task 1.2 =====*/
-        # Adjust for 4x4 grid
-        for row in range(4):  # Iterate over 4 rows
-            for col in range(4):  # Iterate over 4 columns
-                if row == 3 and col == 3:  # Bottom-right corner should be 0 (blank space)
-                    if self.cells[row][col] != 0:
-                        return False
-                else:
-                    if self.cells[row][col] != current:
-                        return False
-                    current += 1
-        # /*=====End Change Task 1.2 =====*/
-        return True
-
-    def legalMoves(self):
-        """
-        Returns a list of legal moves from the current state.
-
-        Moves consist of moving the blank space 'up', 'down', 'left', or 'right'.
+        Goal configuration (solved state):
+        ---------------------
+        |  1 |  2 |  3 |  4 |
+        ---------------------
+        |  5 |  6 |  7 |  8 |
+        ---------------------
+        |  9 | 10 | 11 | 12 |
+        ---------------------
+        | 13 | 14 | 15 |    |  <-- 0 represents the blank space
+        ---------------------
         """
-        moves = []
-        row, col = self.blankLocation
-
-        # /*=====Start Change Task 1.3 =====*/
-        # Adjust boundaries for 4x4 grid
-        if row != 0:  # Move up
-            moves.append('up')
-        if row != 3:  # Move down
-            moves.append('down')
-        if col != 0:  # Move left
-            moves.append('left')
-        if col != 3:  # Move right
-            moves.append('right')
-        # /*=====End Change Task 1.3 =====*/
-
-        return moves
-
-    def result(self, move):
-        """
-        Returns a new FifteenPuzzleState with the current state and blankLocation
-        updated based on the provided move.
-
-        The move should be a string drawn from 'legalMoves'.
-        Illegal moves will raise an exception.
-        """
-        row, col = self.blankLocation
-
-        # Determine the new position of the blank space after the move
-        if move == 'up':
-            newrow = row - 1
-            newcol = col
-        elif move == 'down':
-            newrow = row + 1
-            newcol = col
-        elif move == 'left':
-            newrow = row
-            newcol = col - 1
-        elif move == 'right':
-            newrow = row
-            newcol = col + 1
-        else:
-            raise ValueError("Illegal Move")
-
-        # Create a copy of the current puzzle
-        # /*=====Start Change Task 1.4 =====*/
-        # Adjust to initialize 16 tiles for the 4x4 grid
-        newPuzzle = FifteenPuzzleState([0] * 16)
-        newPuzzle.cells = [row[:] for row in self.cells]  # Deep copy of current state
-        # /*=====End Change Task 1.4 =====*/
-
-        # Swap the blank space with the target tile
-        newPuzzle.cells[row][col] = self.cells[newrow][newcol]
-        newPuzzle.cells[newrow][newcol] = self.cells[row][col]
-        newPuzzle.blankLocation = newrow, newcol
-
-        return newPuzzle
-
-    # Utilities for comparison and display
-    def __eq__(self, other):
-        """
-        Checks if two FifteenPuzzleStates are equal (i.e., have the same configuration).
-        """
-        # /*=====End Change Task 1.5 =====*/
-        # Adjust for comparison of 4 rows (Fifteen Puzzle)
-        for row in range(4):
-            if self.cells[row] != other.cells[row]:
-                return False
-        # /*=====End Change Task 1.5 =====*/
-        return True
-
-    def __hash__(self):
-        """
-        Hashes the puzzle configuration, used for comparing states in search algorithms.
-        """
-        return hash(str(self.cells))
-
-    def __getAsciiString(self):
-        """
-        Returns a string representation of the Fifteen Puzzle for display.
-        """
-        lines = []
-        # /*=====End Change Task 1.6 =====*/
-        # Adjust the horizontal line length for the 4x4 grid (since each tile takes 4 characters)
-        horizontalLine = '-' * (4 * 4 + 1)  # 17 dashes for 4 columns and separators
-        lines.append(horizontalLine)
-
-        for row in self.cells:
-            rowLine = '|'
-            for col in row:
-                if col == 0:
-                    col = ' '  # Display blank space for 0
-                rowLine = rowLine + ' ' + str(col).rjust(2) + ' |'  # Right justify single-digit numbers
-            lines.append(rowLine)
-            lines.append(horizontalLine)
-        # /*=====End Change Task 1.6 =====*/
-        return '\n'.join(lines)
-
-    def __str__(self):
-        return self.__getAsciiString()
+        SlidingPuzzleState.__init__(self, numbers, 4, 4, FIFTEEN_PUZZLE_GOAL)
 
 
 # The search problem for Fifteen Puzzle
 
-class FifteenPuzzleSearchProblem(search.SearchProblem):
+class FifteenPuzzleSearchProblem(SlidingPuzzleSearchProblem):
     """
     Implementation of a SearchProblem for the Fifteen Puzzle domain.
 
@@ -211,36 +63,7 @@ class FifteenPuzzleSearchProblem(search.SearchProblem):
         """
         Creates a new FifteenPuzzleSearchProblem which stores the puzzle.
         """
-        self.puzzle = puzzle  # Store the initial puzzle state
-
-    def getStartState(self):
-        """
-        Returns the start state for the search problem.
-        """
-        return self.puzzle
-
-    def isGoalState(self, state):
-        """
-        Returns True if the given state is the goal state.
-        """
-        return state.isGoal()
-
-    def getSuccessors(self, state):
-        """
-        Returns a list of (successor, action, stepCost) tuples where each successor
-        is the result of a legal move, and the cost is 1.0.
-        """
-        successors = []
-        for action in state.legalMoves():
-            nextState = state.result(action)
-            successors.append((nextState, action, 1))
-        return successors
-
-    def getCostOfActions(self, actions):
-        """
-        Returns the total cost of the given actions sequence (number of moves).
-        """
-        return len(actions)
+        SlidingPuzzleSearchProblem.__init__(self, puzzle)
 
 
 # Helper functions
@@ -260,7 +83,7 @@ def createRandomFifteenPuzzle(moves=100):
     for _ in range(moves):
         puzzle = puzzle.result(random.choice(puzzle.legalMoves()))
     return puzzle
-from search import aStarSearch, h1_misplaced_tiles, h2_euclidean_distance, h3_manhattan_distance, h4_row_column_misplacements
+from algorithms.search import aStarSearch, h1_misplaced_tiles, h2_euclidean_distance, h3_manhattan_distance, h4_row_column_misplacements
 if __name__ == '__main__':
     # Step 1: Generate a random 15-puzzle
     puzzle = createRandomFifteenPuzzle(25)
@@ -297,7 +120,7 @@ if __name__ == '__main__':
         heuristic = h1_misplaced_tiles
 
     # Step 5: Solve the puzzle using A* with the chosen heuristic
-    path = aStarSearch(problem, heuristic=heuristic)
+    path = aStarSearch(problem, heuristic=heuristic).actions
 
     # Step 6: Output the solution
     print('A* found a path of %d moves: %s' % (len(path), str(path)))
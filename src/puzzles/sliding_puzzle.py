@@ -0,0 +1,275 @@
+# sliding_puzzle.py
+# -----------------
+# Generic rows x cols sliding-tile puzzle.
+
+"""
+Generic sliding-tile puzzle of any size.
+
+SlidingPuzzleState stores a board of 'rows' x 'cols' cells as a flat tuple in
+row-major order, with 0 for the blank.  The legal moves and target cell of
+every blank position are precomputed once per board size, so move generation
+is a table lookup.  EightPuzzleState and FifteenPuzzleState are thin wrappers
+that fix the size and the goal layout.
+"""
+
+import random
+
+from algorithms import search
+from algorithms.heuristics import manhattan_operator_table
+from algorithms.layered import packTiles, unpackTiles, slidingTileSuccessors
+from algorithms.pruning import slidingTilePruner
+
+_OFFSETS = [('up', -1, 0), ('down', 1, 0), ('left', 0, -1), ('right', 0, 1)]
+
+_moveTables = {}
+
+
+def moveTable(rows, cols):
+    """
+    Returns the move table of a rows x cols board: for every blank cell, a
+    list of (move, targetCell) pairs for the legal moves, in the order
+    'up', 'down', 'left', 'right'.  Tables are built once per size.
+    """
+    key = (rows, cols)
+    if key not in _moveTables:
+        table = []
+        for cell in range(rows * cols):
+            row, col = divmod(cell, cols)
+            moves = []
+            for move, dRow, dCol in _OFFSETS:
+                newRow, newCol = row + dRow, col + dCol
+                if 0 <= newRow < rows and 0 <= newCol < cols:
+                    moves.append((move, newRow * cols + newCol))
+            table.append(moves)
+        _moveTables[key] = table
+    return _moveTables[key]
+
+
+# Build the tables for the sizes in use when the module loads.
+for _rows, _cols in ((2, 3), (3, 3), (3, 4), (4, 4), (2, 6), (5, 5), (6, 6)):
+    moveTable(_rows, _cols)
+
+
+_zobristTables = {}
+
+
+def zobristTable(cellCount):
+    """
+    Returns the Zobrist keys of a board with 'cellCount' cells: table[tile][cell]
+    is a random 64-bit key for that tile standing on that cell.  The keys are
+    seeded by the cell count, so hashes are the same in every process.
+    """
+    if cellCount not in _zobristTables:
+        rng = random.Random(cellCount)
+        _zobristTables[cellCount] = [[rng.getrandbits(64) for cell in range(cellCount)]
+                                     for tile in range(cellCount)]
+    return _zobristTables[cellCount]
+
+
+def blankLastGoal(rows, cols):
+    "Returns the goal with tiles 1..n-1 in row order followed by the blank"
+    return tuple(range(1, rows * cols)) + (0,)
+
+
+def blankFirstGoal(rows, cols):
+    "Returns the goal with the blank followed by tiles 1..n-1 in row order"
+    return tuple(range(rows * cols))
+
+
+class SlidingPuzzleState:
+    """
+      A rows x cols sliding-tile puzzle.
+
+      tiles is a flat tuple of the board in row-major order (0 is the blank),
+      blank the index of the blank cell, and goal the tiles of the solved
+      board.  zobrist is the 64-bit Zobrist hash of the board: the XOR of
+      the keys of every (tile, cell) pair, updated with four XORs per move.
+      States are immutable: result returns a new state.
+    """
+
+    def __init__(self, numbers, rows, cols=None, goal=None):
+        """
+          numbers: the tiles in row-major order, as a flat list or a list of
+            rows; 0 represents the blank
+          rows, cols: board size (cols defaults to rows)
+          goal: the solved board as a flat sequence (defaults to the tiles in
+            order with the blank last)
+        """
+        if cols is None:
+            cols = rows
+        numbers = list(numbers)
+        if numbers and isinstance(numbers[0], (list, tuple)):
+            numbers = [tile for row in numbers for tile in row]
+        if len(numbers) != rows * cols:
+            raise ValueError(f"Expected {rows * cols} numbers for a {rows}x{cols} puzzle, got {len(numbers)}")
+
+        self.rows = rows
+        self.cols = cols
+        self.tiles = tuple(numbers)
+        self.blank = self.tiles.index(0)
+        self.goal = tuple(goal) if goal is not None else blankLastGoal(rows, cols)
+        self._moves = moveTable(rows, cols)
+        self._keys = zobristTable(rows * cols)
+        self._cells = None
+
+        zobrist = 0
+        for cell, tile in enumerate(self.tiles):
+            zobrist ^= self._keys[tile][cell]
+        self.zobrist = zobrist
+
+    @property
+    def cells(self):
+        "The board as a list of rows"
+        if self._cells is None:
+            cols = self.cols
+            self._cells = [list(self.tiles[row * cols:(row + 1) * cols]) for row in range(self.rows)]
+        return self._cells
+
+    @property
+    def blankLocation(self):
+        "The (row, col) of the blank"
+        return divmod(self.blank, self.cols)
+
+    def isGoal(self):
+        "Returns True if the board is in its goal layout"
+        return self.tiles == self.goal
+
+    def legalMoves(self):
+        """
+        Returns the legal moves of the blank: 'up', 'down', 'left' and/or
+        'right'.
+        """
+        return [move for move, target in self._moves[self.blank]]
+
+    def result(self, move):
+        """
+        Returns a new state of the same class with the blank moved in the given
+        direction.  Raises ValueError for a move that is not legal.
+        """
+        for legalMove, target in self._moves[self.blank]:
+            if legalMove == move:
+                return self._moved(target)
+        raise ValueError("Illegal Move")
+
+    def _moved(self, target):
+        "Returns the state after sliding the tile on 'target' onto the blank"
+        blank = self.blank
+        tiles = list(self.tiles)
+        tile = tiles[target]
+        tiles[blank] = tile
+        tiles[target] = 0
+        # the tile leaves 'target' for 'blank', and the blank the other way
+        keys = self._keys
+        tileKeys, blankKeys = keys[tile], keys[0]
+
+        newPuzzle = self.__class__.__new__(self.__class__)
+        newPuzzle.rows = self.rows
+        newPuzzle.cols = self.cols
+        newPuzzle.tiles = tuple(tiles)
+        newPuzzle.blank = target
+        newPuzzle.goal = self.goal
+        newPuzzle._moves = self._moves
+        newPuzzle._keys = keys
+        newPuzzle._cells = None
+        newPuzzle.zobrist = (self.zobrist ^ tileKeys[target] ^ tileKeys[blank]
+                             ^ blankKeys[blank] ^ blankKeys[target])
+        return newPuzzle
+
+    # Packed encoding, used by the layered breadth-first search
+    def canPack(self):
+        "Returns True if the board fits the 64-bit packed encoding (16 cells)"
+        return self.rows * self.cols <= 16
+
+    def pack(self):
+        "Returns the board packed into an int, four bits per cell"
+        return packTiles(self.tiles)
+
+    def packedGoal(self):
+        "Returns the goal board in packed form"
+        return packTiles(self.goal)
+
+    def unpack(self, code):
+        "Returns the state of this size and goal whose packed board is 'code'"
+        return self.__class__.__new__(self.__class__)._setBoard(self, unpackTiles(code, self.rows * self.cols))
+
+    def packedSuccessors(self, codes):
+        "Returns the packed successors of a uint64 array of packed boards"
+        return slidingTileSuccessors(codes, self.rows, self.cols)
+
+    def _setBoard(self, like, tiles):
+        "Initializes this state with the size and goal of 'like' and the given tiles"
+        SlidingPuzzleState.__init__(self, tiles, like.rows, like.cols, like.goal)
+        return self
+
+    # Utilities for comparison and display
+    def __eq__(self, other):
+        return self.zobrist == other.zobrist and self.tiles == other.tiles
+
+    def __hash__(self):
+        return self.zobrist
+
+    def __getAsciiString(self):
+        "Returns a display string for the board"
+        width = len(str(self.rows * self.cols - 1))
+        horizontalLine = '-' * ((width + 3) * self.cols + 1)
+        lines = [horizontalLine]
+        for row in self.cells:
+            rowLine = '|'
+            for tile in row:
+                rowLine = rowLine + ' ' + (str(tile) if tile != 0 else ' ').rjust(width) + ' |'
+            lines.append(rowLine)
+            lines.append(horizontalLine)
+        return '\n'.join(lines)
+
+    def __str__(self):
+        return self.__getAsciiString()
+
+
+_operatorTables = {}
+
+
+class SlidingPuzzleSearchProblem(search.SearchProblem):
+    """
+      SearchProblem for any SlidingPuzzleState.  Every move costs 1.
+    """
+
+    def __init__(self, puzzle):
+        self.puzzle = puzzle
+
+    def getStartState(self):
+        return self.puzzle
+
+    def isGoalState(self, state):
+        return state.isGoal()
+
+    def getSuccessors(self, state):
+        """
+        Returns a list of (successor, action, stepCost) triples, one per legal
+        move, each with cost 1.
+        """
+        return [(state._moved(target), move, 1) for move, target in state._moves[state.blank]]
+
+    def getActions(self, state):
+        return state.legalMoves()
+
+    def getResult(self, state, action):
+        return state.result(action)
+
+    def getOperatorDeltas(self, state):
+        """
+        Returns (action, stepCost, deltaH) for each legal move, where deltaH is
+        the change in Manhattan distance to the state's goal, read from a table
+        keyed by blank position and sliding tile.
+        """
+        key = (state.rows, state.cols, state.goal)
+        if key not in _operatorTables:
+            _operatorTables[key] = manhattan_operator_table(state.rows, state.cols, state.goal)
+        tiles = state.tiles
+        return [(move, 1, deltas[tiles[target]]) for move, target, deltas in _operatorTables[key][state.blank]]
+
+    def getCostOfActions(self, actions):
+        return len(actions)
+
+    def getMovePruner(self):
+        "Sliding-tile move pruner shared by every board size"
+        return slidingTilePruner()
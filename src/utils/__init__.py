@@ -3,13 +3,40 @@ Utility functions and data structures for N-Puzzle Solver.
 """
 
 from .util import Stack, Queue, PriorityQueue, PriorityQueueWithFunction
-from .generator import createRandomFifteenPuzzle, generate_and_save_scenarios
+from .util import (
+    permutationCount,
+    rankPermutation,
+    unrankPermutation,
+    rankPartialPermutation,
+    unrankPartialPermutation,
+    rankPartialPermutations,
+    unrankPartialPermutations
+)
+from .generator import (
+    createRandomFifteenPuzzle,
+    generate_scenarios,
+    generate_and_save_scenarios,
+    save_scenarios,
+    load_scenarios,
+    ScenarioFile
+)
 
 __all__ = [
     'Stack',
     'Queue', 
     'PriorityQueue',
     'PriorityQueueWithFunction',
+    'permutationCount',
+    'rankPermutation',
+    'unrankPermutation',
+    'rankPartialPermutation',
+    'unrankPartialPermutation',
+    'rankPartialPermutations',
+    'unrankPartialPermutations',
     'createRandomFifteenPuzzle',
-    'generate_and_save_scenarios'
+    'generate_scenarios',
+    'generate_and_save_scenarios',
+    'save_scenarios',
+    'load_scenarios',
+    'ScenarioFile'
 ]
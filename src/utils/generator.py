@@ -1,8 +1,14 @@
 # /*=====Start Change Task 3 & 4=====*/
 import os
 import csv
+import json
 import random
-from fifteenpuzzle import FifteenPuzzleState
+import struct
+
+import numpy as np
+
+# Blank moves in the order up, down, left, right; move ^ 1 undoes a move.
+_MOVE_OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
 
 def createRandomFifteenPuzzle(moves=25):
     """
@@ -11,25 +17,224 @@ def createRandomFifteenPuzzle(moves=25):
     Creates a random 15-puzzle by applying
     a series of 'moves' random moves to a solved puzzle.
     """
+    # Imported here: the puzzles package depends on utils via search.py.
+    from puzzles.fifteen_puzzle import FifteenPuzzleState
+
     puzzle = FifteenPuzzleState([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 0])  # Solved state
     for i in range(moves):
         # Execute a random legal move
         puzzle = puzzle.result(random.choice(puzzle.legalMoves()))
     return puzzle
 
-def generate_and_save_scenarios(scenarios_file, num_puzzles=5000, moves=25):
+def _walk_tables(rows, cols):
+    """
+    Tables for random blank walks on a rows x cols board.  A walker is in
+    state blank * 5 + previous, where previous is its last move (4 before
+    the first one).  For each state, counts[state] moves are allowed (all
+    legal moves except the one undoing 'previous'); option k of a state,
+    at index state * 4 + k, leads to next_state, and moves the tile from
+    bit offset target_shift to blank_shift[state] of the packed board.
+    """
+    cells = rows * cols
+    counts = np.zeros(cells * 5, dtype=np.int64)
+    next_state = np.zeros(cells * 5 * 4, dtype=np.int64)
+    target_shift = np.zeros(cells * 5 * 4, dtype=np.uint64)
+    blank_shift = np.zeros(cells * 5, dtype=np.uint64)
+    for blank in range(cells):
+        row, col = divmod(blank, cols)
+        for previous in range(5):
+            state = blank * 5 + previous
+            blank_shift[state] = 4 * blank
+            for move, (d_row, d_col) in enumerate(_MOVE_OFFSETS):
+                if not (0 <= row + d_row < rows and 0 <= col + d_col < cols):
+                    continue
+                if previous != 4 and move == previous ^ 1:
+                    continue
+                target = (row + d_row) * cols + col + d_col
+                option = state * 4 + counts[state]
+                next_state[option] = target * 5 + move
+                target_shift[option] = 4 * target
+                counts[state] += 1
+    return counts, next_state, target_shift, blank_shift
+
+
+def generate_scenarios(num_puzzles, moves=25, seed=None, rows=4, cols=4, chunk_size=1 << 14):
+    """
+    Generates random puzzles by walking the blank from the solved board,
+    many boards at once with NumPy.
+
+    Each board is packed into a uint64, four bits per cell, so a move is a
+    few integer operations on a whole chunk of boards.
+
+    Args:
+        num_puzzles (int): Number of boards to generate
+        moves (int): Number of random blank moves applied to each board
+        seed (int): Seed for the random generator, for reproducible sets
+        rows, cols (int): Board size, at most 16 cells; the solved board has
+            tiles 1..n-1 in row order followed by the blank
+        chunk_size (int): Boards walked together; small enough to stay in
+            the CPU cache
+
+    Returns:
+        numpy.ndarray: uint8 array of shape (num_puzzles, rows * cols), one
+        flat board per row.  No walk undoes its previous move.
+    """
+    cells = rows * cols
+    if cells > 16:
+        raise ValueError("Only boards of at most 16 cells can be generated")
+    rng = np.random.default_rng(seed)
+    counts, next_state, target_shift, blank_shift = _walk_tables(rows, cols)
+
+    solved = 0
+    for cell, tile in enumerate(list(range(1, cells)) + [0]):
+        solved |= tile << (4 * cell)
+    fifteen = np.uint64(15)
+
+    codes = np.empty(num_puzzles, dtype=np.uint64)
+    for first in range(0, num_puzzles, chunk_size):
+        count = min(chunk_size, num_puzzles - first)
+        code = np.full(count, solved, dtype=np.uint64)
+        state = np.full(count, (cells - 1) * 5 + 4, dtype=np.int64)
+        for _ in range(moves):
+            option = state * 4 + (rng.random(count, dtype=np.float32) * counts[state]).astype(np.int64)
+            shift = target_shift[option]
+            # slide the tile at 'shift' onto the blank
+            tile = (code >> shift) & fifteen
+            code = code - (tile << shift) + (tile << blank_shift[state])
+            state = next_state[option]
+        codes[first:first + count] = code
+
+    return unpack_boards(codes, cells)
+
+
+# Binary scenario files
+#
+# A scenario file is a 24-byte header, the goal board padded to a multiple
+# of 8 bytes, then one little-endian uint64 per board holding its tiles
+# four bits per cell (cell i in bits 4i..4i+3):
+#
+#   magic b'NPSC', version (uint16), rows, cols (uint8), board count
+#   (uint64), header size in bytes including the goal (uint64)
+
+SCENARIO_MAGIC = b'NPSC'
+SCENARIO_VERSION = 1
+_SCENARIO_HEADER = struct.Struct('<4sHBBQQ')
+
+
+def pack_boards(boards):
+    """
+    Packs an (N, cells) array of flat boards, at most 16 cells each, into
+    a uint64 array, four bits per cell.
+    """
+    boards = np.asarray(boards, dtype=np.uint64)
+    if boards.shape[1] > 16:
+        raise ValueError("Only boards of at most 16 cells can be packed")
+    shifts = np.arange(boards.shape[1], dtype=np.uint64) * np.uint64(4)
+    return np.bitwise_or.reduce(boards << shifts, axis=1)
+
+
+def unpack_boards(codes, cells):
+    "Returns the (N, cells) uint8 boards of an array of packed boards"
+    shifts = np.arange(cells, dtype=np.uint64) * np.uint64(4)
+    return ((np.asarray(codes, dtype=np.uint64)[:, None] >> shifts) & np.uint64(15)).astype(np.uint8)
+
+
+def save_scenarios(path, boards, rows=4, cols=4, goal=None):
+    """
+    Writes flat boards to a binary scenario file.
+
+    Args:
+        path (str): File to write
+        boards (array): (N, rows * cols) boards, e.g. from generate_scenarios
+        rows, cols (int): Board size
+        goal (list): Flat goal board; defaults to tiles 1..n-1 then the blank
+    """
+    cells = rows * cols
+    if goal is None:
+        goal = list(range(1, cells)) + [0]
+    padded_goal = bytes(goal) + bytes(-cells % 8)
+    codes = pack_boards(boards) if len(boards) else np.empty(0, dtype=np.uint64)
+    with open(path, 'wb') as file:
+        file.write(_SCENARIO_HEADER.pack(SCENARIO_MAGIC, SCENARIO_VERSION, rows, cols, len(codes),
+                                         _SCENARIO_HEADER.size + len(padded_goal)))
+        file.write(padded_goal)
+        file.write(codes.astype('<u8').tobytes())
+
+
+class ScenarioFile:
     """
-    Generates random 15-puzzles and saves them to a CSV file.
+    Read-only view of a binary scenario file.
 
+    The packed boards are memory-mapped, so opening a file reads only its
+    header.  Index or slice with boards(), or iterate to stream the boards
+    one at a time as lists of tiles.
     """
-    puzzles = [createRandomFifteenPuzzle(moves).cells for _ in range(num_puzzles)]
 
-    # Save to CSV
-    with open(scenarios_file, mode='w', newline='') as file:
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            header = file.read(_SCENARIO_HEADER.size)
+            magic, version, self.rows, self.cols, count, offset = _SCENARIO_HEADER.unpack(header)
+            if magic != SCENARIO_MAGIC or version != SCENARIO_VERSION:
+                raise ValueError(f"{path} is not a version {SCENARIO_VERSION} scenario file")
+            self.goal = list(file.read(self.rows * self.cols))
+        self.path = path
+        self.cells = self.rows * self.cols
+        if count:
+            self.codes = np.memmap(path, dtype='<u8', mode='r', offset=offset, shape=(count,))
+        else:
+            self.codes = np.empty(0, dtype='<u8')
+
+    def __len__(self):
+        return len(self.codes)
+
+    def boards(self, start=0, stop=None):
+        "Returns boards start..stop-1 as an (N, cells) uint8 array"
+        return unpack_boards(self.codes[start:stop], self.cells)
+
+    def __iter__(self, chunk_size=4096):
+        for start in range(0, len(self.codes), chunk_size):
+            for board in self.boards(start, start + chunk_size):
+                yield board.tolist()
+
+    def export_csv(self, csv_file):
+        "Writes the boards in the CSV layout of generate_and_save_scenarios"
+        _write_csv(csv_file, (np.reshape(board, (self.rows, self.cols)).tolist() for board in self))
+
+
+def _write_csv(csv_file, puzzles):
+    "Writes (PuzzleID, State) rows, each State the board as a list of rows"
+    with open(csv_file, mode='w', newline='') as file:
         writer = csv.writer(file)
         writer.writerow(['PuzzleID', 'State'])  # Header
         for idx, puzzle in enumerate(puzzles):
             writer.writerow([idx + 1, str(puzzle)])  # Save puzzle as string
+
+
+def load_scenarios(scenarios_file):
+    """
+    Streams the boards of a scenario file as flat lists of tiles.
+
+    Binary files are memory-mapped; files ending in .csv are read row by
+    row in the CSV layout, parsing each State without eval.
+    """
+    if scenarios_file.endswith('.csv'):
+        with open(scenarios_file, newline='') as file:
+            for row in csv.DictReader(file):
+                yield [tile for cells in json.loads(row['State']) for tile in cells]
+    else:
+        yield from ScenarioFile(scenarios_file)
+
+
+def generate_and_save_scenarios(scenarios_file, num_puzzles=5000, moves=25, seed=None):
+    """
+    Generates random 15-puzzles and saves them to a scenario file: the
+    binary format above, or the CSV layout if the name ends in .csv.
+    """
+    boards = generate_scenarios(num_puzzles, moves, seed)
+    if scenarios_file.endswith('.csv'):
+        _write_csv(scenarios_file, (board.reshape(4, 4).tolist() for board in boards))
+    else:
+        save_scenarios(scenarios_file, boards)
     print(f"Generated and saved {num_puzzles} puzzles to {scenarios_file}")
 
 # /*=====End Change Task 3 & 4 =====*/
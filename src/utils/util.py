@@ -227,6 +227,146 @@ def manhattanDistance( xy1, xy2 ):
     "Returns the Manhattan distance between points xy1 and xy2"
     return abs( xy1[0] - xy2[0] ) + abs( xy1[1] - xy2[1] )
 
+"""
+ Permutation ranking: a dense, order-preserving mapping between permutations
+ and integers, shared by every table indexed by puzzle state.
+
+ A partial permutation is k distinct values drawn from 0..n-1, such as the
+ cells holding the tiles of a pattern; a full permutation is the case k = n.
+ Ranks are lexicographic (Lehmer code), so rank 0 is (0, 1, ..., k-1).  Each
+ digit of the code is a value minus the number of smaller values already
+ used, which a popcount table gives in constant time, so ranking and
+ unranking are linear in k.
+"""
+
+_POPCOUNT = bytes(bin(mask).count('1') for mask in range(1 << 16))
+
+def _popcount(mask):
+    "Number of set bits in a non-negative integer"
+    if mask < 65536:
+        return _POPCOUNT[mask]
+    return bin(mask).count('1')
+
+# _SELECT[byte * 8 + i] is the position of the i-th set bit of 'byte'
+_SELECT = bytes(position for byte in range(256)
+                for position in ([bit for bit in range(8) if byte >> bit & 1] + [0] * 8)[:8])
+
+def _select(mask, index):
+    "Position of the set bit of 'mask' with 'index' set bits below it"
+    shift = 0
+    while True:
+        byte = mask >> shift & 0xFF
+        count = _POPCOUNT[byte]
+        if index < count:
+            return shift + _SELECT[byte * 8 + index]
+        index -= count
+        shift += 8
+
+_rankWeights = {}
+
+def _weights(n, k):
+    "Returns [(n-1-i)! / (n-k)! for i in range(k)], the place values of a Lehmer code"
+    key = (n, k)
+    if key not in _rankWeights:
+        weights = [1] * k
+        for i in range(k - 2, -1, -1):
+            weights[i] = weights[i + 1] * (n - 1 - i)
+        _rankWeights[key] = weights
+    return _rankWeights[key]
+
+def permutationCount(n, k=None):
+    "Returns n! / (n-k)!, the number of partial permutations of k values out of n"
+    if k is None:
+        k = n
+    count = 1
+    for value in range(n - k + 1, n + 1):
+        count *= value
+    return count
+
+def rankPartialPermutation(values, n):
+    """
+      values: k distinct integers in range(n)
+
+    Returns the lexicographic rank of 'values' among all partial permutations
+    of len(values) values out of n, in range(permutationCount(n, len(values))).
+    """
+    weights = _weights(n, len(values))
+    used = 0
+    rank = 0
+    for weight, value in zip(weights, values):
+        rank += (value - _popcount(used & ((1 << value) - 1))) * weight
+        used |= 1 << value
+    return rank
+
+def unrankPartialPermutation(rank, k, n):
+    "Returns the partial permutation of k values out of n with the given rank"
+    free = (1 << n) - 1
+    values = []
+    for weight in _weights(n, k):
+        digit, rank = divmod(rank, weight)
+        value = _select(free, digit)
+        free ^= 1 << value
+        values.append(value)
+    return values
+
+def rankPermutation(permutation):
+    "Returns the lexicographic rank of a permutation of 0..n-1"
+    return rankPartialPermutation(permutation, len(permutation))
+
+def unrankPermutation(rank, n):
+    "Returns the permutation of 0..n-1 with the given lexicographic rank"
+    return unrankPartialPermutation(rank, n, n)
+
+def rankPartialPermutations(values, n):
+    """
+      values: NumPy integer array of shape (count, k), one partial
+        permutation of k values out of n per row
+
+    Vectorised rankPartialPermutation for n <= 20 (the ranks must fit in an
+    int64); returns an int64 array of ranks.
+    """
+    if n > 20:
+        raise ValueError(f"Ranks of partial permutations of {n} values do not fit in an int64 (n <= 20)")
+    import numpy as np
+    values = np.asarray(values, dtype=np.int64)
+    popcount = np.frombuffer(_POPCOUNT, dtype=np.uint8)
+    used = np.zeros(len(values), dtype=np.int64)
+    ranks = np.zeros(len(values), dtype=np.int64)
+    for column, weight in enumerate(_weights(n, values.shape[1])):
+        value = values[:, column]
+        below = used & ((np.int64(1) << value) - 1)
+        smaller = popcount[below & 0xFFFF].astype(np.int64) + popcount[below >> 16]
+        ranks += (value - smaller) * weight
+        used |= np.int64(1) << value
+    return ranks
+
+def unrankPartialPermutations(ranks, k, n):
+    """
+    Vectorised unrankPartialPermutation for n <= 20; returns an int64 array
+    of shape (len(ranks), k).
+    """
+    if n > 20:
+        raise ValueError(f"Ranks of partial permutations of {n} values do not fit in an int64 (n <= 20)")
+    import numpy as np
+    ranks = np.array(ranks, dtype=np.int64)
+    popcount = np.frombuffer(_POPCOUNT, dtype=np.uint8)[:256].astype(np.int64)
+    select = np.frombuffer(_SELECT, dtype=np.uint8).astype(np.int64)
+    free = np.full(len(ranks), (1 << n) - 1, dtype=np.int64)
+    values = np.empty((len(ranks), k), dtype=np.int64)
+    for column, weight in enumerate(_weights(n, k)):
+        digits, ranks = np.divmod(ranks, weight)
+        # _select on every row at once, one byte of the free mask at a time
+        value = np.zeros(len(ranks), dtype=np.int64)
+        for shift in range(0, n, 8):
+            byte = (free >> shift) & 0xFF
+            count = popcount[byte]
+            here = (digits >= 0) & (digits < count)
+            value[here] = shift + select[byte[here] * 8 + digits[here]]
+            digits = np.where(here, -1, digits - count)
+        free ^= np.int64(1) << value
+        values[:, column] = value
+    return values
+
 """
   Data structures and functions useful for various course projects
 
@@ -626,14 +766,16 @@ class TimeoutFunction:
         # If we have SIGALRM signal, use it to cause an exception if and
         # when this function runs too long.  Otherwise check the time taken
         # after the method has returned, and throw an exception then.
+        # The timer is cancelled however the function exits, so that it cannot
+        # fire later; setitimer accepts fractions of a second.
         if hasattr(signal, 'SIGALRM'):
             old = signal.signal(signal.SIGALRM, self.handle_timeout)
-            signal.alarm(self.timeout)
+            signal.setitimer(signal.ITIMER_REAL, self.timeout)
             try:
                 result = self.function(*args, **keyArgs)
             finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
                 signal.signal(signal.SIGALRM, old)
-            signal.alarm(0)
         else:
             startTime = time.time()
             result = self.function(*args, **keyArgs)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Tests for the benchmark and analysis pipeline.
+"""
+
+import unittest
+import csv
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analysis.pipeline import P2Quantile, RunningSummary, summarize, read_rows, current_rows
+from analysis.automate import run_heuristic_comparison, analyze_results
+from analysis.runner import Job, Limits, run_job, run_jobs
+from analysis.task4 import run_strategic_comparison
+from analysis.benchmarks import (load_korf_instances, eight_puzzle_set, run_suite, run_suite_isolated, find_regressions,
+                                 SUITES, DEFAULT_SUITES)
+from analysis import microbench
+from algorithms.heuristics import HEURISTICS
+from algorithms.layered import packTiles
+from utils.generator import generate_scenarios
+
+
+class TestStreamingSummaries(unittest.TestCase):
+    """Test cases for the one-pass summaries."""
+
+    def test_small_samples_are_exact(self):
+        """Up to five values, percentiles interpolate the sorted sample."""
+        quantile = P2Quantile(0.5)
+        for value in [5, 1, 4, 2, 3]:
+            quantile.add(value)
+        self.assertEqual(quantile.value(), 3)
+        quantile = P2Quantile(0.9)
+        for value in [10, 20]:
+            quantile.add(value)
+        self.assertAlmostEqual(quantile.value(), 19)
+
+    def test_estimates_close_to_exact_percentiles(self):
+        """P-square estimates of a large sample are close to the exact ones."""
+        rng = random.Random(11)
+        values = [rng.expovariate(1.0) for _ in range(20000)]
+        summary = RunningSummary()
+        for value in values:
+            summary.add(value)
+        ordered = sorted(values)
+        for p in (0.5, 0.9, 0.99):
+            exact = ordered[int(p * (len(ordered) - 1))]
+            self.assertAlmostEqual(summary.percentile(p), exact, delta=0.05 * exact)
+        self.assertAlmostEqual(summary.mean, sum(values) / len(values))
+        self.assertEqual((summary.minimum, summary.maximum), (ordered[0], ordered[-1]))
+
+    def test_summarize_groups_and_skips_non_numbers(self):
+        """Rows are grouped by method, and 'N/A' values are left out."""
+        rows = [{'Method': 'a', 'Depth': '4'}, {'Method': 'b', 'Depth': 'N/A'}, {'Method': 'a', 'Depth': '6'}]
+        summaries = summarize(iter(rows), 'Method', {'depth': 'Depth'})
+        self.assertEqual(list(summaries), ['a', 'b'])
+        self.assertEqual(summaries['a']['depth'].mean, 5)
+        self.assertEqual(summaries['b']['depth'].count, 0)
+
+
+class TestStreamingComparison(unittest.TestCase):
+    """Test cases for the streaming heuristic comparison."""
+
+    def test_rows_are_written_while_the_sweep_runs(self):
+        """Rows reach the file before the scenario stream is exhausted."""
+        boards = generate_scenarios(3, moves=6, seed=2).tolist()
+        with tempfile.TemporaryDirectory() as directory:
+            results_file = os.path.join(directory, 'results.csv')
+            seen = []
+
+            def scenarios():
+                for board in boards:
+                    if seen:
+                        # the previous puzzle's rows are already on disk
+                        with open(results_file) as file:
+                            seen.append(len(list(csv.reader(file))) - 1)
+                    else:
+                        seen.append(0)
+                    yield board
+
+            with redirect_stdout(io.StringIO()):
+                run_heuristic_comparison(scenarios(), results_file)
+                analyze_results(results_file)
+            self.assertEqual(seen, [0, 4, 8])
+            rows = list(read_rows(results_file))
+            self.assertEqual(len(rows), 12)
+            self.assertTrue(all(row['Solved'] == 'True' for row in rows))
+
+
+class TestParallelRunner(unittest.TestCase):
+    """Test cases for the process-pool job runner."""
+
+    def setUp(self):
+        boards = generate_scenarios(6, moves=8, seed=5)
+        self.jobs = [Job(index, algorithm, heuristic, packTiles(board.tolist()))
+                     for index, board in enumerate(boards, 1)
+                     for algorithm, heuristic in (("BFS", None), ("A*", "manhattan"), ("IDA*", "misplaced"))]
+
+    def test_job_results(self):
+        """A job solves its packed board with the named search."""
+        result = run_job(Job(1, "A*", "manhattan", packTiles([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 0, 15])))
+        self.assertTrue(result.solved)
+        self.assertEqual(result.depth, 1)
+        eight = run_job(Job(1, "BFS", None, packTiles([1, 0, 2, 3, 4, 5, 6, 7, 8]), 3, 3, [0, 1, 2, 3, 4, 5, 6, 7, 8]))
+        self.assertEqual((eight.solved, eight.depth), (True, 1))
+
+    def test_parallel_results_in_job_order(self):
+        """Pooled runs yield the same jobs and results, in order, as serial ones."""
+        serial = list(run_jobs(self.jobs))
+        parallel = list(run_jobs(iter(self.jobs), workers=3, chunk_size=2))
+        self.assertEqual([job for job, _ in parallel], self.jobs)
+        self.assertEqual([result[:4] for _, result in parallel], [result[:4] for _, result in serial])
+
+
+class TestJobLimits(unittest.TestCase):
+    """Test cases for per-job time, memory and node limits."""
+
+    def setUp(self):
+        self.board = packTiles(generate_scenarios(1, moves=30, seed=9)[0].tolist())
+
+    def test_limits_become_outcomes(self):
+        """A search stopped by a limit reports the limit as its outcome."""
+        timeout = run_job(Job(1, "BFS", None, self.board), Limits(seconds=0.2))
+        self.assertEqual((timeout.outcome, timeout.depth, timeout.solved), ("timeout", None, False))
+        self.assertGreaterEqual(timeout.execution_time, 0.2)
+        nodes = run_job(Job(1, "A*", "misplaced", self.board), Limits(nodes=50))
+        self.assertEqual(nodes.outcome, "node_limit")
+        self.assertEqual(nodes.expanded_nodes, 50)
+        memory = run_job(Job(1, "BFS", None, self.board), Limits(seconds=10, memory_mb=1))
+        self.assertEqual(memory.outcome, "memory_out")
+
+    def test_strategies_after_an_unsolved_dfs_are_recorded(self):
+        """Strategies run after an unsolved DFS keep their rows."""
+        # 11 moves from the goal, beyond the depth limit of DFS
+        boards = generate_scenarios(1, moves=11, seed=0).tolist()
+        with tempfile.TemporaryDirectory() as directory:
+            results_file = os.path.join(directory, 'results.csv')
+            with redirect_stdout(io.StringIO()):
+                # DFS gives up within the node limit; BFS and UCS may be stopped
+                run_strategic_comparison(boards, results_file, limits=Limits(seconds=1, nodes=3500))
+            rows = list(read_rows(results_file))
+        self.assertEqual([row['Strategy'] for row in rows], ["DFS", "BFS", "UCS", "A* with Manhattan Distance"])
+        self.assertEqual((rows[0]['Outcome'], rows[3]['Outcome']), ("unsolved", "solved"))
+
+    def test_memory_limit_counts_the_jobs_growth(self):
+        """Memory the process already holds does not count against a job."""
+        retained = b'x' * (64 << 20)
+        result = run_job(Job(1, "BFS", None, self.board), Limits(memory_mb=32, nodes=3000))
+        self.assertEqual(result.outcome, "node_limit")
+        del retained
+
+    def test_strategy_sweep_keeps_every_row(self):
+        """Stopped jobs get rows, and the strategies after them still run."""
+        with tempfile.TemporaryDirectory() as directory:
+            results_file = os.path.join(directory, 'results.csv')
+            boards = generate_scenarios(2, moves=16, seed=9).tolist()
+            with redirect_stdout(io.StringIO()):
+                run_strategic_comparison(boards, results_file, limits=Limits(nodes=500))
+            rows = list(read_rows(results_file))
+        self.assertEqual([row['Strategy'] for row in rows[:4]],
+                         ["DFS", "BFS", "UCS", "A* with Manhattan Distance"])
+        self.assertEqual(len(rows), 8)
+        self.assertIn("node_limit", {row['Outcome'] for row in rows})
+        self.assertTrue(all(row['Outcome'] == 'solved' for row in rows if row['Strategy'].startswith("A*")))
+
+
+class TestResumableSweeps(unittest.TestCase):
+    """Test cases for append-only, resumable results logs."""
+
+    def test_interrupted_sweep_resumes(self):
+        """A rerun keeps finished rows, drops a cut line and adds the rest."""
+        boards = generate_scenarios(3, moves=8, seed=6).tolist()
+        with tempfile.TemporaryDirectory() as directory:
+            results_file = os.path.join(directory, 'results.csv')
+            with redirect_stdout(io.StringIO()):
+                run_heuristic_comparison(boards, results_file)
+                with open(results_file) as file:
+                    complete = file.read()
+                lines = complete.splitlines(keepends=True)
+                # an interrupted run: six finished rows and half of the seventh
+                with open(results_file, 'w') as file:
+                    file.write(''.join(lines[:7]) + lines[7][:10])
+                run_heuristic_comparison(boards, results_file)
+                with open(results_file) as file:
+                    resumed = file.read()
+                run_heuristic_comparison(boards, results_file)
+                with open(results_file) as file:
+                    self.assertEqual(file.read(), resumed)
+
+            rows = list(csv.reader(io.StringIO(resumed)))
+            self.assertEqual(resumed.splitlines(keepends=True)[:7], lines[:7])
+            self.assertEqual(len(rows), 13)
+            keys = {(row[0], row[1], row[-1]) for row in rows[1:]}
+            self.assertEqual(len(keys), 12)
+            # the rerun rows match the first run apart from their timings
+            self.assertEqual([row[:-2] for row in rows], [row[:-2] for row in csv.reader(io.StringIO(complete))])
+
+
+    def test_rows_of_earlier_job_sets_are_not_analyzed(self):
+        """Rows kept from a run with other limits are left out of the summary."""
+        boards = generate_scenarios(2, moves=8, seed=6).tolist()
+        with tempfile.TemporaryDirectory() as directory:
+            results_file = os.path.join(directory, 'results.csv')
+            with redirect_stdout(io.StringIO()):
+                run_heuristic_comparison(boards, results_file, limits=Limits(nodes=1))
+                configs = run_heuristic_comparison(boards, results_file, limits=Limits(seconds=60))
+            self.assertEqual(len(list(read_rows(results_file))), 16)
+            current = list(current_rows(read_rows(results_file), configs))
+            self.assertEqual(len(current), 8)
+            self.assertEqual({row['Outcome'] for row in current}, {'solved'})
+
+    def test_log_with_other_columns(self):
+        """Resuming onto a log with other columns explains how to start afresh."""
+        with tempfile.TemporaryDirectory() as directory:
+            results_file = os.path.join(directory, 'results.csv')
+            with open(results_file, 'w') as file:
+                file.write('PuzzleID,Heuristic,Solved\n1,A*,True\n')
+            with redirect_stdout(io.StringIO()):
+                with self.assertRaisesRegex(ValueError, 'resume=False'):
+                    run_heuristic_comparison([], results_file)
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """Test cases for the standard benchmark suite and regression gating."""
+
+    def test_korf_instances(self):
+        """Korf instances are solvable and consistent with their optimal lengths."""
+        instances = load_korf_instances()
+        self.assertEqual(len(instances), 100)
+        self.assertEqual(len(set(instance.tiles for instance in instances)), 100)
+        self.assertEqual(sum(instance.optimal for instance in instances), 5305)
+        self.assertEqual(instances[0].tiles[:4], (14, 13, 15, 7))
+        self.assertEqual(instances[99].tiles[:4], (11, 4, 0, 8))
+        for instance in instances:
+            manhattan = sum(abs(cell // 4 - tile // 4) + abs(cell % 4 - tile % 4)
+                            for cell, tile in enumerate(instance.tiles) if tile)
+            self.assertLessEqual(manhattan, instance.optimal)
+            self.assertEqual((instance.optimal - manhattan) % 2, 0)
+        # the default gate covers a few of them, but not the whole set
+        self.assertIn("korf-easy", DEFAULT_SUITES)
+        self.assertNotIn("korf100", DEFAULT_SUITES)
+        self.assertEqual([instance.name for instance in SUITES["korf-easy"]()], ["korf-12", "korf-55", "korf-79"])
+
+    def test_eight_puzzle_sets(self):
+        """Each depth set holds every state at that distance from the goal."""
+        sizes = [len(eight_puzzle_set(depth)) for depth in range(13)]
+        self.assertEqual(sizes, [1, 2, 4, 8, 16, 20, 39, 62, 116, 152, 286, 396, 748])
+        self.assertEqual(len(eight_puzzle_set(20, sample=25)), 25)
+        metrics = run_suite(eight_puzzle_set(6), "BFS")
+        self.assertEqual((metrics["instances"], metrics["solved"], metrics["not_optimal"]), (39, 39, []))
+        isolated = run_suite_isolated(eight_puzzle_set(6), "BFS")
+        self.assertEqual((isolated["solved"], isolated["nodes"]), (metrics["solved"], metrics["nodes"]))
+        self.assertGreater(isolated["peak_rss_mb"], 0)
+
+    def test_find_regressions(self):
+        """Node and throughput regressions beyond the tolerance are reported."""
+        base = {"instances": 10, "solved": 10, "not_optimal": [], "nodes": 1000, "nodes_per_second": 5000.0}
+        baseline = {"suite/A*:manhattan": base}
+        self.assertEqual(find_regressions({"suite/A*:manhattan": dict(base, nodes=1050)}, baseline), [])
+        self.assertEqual(len(find_regressions({"suite/A*:manhattan": dict(base, nodes=1200)}, baseline)), 1)
+        self.assertEqual(len(find_regressions({"suite/A*:manhattan": dict(base, nodes_per_second=4000.0)},
+                                              baseline)), 1)
+        self.assertEqual(find_regressions({"other/BFS": dict(base, nodes=5000)}, baseline), [])
+
+
+class TestMicrobenchmarks(unittest.TestCase):
+    """Test cases for the microbenchmark harness."""
+
+    def test_every_operation_is_measured(self):
+        """States, every heuristic and every queue operation are covered."""
+        names = set(microbench.all_benchmarks())
+        self.assertTrue({"state.result", "state.hash", "state.eq"} <= names)
+        self.assertTrue({f"heuristic.{name}" for name in HEURISTICS} <= names)
+        for queue in ("Stack", "Queue", "PriorityQueue", "PriorityQueueWithFunction"):
+            self.assertIn(f"queue.{queue}.push", names)
+            self.assertIn(f"queue.{queue}.pop", names)
+        self.assertIn("queue.PriorityQueue.update", names)
+
+    def test_json_output(self):
+        """The command writes ops/sec with confidence intervals as JSON."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'microbench.json')
+            with redirect_stdout(io.StringIO()):
+                microbench.main(['-o', path, '--filter', 'queue.Priority', '--batch', '50', '--repeat', '3'])
+            with open(path) as file:
+                results = json.load(file)["benchmarks"]
+        self.assertEqual(len(results), 6)
+        for result in results.values():
+            low, high = result["ci95"]
+            self.assertTrue(low <= result["ops_per_sec"] <= high)
+            self.assertGreater(result["ops_per_sec"], 0)
+            self.assertEqual(result["samples"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ Tests for puzzle implementations.
 """
 
 import unittest
+import random
 import sys
 import os
 
@@ -11,7 +12,9 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from puzzles.fifteen_puzzle import FifteenPuzzleState, FifteenPuzzleSearchProblem
-from puzzles.eight_puzzle import EightPuzzleState, EightPuzzleSearchProblem
+from puzzles.eight_puzzle import EightPuzzleState, EightPuzzleSearchProblem, EIGHT_PUZZLE_DATA
+from puzzles.eight_puzzle_table import EightPuzzleDistanceTable
+from puzzles.sliding_puzzle import SlidingPuzzleState, SlidingPuzzleSearchProblem
 
 
 class TestFifteenPuzzle(unittest.TestCase):
@@ -118,5 +121,90 @@ class TestEightPuzzle(unittest.TestCase):
         self.assertFalse(problem.isGoalState(self.unsolved_puzzle))
 
 
+class TestSlidingPuzzle(unittest.TestCase):
+    """Test cases for the generic rows x cols sliding puzzle."""
+
+    def setUp(self):
+        self.solved = SlidingPuzzleState([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 0], 3, 4)
+
+    def test_rectangular_board(self):
+        """A 3x4 board uses the blank-last goal and corner moves."""
+        self.assertTrue(self.solved.isGoal())
+        self.assertEqual(self.solved.blankLocation, (2, 3))
+        self.assertEqual(self.solved.legalMoves(), ['up', 'left'])
+        self.assertEqual(self.solved.cells[1], [5, 6, 7, 8])
+
+    def test_result_is_immutable(self):
+        """Moves return a new state and leave the original unchanged."""
+        moved = self.solved.result('up')
+        self.assertEqual(moved.tiles, (1, 2, 3, 4, 5, 6, 7, 0, 9, 10, 11, 8))
+        self.assertFalse(moved.isGoal())
+        self.assertTrue(self.solved.isGoal())
+        self.assertEqual(moved.result('down'), self.solved)
+        self.assertEqual(hash(moved.result('down')), hash(self.solved))
+        self.assertRaises(ValueError, self.solved.result, 'down')
+
+    def test_incremental_zobrist_hash(self):
+        """Hashes updated move by move equal hashes computed from scratch."""
+        rng = random.Random(3)
+        puzzle = self.solved
+        for _ in range(200):
+            puzzle = puzzle.result(rng.choice(puzzle.legalMoves()))
+            rebuilt = SlidingPuzzleState(puzzle.tiles, 3, 4)
+            self.assertEqual(puzzle.zobrist, rebuilt.zobrist)
+            self.assertEqual(hash(puzzle), hash(rebuilt))
+        self.assertNotEqual(self.solved.zobrist, self.solved.result('up').zobrist)
+
+    def test_wrappers_share_the_generic_state(self):
+        """The eight and fifteen puzzles keep their own goals and classes."""
+        eight = EightPuzzleState([0, 1, 2, 3, 4, 5, 6, 7, 8])
+        self.assertTrue(eight.isGoal())
+        self.assertIsInstance(eight.result('down'), EightPuzzleState)
+        fifteen = FifteenPuzzleState(list(range(1, 16)) + [0])
+        self.assertTrue(fifteen.isGoal())
+        self.assertIsInstance(fifteen.result('left'), FifteenPuzzleState)
+
+    def test_operator_deltas(self):
+        """Table deltas match the change in Manhattan distance to the goal."""
+        problem = SlidingPuzzleSearchProblem(self.solved)
+        deltas = dict((action, delta) for action, cost, delta in problem.getOperatorDeltas(self.solved))
+        self.assertEqual(deltas, {'up': 1, 'left': 1})
+        moved = self.solved.result('up')
+        deltas = dict((action, delta) for action, cost, delta in problem.getOperatorDeltas(moved))
+        self.assertEqual(deltas['down'], -1)
+
+
+class TestEightPuzzleDistanceTable(unittest.TestCase):
+    """Test cases for the complete eight puzzle distance table."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = EightPuzzleDistanceTable.build()
+
+    def test_histogram(self):
+        """Half of the permutations are reachable, at most 31 moves away."""
+        counts = self.table.histogram()
+        self.assertEqual(sum(counts), 181440)
+        self.assertEqual(len(counts) - 1, 31)
+        self.assertEqual(counts[:3], [1, 2, 4])
+
+    def test_solutions_are_optimal(self):
+        """Greedy descent reaches the goal in exactly the stored distance."""
+        for numbers in EIGHT_PUZZLE_DATA:
+            puzzle = EightPuzzleState(numbers)
+            actions = self.table.solve(puzzle)
+            self.assertEqual(len(actions), self.table.distance(puzzle))
+            for action in actions:
+                puzzle = puzzle.result(action)
+            self.assertTrue(puzzle.isGoal())
+
+    def test_unsolvable(self):
+        """Boards of the wrong parity have no distance."""
+        numbers = [0, 2, 1, 3, 4, 5, 6, 7, 8]
+        self.assertIsNone(self.table.distance(numbers))
+        self.assertRaises(ValueError, self.table.solve, numbers)
+        self.assertRaises(ValueError, self.table.heuristic, numbers)
+
+
 if __name__ == '__main__':
     unittest.main()
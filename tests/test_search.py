@@ -0,0 +1,677 @@
+#!/usr/bin/env python3
+"""
+Tests for search algorithms.
+"""
+
+import unittest
+import random
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from puzzles.fifteen_puzzle import FifteenPuzzleState, FifteenPuzzleSearchProblem
+from algorithms.search import aStarSearch, depthFirstSearch, enhancedPartialExpansionAStarSearch
+from algorithms.search import iterativeDeepeningAStarSearch, uniformCostSearch, SearchStats, PhaseProfile
+from algorithms.search import SearchProblem
+from algorithms.pruning import MovePruner, slidingTilePruner
+from algorithms.perimeter import PerimeterDatabase, loadPerimeter
+from algorithms.transposition import TranspositionTable
+from algorithms.layered import layeredBreadthFirstSearch, packTiles, unpackTiles
+from algorithms.external import externalBreadthFirstSearch, layerPath
+from algorithms.twobit import twoBitBreadthFirstSearch, readNibble
+from algorithms import pattern_database
+from algorithms.pattern_database import PatternDatabase, buildPatternDatabase
+from algorithms.search import breadthFirstSearch
+from puzzles.sliding_puzzle import SlidingPuzzleState
+from algorithms.constructive import solveByConstruction
+from algorithms.shortening import removeCycles, shortenSolution
+from algorithms.heuristics import h3_manhattan_distance, make_heuristics, HEURISTICS
+from puzzles.eight_puzzle import EightPuzzleState, EightPuzzleSearchProblem, EIGHT_PUZZLE_DATA
+from puzzles.eight_puzzle_table import EightPuzzleDistanceTable
+
+
+SOLVED = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 0]
+
+
+def scramble(moves, seed):
+    """Returns a fifteen puzzle scrambled by a reproducible random walk."""
+    rng = random.Random(seed)
+    puzzle = FifteenPuzzleState(SOLVED)
+    for _ in range(moves):
+        puzzle = puzzle.result(rng.choice(puzzle.legalMoves()))
+    return puzzle
+
+
+def apply_actions(puzzle, actions):
+    """Replays a list of moves and returns the final state."""
+    for action in actions:
+        puzzle = puzzle.result(action)
+    return puzzle
+
+
+class GraphSearchProblem(SearchProblem):
+    """A search problem on an explicit graph {state: [(successor, cost)]}."""
+
+    def __init__(self, graph, start, goal):
+        self.graph = graph
+        self.start = start
+        self.goal = goal
+
+    def getStartState(self):
+        return self.start
+
+    def isGoalState(self, state):
+        return state == self.goal
+
+    def getSuccessors(self, state):
+        return [(succ, succ, cost) for succ, cost in self.graph.get(state, [])]
+
+
+class DeltaGraphSearchProblem(GraphSearchProblem):
+    """A graph problem with operator deltas for the heuristic table 'h'."""
+
+    def __init__(self, graph, start, goal, h):
+        GraphSearchProblem.__init__(self, graph, start, goal)
+        self.h = h
+
+    def getOperatorDeltas(self, state):
+        return [(succ, cost, self.h[succ] - self.h[state]) for succ, cost in self.graph.get(state, [])]
+
+    def getResult(self, state, action):
+        return action
+
+
+class TestEnhancedPartialExpansionAStar(unittest.TestCase):
+    """Test cases for EPEA*."""
+
+    def test_solved_start(self):
+        """A solved puzzle needs no moves."""
+        problem = FifteenPuzzleSearchProblem(FifteenPuzzleState(SOLVED))
+        result = enhancedPartialExpansionAStarSearch(problem, h3_manhattan_distance)
+        self.assertEqual(result.actions, [])
+        self.assertTrue(result.solved)
+        self.assertEqual(result.nodesExpanded, 0)
+
+    def test_matches_astar_length(self):
+        """EPEA* returns valid solutions as short as A*'s."""
+        for seed in range(5):
+            puzzle = scramble(14, seed)
+            problem = FifteenPuzzleSearchProblem(puzzle)
+            actions = enhancedPartialExpansionAStarSearch(problem, h3_manhattan_distance).actions
+            self.assertTrue(apply_actions(puzzle, actions).isGoal())
+            self.assertEqual(len(actions), len(aStarSearch(problem, h3_manhattan_distance).actions))
+
+    def test_operator_deltas_match_heuristic(self):
+        """The operator table predicts the heuristic of every successor."""
+        puzzle = scramble(20, 7)
+        problem = FifteenPuzzleSearchProblem(puzzle)
+        h = h3_manhattan_distance(puzzle)
+        for action, cost, delta in problem.getOperatorDeltas(puzzle):
+            successor = problem.getResult(puzzle, action)
+            self.assertEqual(h + delta, h3_manhattan_distance(successor))
+
+
+class TestGoalParametricHeuristics(unittest.TestCase):
+    """Test cases for heuristics built from goal tables."""
+
+    def test_fifteen_puzzle_values(self):
+        """One move from the goal every heuristic is 1 (Euclidean 1.0)."""
+        puzzle = FifteenPuzzleState(SOLVED).result('up')
+        for name in ('misplaced_tiles', 'euclidean_distance', 'manhattan_distance', 'row_column_misplacements'):
+            self.assertEqual(HEURISTICS[name](puzzle), 1)
+        self.assertEqual(HEURISTICS['manhattan_distance'](FifteenPuzzleState(SOLVED)), 0)
+
+    def test_eight_puzzle_uses_blank_first_goal(self):
+        """The heuristics are admissible for the eight puzzle's own goal."""
+        table = EightPuzzleDistanceTable.build()
+        self.assertEqual(h3_manhattan_distance(EightPuzzleState(list(range(9)))), 0)
+        for numbers in EIGHT_PUZZLE_DATA:
+            puzzle = EightPuzzleState(numbers)
+            for heuristic in HEURISTICS.values():
+                self.assertLessEqual(heuristic(puzzle), table.distance(puzzle))
+            actions = enhancedPartialExpansionAStarSearch(EightPuzzleSearchProblem(puzzle),
+                                                          h3_manhattan_distance).actions
+            self.assertEqual(len(actions), table.distance(puzzle))
+
+    def test_custom_goal(self):
+        """A factory for a spiral goal measures against that goal."""
+        spiral = [1, 2, 3, 8, 0, 4, 7, 6, 5]
+        heuristics = make_heuristics(3, goal=spiral)
+        puzzle = EightPuzzleState(spiral)
+        self.assertEqual(heuristics['manhattan_distance'](puzzle), 0)
+        self.assertEqual(heuristics['misplaced_tiles'](puzzle.result('up')), 1)
+        self.assertRaises(ValueError, make_heuristics, 3, goal=[1, 1, 2, 3, 4, 5, 6, 7, 8])
+
+
+class TestMovePruning(unittest.TestCase):
+    """Test cases for the move-pruning automaton."""
+
+    def test_sliding_tile_pruner_rejects_inverse_moves(self):
+        """Moves that undo the previous move are forbidden."""
+        pruner = slidingTilePruner()
+        self.assertFalse(pruner.allows(['up', 'down']))
+        self.assertFalse(pruner.allows(['left', 'up', 'right', 'left']))
+        self.assertTrue(pruner.allows(['up', 'left', 'down', 'right']))
+
+    def test_forbidden_substring_anywhere(self):
+        """The automaton matches forbidden sequences that overlap others."""
+        pruner = MovePruner(['a', 'b'], [('a', 'b', 'a'), ('b', 'b')])
+        self.assertTrue(pruner.allows(['a', 'b', 'a'][:2]))
+        self.assertFalse(pruner.allows(['b', 'a', 'b', 'a']))
+        self.assertFalse(pruner.allows(['a', 'a', 'b', 'b']))
+        self.assertTrue(pruner.allows(['a', 'a', 'b']))
+
+    def test_cycles_from_enumeration(self):
+        """Breadth-first enumeration finds every short cycle of a domain."""
+        def successors(counter):
+            return [('inc', (counter + 1) % 3), ('dec', (counter - 1) % 3)]
+
+        pruner = MovePruner.fromCycles(0, successors, 3)
+        self.assertEqual(sorted(pruner.forbidden),
+                         [('dec', 'dec', 'dec'), ('dec', 'inc'), ('inc', 'dec'), ('inc', 'inc', 'inc')])
+        self.assertTrue(pruner.allows(['inc', 'inc']))
+        self.assertFalse(pruner.allows(['dec', 'inc', 'inc', 'inc']))
+
+
+class TestIterativeDeepeningAStar(unittest.TestCase):
+    """Test cases for IDA* and pruned depth-first search."""
+
+    def test_matches_astar_length(self):
+        """IDA* returns optimal solutions."""
+        for seed in range(3):
+            puzzle = scramble(14, seed)
+            problem = FifteenPuzzleSearchProblem(puzzle)
+            actions = iterativeDeepeningAStarSearch(problem, h3_manhattan_distance).actions
+            self.assertTrue(apply_actions(puzzle, actions).isGoal())
+            self.assertEqual(len(actions), len(aStarSearch(problem, h3_manhattan_distance).actions))
+
+    def test_dead_end(self):
+        """A branch with no successors next to the goal's does not stop IDA*."""
+        graph = {'S': [('A', 1), ('D', 1)], 'A': [('G', 1)], 'D': [('S', 1)]}
+        result = iterativeDeepeningAStarSearch(GraphSearchProblem(graph, 'S', 'G'))
+        self.assertTrue(result.solved)
+        self.assertEqual(result.actions, ['A', 'G'])
+
+    def test_dfs_with_pruning(self):
+        """Depth-first search still finds a solution within its depth limit."""
+        puzzle = scramble(4, 3)
+        actions = depthFirstSearch(FifteenPuzzleSearchProblem(puzzle)).actions
+        self.assertTrue(apply_actions(puzzle, actions).isGoal())
+        self.assertTrue(slidingTilePruner().allows(actions))
+
+
+class TestTranspositionTable(unittest.TestCase):
+    """Test cases for the bounded transposition table."""
+
+    def test_replacement_policies(self):
+        """Depth-preferred keeps deeper entries; always-replace does not."""
+        deep = TranspositionTable(capacity=4, policy='depth')
+        deep.store(1, 10, 8, 1)
+        self.assertFalse(deep.store(5, 3, 2, 1))     # same slot, shallower
+        self.assertEqual(deep.probe(1), 10)
+        self.assertTrue(deep.store(5, 3, 2, 2))      # a newer iteration wins
+        self.assertIsNone(deep.probe(1))
+        self.assertEqual(deep.probe(5), 3)
+
+        always = TranspositionTable(capacity=4, policy='always')
+        always.store(1, 10, 8, 1)
+        self.assertTrue(always.store(5, 3, 2, 1))
+        self.assertEqual(always.probe(5), 3)
+        self.assertEqual(always.stats()['replacements'], 1)
+        self.assertEqual(len(always), 1)
+        always.store(6, 4, 2, 1)
+        self.assertEqual(len(always), 2)
+        self.assertRaises(ValueError, TranspositionTable, 4, 'oldest')
+
+    def test_ida_star_stays_optimal(self):
+        """IDA* with a small table finds equally short solutions and hits it."""
+        for policy in ('depth', 'always'):
+            table = TranspositionTable(capacity=1 << 12, policy=policy)
+            for seed in range(4):
+                puzzle = scramble(30, seed)
+                problem = FifteenPuzzleSearchProblem(puzzle)
+                stats = iterativeDeepeningAStarSearch(problem, h3_manhattan_distance, transpositions=table)
+                actions = stats.actions
+                self.assertTrue(apply_actions(puzzle, actions).isGoal())
+                self.assertGreater(stats.tableProbes, 0)
+                self.assertAlmostEqual(stats.tableHitRate, stats.tableHits / stats.tableProbes)
+                optimal = iterativeDeepeningAStarSearch(problem, h3_manhattan_distance).actions
+                self.assertEqual(len(actions), len(optimal))
+            self.assertGreater(table.hitRate(), 0)
+            self.assertLessEqual(len(table), table.capacity)
+
+    def test_needs_a_move_pruner(self):
+        """Bounds found under path checking depend on the path, so they are not stored."""
+        problem = GraphSearchProblem({'S': [('G', 1)]}, 'S', 'G')
+        self.assertRaises(ValueError, iterativeDeepeningAStarSearch, problem,
+                          transpositions=TranspositionTable(capacity=16))
+
+
+class TestLayeredBreadthFirstSearch(unittest.TestCase):
+    """Test cases for breadth-first search on packed NumPy layers."""
+
+    def test_packing_round_trip(self):
+        """Boards survive packing, and states rebuild from their codes."""
+        puzzle = scramble(25, 4)
+        self.assertEqual(unpackTiles(packTiles(puzzle.tiles), 16), puzzle.tiles)
+        self.assertEqual(puzzle.unpack(puzzle.pack()), puzzle)
+        self.assertEqual(puzzle.unpack(puzzle.pack()).zobrist, puzzle.zobrist)
+
+    def test_full_enumeration(self):
+        """Layer sizes match the known 2x3 and 3x3 state spaces."""
+        small = SlidingPuzzleState([1, 2, 3, 4, 5, 0], 2, 3)
+        layers, sizes = layeredBreadthFirstSearch(small.pack(), small.packedSuccessors, chunkSize=7)
+        self.assertEqual(sum(sizes), 360)
+        self.assertEqual(len(sizes) - 1, 21)
+
+        table = EightPuzzleDistanceTable.build()
+        eight = EightPuzzleState(list(range(9)))
+        layers, sizes = layeredBreadthFirstSearch(eight.pack(), eight.packedSuccessors, keepLayers=False)
+        self.assertEqual(sizes, table.histogram())
+        self.assertEqual(len(layers), 2)
+
+    def test_breadth_first_search_uses_layers(self):
+        """Layered BFS finds shortest solutions to the state's goal."""
+        for seed in range(3):
+            puzzle = scramble(16, seed)
+            problem = FifteenPuzzleSearchProblem(puzzle)
+            actions = breadthFirstSearch(problem, layered=True).actions
+            self.assertTrue(apply_actions(puzzle, actions).isGoal())
+            self.assertEqual(len(actions), len(aStarSearch(problem, h3_manhattan_distance).actions))
+
+
+class TestExternalBreadthFirstSearch(unittest.TestCase):
+    """Test cases for the disk-backed breadth-first search."""
+
+    def test_matches_in_memory_layers(self):
+        """Small chunks and merge blocks give the same layers as in memory."""
+        eight = EightPuzzleState(list(range(9)))
+        expected, expectedSizes = layeredBreadthFirstSearch(eight.pack(), eight.packedSuccessors)
+        with tempfile.TemporaryDirectory() as directory:
+            layers, sizes = externalBreadthFirstSearch(eight.pack(), eight.packedSuccessors, directory,
+                                                       chunkSize=997)
+            self.assertEqual(sizes, expectedSizes)
+            for layer, expectedLayer in zip(layers, expected):
+                self.assertTrue((layer == expectedLayer).all())
+
+    def test_resume_after_interruption(self):
+        """A second run continues from the checkpoint of the first."""
+        eight = EightPuzzleState(list(range(9)))
+        _, expectedSizes = layeredBreadthFirstSearch(eight.pack(), eight.packedSuccessors)
+        with tempfile.TemporaryDirectory() as directory:
+            _, sizes = externalBreadthFirstSearch(eight.pack(), eight.packedSuccessors, directory, maxDepth=10)
+            self.assertEqual(len(sizes), 11)
+            # a half-written next layer is discarded on resume
+            open(layerPath(directory, 11) + '.tmp', 'wb').write(b'garbage!')
+            finished = []
+            _, sizes = externalBreadthFirstSearch(eight.pack(), eight.packedSuccessors, directory,
+                                                  keepLayers=False,
+                                                  onLayer=lambda depth, size: finished.append(depth))
+            self.assertEqual(sizes, expectedSizes)
+            self.assertEqual(finished[0], 11)
+            self.assertFalse(os.path.exists(layerPath(directory, 20)))
+
+    def test_checkpoint_of_another_search_is_rejected(self):
+        """A resume with another goal or board size raises instead of mixing layers."""
+        eight = EightPuzzleState(list(range(9)))
+        config = {'rows': 3, 'cols': 3}
+        with tempfile.TemporaryDirectory() as directory:
+            externalBreadthFirstSearch(eight.pack(), eight.packedSuccessors, directory, maxDepth=2, config=config)
+            self.assertRaises(ValueError, externalBreadthFirstSearch, eight.pack(), eight.packedSuccessors,
+                              directory, config={'rows': 2, 'cols': 4})
+            self.assertRaises(ValueError, externalBreadthFirstSearch, eight.pack(), eight.packedSuccessors,
+                              directory, goal=eight.packedGoal(), config=config)
+            _, sizes = externalBreadthFirstSearch(eight.pack(), eight.packedSuccessors, directory, maxDepth=3,
+                                                  config=config)
+            self.assertEqual(sizes, [1, 2, 4, 8])
+
+    def test_odd_cycle(self):
+        """Merge blocks emptied by duplicate removal are skipped."""
+        def successors(codes):
+            # a 7-cycle: not bipartite, so new states meet states of the layer before
+            return np.concatenate([(codes + 1) % 7, (codes + 6) % 7]).astype(np.uint64)
+
+        with tempfile.TemporaryDirectory() as directory:
+            layers, sizes = externalBreadthFirstSearch(np.uint64(0), successors, directory, chunkSize=1)
+        self.assertEqual(sizes, [1, 2, 2, 2])
+
+    def test_breadth_first_search_on_disk(self):
+        """breadthFirstSearch with a directory finds shortest solutions."""
+        puzzle = scramble(14, 2)
+        problem = FifteenPuzzleSearchProblem(puzzle)
+        with tempfile.TemporaryDirectory() as directory:
+            actions = breadthFirstSearch(problem, layered=True, directory=directory).actions
+        self.assertTrue(apply_actions(puzzle, actions).isGoal())
+        self.assertEqual(len(actions), len(aStarSearch(problem, h3_manhattan_distance).actions))
+
+
+class TestTwoBitBreadthFirstSearch(unittest.TestCase):
+    """Test cases for the two-bit complete enumeration."""
+
+    def test_small_boards(self):
+        """2x2 and 2x3 boards have their known sizes and diameters."""
+        histogram, distances = twoBitBreadthFirstSearch(2, 2)
+        self.assertEqual(histogram, [1, 2, 2, 2, 2, 2, 1])
+        self.assertIsNone(distances)
+        histogram, _ = twoBitBreadthFirstSearch(2, 3, chunkSize=64)
+        self.assertEqual(sum(histogram), 360)
+        self.assertEqual(len(histogram) - 1, 21)
+
+    def test_matches_eight_puzzle_table(self):
+        """The histogram and saturated distances agree with the exact table."""
+        table = EightPuzzleDistanceTable.build()
+        histogram, distances = twoBitBreadthFirstSearch(3, 3, start=list(range(9)), distanceTable=True)
+        self.assertEqual(histogram, table.histogram())
+        for rank in range(0, len(table.distances), 101):
+            exact = table.distances[rank]
+            self.assertEqual(readNibble(distances, rank), 15 if exact == 255 else min(exact, 15))
+
+
+class TestPatternDatabase(unittest.TestCase):
+    """Test cases for pattern databases and their builder."""
+
+    def test_admissible_for_eight_puzzle(self):
+        """Pattern distances never exceed the exact eight puzzle distances."""
+        table = EightPuzzleDistanceTable.build()
+        database = buildPatternDatabase(3, 3, [1, 2, 3, 4], goal=list(range(9)))
+        self.assertEqual(sum(database.histogram()), 9 * 8 * 7 * 6 * 5)
+        for numbers in EIGHT_PUZZLE_DATA:
+            puzzle = EightPuzzleState(numbers)
+            self.assertLessEqual(database.heuristic(puzzle), table.distance(puzzle))
+        self.assertEqual(database.distance(list(range(9))), 0)
+
+    def test_parallel_build_and_file_format(self):
+        """A pooled build matches a serial one and survives save/load."""
+        serial = buildPatternDatabase(3, 3, [1, 2, 3])
+        pooled = buildPatternDatabase(3, 3, [1, 2, 3], workers=2, chunkSize=100)
+        self.assertEqual(pooled.distances, serial.distances)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tiles.pdb')
+            pooled.save(path)
+            loaded = PatternDatabase.load(path)
+        self.assertEqual((loaded.rows, loaded.cols, loaded.pattern), (3, 3, (1, 2, 3)))
+        self.assertEqual(loaded.goal, tuple(range(1, 9)) + (0,))
+        self.assertEqual(loaded.distances, serial.distances)
+
+    def test_resume_from_checkpoint(self):
+        """A build stopped after a few layers resumes to the same table."""
+        expected = buildPatternDatabase(3, 3, [1, 2, 3])
+
+        def stop(depth, count, seconds):
+            if depth == 4:
+                raise KeyboardInterrupt
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertRaises(KeyboardInterrupt, buildPatternDatabase, 3, 3, [1, 2, 3],
+                              checkpointDir=directory, onLayer=stop)
+            depths = []
+            resumed = buildPatternDatabase(3, 3, [1, 2, 3], checkpointDir=directory,
+                                           onLayer=lambda depth, count, seconds: depths.append(depth))
+        self.assertEqual(depths[0], 5)
+        self.assertEqual(resumed.distances, expected.distances)
+
+    def test_checkpoint_of_another_build_is_rejected(self):
+        """A checkpoint for another pattern, goal or board shape is not resumed."""
+        def stop(depth, count, seconds):
+            raise KeyboardInterrupt
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertRaises(KeyboardInterrupt, buildPatternDatabase, 3, 3, [1, 2, 3],
+                              checkpointDir=directory, onLayer=stop)
+            # same table size, different tiles
+            self.assertRaises(ValueError, buildPatternDatabase, 3, 3, [4, 5, 6], checkpointDir=directory)
+            self.assertRaises(ValueError, buildPatternDatabase, 3, 3, [1, 2, 3],
+                              goal=[0, 1, 2, 3, 4, 5, 6, 7, 8], checkpointDir=directory)
+
+
+class TestPerimeterSearch(unittest.TestCase):
+    """Test cases for perimeter databases."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.perimeter = PerimeterDatabase.build(FifteenPuzzleState(SOLVED), 6)
+
+    def test_distances_and_paths(self):
+        """Stored paths lead to the goal in exactly the stored distance."""
+        puzzle = scramble(5, 11)
+        self.assertTrue(self.perimeter.contains(puzzle))
+        path = self.perimeter.pathToGoal(puzzle)
+        self.assertEqual(len(path), self.perimeter.distance(puzzle))
+        self.assertTrue(apply_actions(puzzle, path).isGoal())
+        self.assertFalse(self.perimeter.contains(scramble(40, 1)))
+
+    def test_searches_stop_at_perimeter(self):
+        """A* and IDA* with a perimeter still return optimal solutions."""
+        for seed in range(3):
+            puzzle = scramble(16, seed)
+            problem = FifteenPuzzleSearchProblem(puzzle)
+            optimal = len(aStarSearch(problem, h3_manhattan_distance).actions)
+
+            actions = aStarSearch(problem, h3_manhattan_distance, perimeter=self.perimeter).actions
+            self.assertTrue(apply_actions(puzzle, actions).isGoal())
+            self.assertEqual(len(actions), optimal)
+
+            actions = iterativeDeepeningAStarSearch(problem, h3_manhattan_distance,
+                                                    perimeter=self.perimeter).actions
+            self.assertTrue(apply_actions(puzzle, actions).isGoal())
+            self.assertEqual(len(actions), optimal)
+
+    def test_persisted_and_shared(self):
+        """loadPerimeter builds a missing file once and then reuses it."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'perimeter.pkl')
+            first = loadPerimeter(path, FifteenPuzzleState(SOLVED), depth=4)
+            self.assertTrue(os.path.exists(path))
+            self.assertIs(loadPerimeter(path), first)
+            self.assertEqual(PerimeterDatabase.load(path).distances, first.distances)
+            self.assertRaises(ValueError, loadPerimeter, path, FifteenPuzzleState(SOLVED), depth=5)
+            self.assertRaises(ValueError, loadPerimeter, path, EightPuzzleState(list(range(9))), depth=4)
+
+    def test_perimeter_of_another_goal_is_rejected(self):
+        """The searches refuse a perimeter built for a different goal."""
+        problem = EightPuzzleSearchProblem(EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]))
+        self.assertRaises(ValueError, aStarSearch, problem, h3_manhattan_distance, perimeter=self.perimeter)
+        self.assertRaises(ValueError, iterativeDeepeningAStarSearch, problem, h3_manhattan_distance,
+                          perimeter=self.perimeter)
+
+
+class TestConstructiveSolver(unittest.TestCase):
+    """Test cases for the constructive N x N solver."""
+
+    @staticmethod
+    def scrambled_board(size, seed):
+        """Returns a flat N x N board scrambled by random blank moves."""
+        rng = random.Random(seed)
+        board = list(range(1, size * size)) + [0]
+        blank = size * size - 1
+        for _ in range(20 * size * size):
+            row, col = divmod(blank, size)
+            options = [cell for cell, legal in ((blank - size, row > 0), (blank + size, row < size - 1),
+                                                (blank - 1, col > 0), (blank + 1, col < size - 1)) if legal]
+            target = rng.choice(options)
+            board[blank], board[target] = board[target], board[blank]
+            blank = target
+        return board
+
+    @staticmethod
+    def replay(board, size, actions):
+        """Applies blank moves to a flat board and returns the result."""
+        board = board[:]
+        blank = board.index(0)
+        offsets = {'up': -size, 'down': size, 'left': -1, 'right': 1}
+        for action in actions:
+            target = blank + offsets[action]
+            board[blank], board[target] = board[target], board[blank]
+            blank = target
+        return board
+
+    def test_solves_many_sizes(self):
+        """Solutions are legal and reach the goal for 3x3 up to 12x12."""
+        for size in range(3, 13):
+            for seed in range(5):
+                board = self.scrambled_board(size, seed)
+                actions = solveByConstruction(board)
+                self.assertEqual(self.replay(board, size, actions), list(range(1, size * size)) + [0])
+
+    def test_accepts_puzzle_state(self):
+        """A fifteen puzzle state can be passed directly."""
+        puzzle = scramble(30, 2)
+        self.assertTrue(apply_actions(puzzle, solveByConstruction(puzzle)).isGoal())
+
+    def test_unsolvable(self):
+        """Boards with the wrong parity are rejected."""
+        board = list(range(1, 16)) + [0]
+        board[0], board[1] = board[1], board[0]
+        self.assertRaises(ValueError, solveByConstruction, board)
+
+
+class TestSolutionShortening(unittest.TestCase):
+    """Test cases for post-hoc solution shortening."""
+
+    def test_remove_cycles(self):
+        """Move/anti-move pairs and longer loops are cut out."""
+        puzzle = FifteenPuzzleState(SOLVED)
+        loop = ['left', 'up', 'right', 'down'] * 3
+        actions = ['up', 'down', 'left'] + loop + ['right']
+        self.assertEqual(removeCycles(puzzle, actions), [])
+        self.assertEqual(removeCycles(puzzle, ['up', 'left', 'right', 'up']), ['up', 'up'])
+
+    def test_shortens_constructive_solution(self):
+        """Shortened solutions still solve the puzzle and are never longer."""
+        size = 6
+        board = TestConstructiveSolver.scrambled_board(size, 4)
+        actions = solveByConstruction(board)
+        shortened = shortenSolution(board, actions)
+        self.assertLess(len(shortened), len(actions))
+        self.assertEqual(TestConstructiveSolver.replay(board, size, shortened),
+                         list(range(1, size * size)) + [0])
+
+    def test_detour_replaced(self):
+        """A window with a detour is replaced by the direct path."""
+        puzzle = scramble(10, 5)
+        optimal = aStarSearch(FifteenPuzzleSearchProblem(puzzle), h3_manhattan_distance).actions
+        # circling a 2x2 block twice equals circling it once the other way
+        detour = ['left', 'up', 'right', 'down'] * 2
+        actions = shortenSolution(puzzle, optimal + detour)
+        self.assertEqual(apply_actions(puzzle, optimal + detour), apply_actions(puzzle, actions))
+        self.assertLessEqual(len(actions), len(optimal) + 4)
+
+
+class TestSearchStats(unittest.TestCase):
+    """Test cases for the statistics every search returns."""
+
+    def test_every_search_reports_the_same_fields(self):
+        """All searches return a solved SearchStats with consistent counts."""
+        puzzle = scramble(8, 4)
+        problem = FifteenPuzzleSearchProblem(puzzle)
+        optimal = aStarSearch(problem, h3_manhattan_distance).depth
+        results = {
+            'DFS': depthFirstSearch(problem),
+            'BFS': breadthFirstSearch(problem),
+            'layered BFS': breadthFirstSearch(problem, layered=True),
+            'UCS': uniformCostSearch(problem),
+            'A*': aStarSearch(problem, h3_manhattan_distance),
+            'EPEA*': enhancedPartialExpansionAStarSearch(problem, h3_manhattan_distance),
+            'IDA*': iterativeDeepeningAStarSearch(problem, h3_manhattan_distance),
+        }
+        for name, result in results.items():
+            with self.subTest(search=name):
+                self.assertIsInstance(result, SearchStats)
+                self.assertTrue(result.solved)
+                self.assertTrue(apply_actions(puzzle, result.actions).isGoal())
+                if name != 'DFS':
+                    self.assertEqual(result.depth, optimal)
+                self.assertGreater(result.nodesExpanded, 0)
+                self.assertGreaterEqual(result.nodesGenerated, result.nodesExpanded)
+                self.assertGreater(result.maxOpen, 0)
+                self.assertGreater(result.wallTime, 0)
+                self.assertGreaterEqual(result.iterations, 1)
+                self.assertEqual(set(result.asDict()), set(SearchStats.FIELDS))
+        for name in ('A*', 'EPEA*', 'IDA*'):
+            self.assertGreater(results[name].heuristicCalls, 0)
+            self.assertGreaterEqual(results[name].heuristicTime, 0)
+        self.assertEqual(results['UCS'].heuristicCalls, 0)
+
+    def test_astar_counts_the_open_list(self):
+        """A*'s maxOpen is the fringe's peak size, not the number of pushes."""
+        problem = FifteenPuzzleSearchProblem(scramble(30, 2))
+        result = aStarSearch(problem, h3_manhattan_distance)
+        # one heuristic call per push
+        pushes = result.heuristicCalls
+        self.assertLess(result.maxOpen, pushes)
+        self.assertLessEqual(result.maxClosed, result.nodesExpanded)
+        self.assertEqual(result.nodesExpanded - result.reopenings, result.maxClosed)
+
+    def test_reopenings(self):
+        """A* and EPEA* count states expanded again on a cheaper path."""
+        # h(A) = 4 is admissible but not consistent, so C is first expanded
+        # through B and again once the cheaper path through A is found
+        graph = {'S': [('A', 1), ('B', 2)], 'A': [('C', 1)], 'B': [('C', 2)], 'C': [('G', 3)]}
+        h = {'S': 0, 'A': 4, 'B': 0, 'C': 0, 'G': 0}
+        problem = DeltaGraphSearchProblem(graph, 'S', 'G', h)
+        heuristic = lambda state, problem=None: h[state]
+        for search in (aStarSearch, enhancedPartialExpansionAStarSearch):
+            with self.subTest(search=search.__name__):
+                result = search(problem, heuristic)
+                self.assertEqual(result.actions, ['A', 'C', 'G'])
+                self.assertEqual(result.reopenings, 1)
+
+    def test_unsolved(self):
+        """A search that finds no goal says so."""
+        result = depthFirstSearch(FifteenPuzzleSearchProblem(scramble(40, 1)))
+        self.assertFalse(result.solved)
+        self.assertEqual(result.actions, [])
+        self.assertIsNone(result.depth)
+        self.assertRaises(TypeError, SearchStats, [], False, nodes=1)
+
+
+class TestPhaseProfile(unittest.TestCase):
+    """Test cases for the sampled phase timings of the best-first searches."""
+
+    def test_profiling_does_not_change_the_search(self):
+        """A profiled search finds the same solution with the same counts."""
+        problem = FifteenPuzzleSearchProblem(scramble(30, 6))
+        searches = {
+            'UCS': lambda profile: uniformCostSearch(FifteenPuzzleSearchProblem(scramble(8, 6)), profile=profile),
+            'A*': lambda profile: aStarSearch(problem, h3_manhattan_distance, profile=profile),
+            'EPEA*': lambda profile: enhancedPartialExpansionAStarSearch(problem, h3_manhattan_distance,
+                                                                         profile=profile),
+        }
+        counts = ('actions', 'nodesExpanded', 'nodesGenerated', 'duplicates', 'maxOpen', 'maxClosed',
+                  'heuristicCalls')
+        for name, search in searches.items():
+            with self.subTest(search=name):
+                plain, profiled = search(None), search(4)
+                self.assertIsNone(plain.profile)
+                self.assertIsInstance(profiled.profile, PhaseProfile)
+                for field in counts:
+                    self.assertEqual(getattr(plain, field), getattr(profiled, field), field)
+
+    def test_sampling(self):
+        """One iteration in 'interval' is timed, starting with the first."""
+        problem = FifteenPuzzleSearchProblem(scramble(30, 6))
+        every = aStarSearch(problem, h3_manhattan_distance, profile=1).profile
+        self.assertEqual(every.samples, every.iterations)
+        self.assertGreater(every.iterations, 1)
+        breakdown = every.breakdown()
+        self.assertEqual(set(breakdown), set(PhaseProfile.PHASES))
+        for phase in ('successors', 'hashing', 'heuristic', 'queue'):
+            self.assertGreater(breakdown[phase][0], 0)
+        self.assertAlmostEqual(sum(share for _, share in breakdown.values()), 1.0, places=6)
+
+        sampled = aStarSearch(problem, h3_manhattan_distance, profile=10).profile
+        self.assertEqual(sampled.iterations, every.iterations)
+        self.assertEqual(sampled.samples, (every.iterations + 9) // 10)
+        self.assertIn('1 in 10', str(sampled))
+        stats = aStarSearch(problem, h3_manhattan_distance, profile=10).asDict()
+        self.assertEqual(set(stats['profile']['phases']), set(PhaseProfile.PHASES))
+        self.assertRaises(ValueError, PhaseProfile, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
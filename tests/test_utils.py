@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for utility functions and data structures.
+"""
+
+import unittest
+import itertools
+import random
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from puzzles.fifteen_puzzle import FifteenPuzzleState
+from utils.generator import (
+    generate_scenarios,
+    generate_and_save_scenarios,
+    save_scenarios,
+    load_scenarios,
+    ScenarioFile
+)
+
+from utils.util import (
+    permutationCount,
+    rankPermutation,
+    unrankPermutation,
+    rankPartialPermutation,
+    unrankPartialPermutation,
+    rankPartialPermutations,
+    unrankPartialPermutations
+)
+
+
+class TestPermutationRanking(unittest.TestCase):
+    """Test cases for permutation ranking and unranking."""
+
+    def test_ranks_are_dense_and_lexicographic(self):
+        """Every partial permutation gets its lexicographic index."""
+        for n in range(1, 6):
+            for k in range(1, n + 1):
+                permutations = list(itertools.permutations(range(n), k))
+                self.assertEqual(len(permutations), permutationCount(n, k))
+                ranks = [rankPartialPermutation(p, n) for p in permutations]
+                self.assertEqual(ranks, list(range(len(permutations))))
+                for rank, permutation in enumerate(permutations):
+                    self.assertEqual(tuple(unrankPartialPermutation(rank, k, n)), permutation)
+
+    def test_full_permutation_round_trip(self):
+        """Fifteen puzzle boards survive ranking and unranking."""
+        rng = random.Random(0)
+        for _ in range(100):
+            board = list(range(16))
+            rng.shuffle(board)
+            rank = rankPermutation(board)
+            self.assertLess(rank, permutationCount(16))
+            self.assertEqual(unrankPermutation(rank, 16), board)
+
+    def test_vectorised_matches_scalar(self):
+        """The NumPy versions agree with the scalar ones."""
+        rng = np.random.default_rng(1)
+        for n, k in ((9, 9), (16, 16), (16, 6)):
+            values = np.array([rng.permutation(n)[:k] for _ in range(200)])
+            ranks = rankPartialPermutations(values, n)
+            self.assertEqual(ranks.tolist(), [rankPartialPermutation(list(row), n) for row in values])
+            self.assertTrue((unrankPartialPermutations(ranks, k, n) == values).all())
+
+    def test_vectorised_rejects_boards_too_large_for_int64(self):
+        """21! overflows an int64, so 21 values are refused rather than misranked."""
+        values = np.arange(21)[None, :]
+        self.assertRaises(ValueError, rankPartialPermutations, values, 21)
+        self.assertRaises(ValueError, unrankPartialPermutations, [0], 21, 21)
+
+
+class TestScenarioGenerator(unittest.TestCase):
+    """Test cases for the vectorised scenario generator."""
+
+    def test_boards_are_reachable_permutations(self):
+        """Every board is a permutation reachable from the solved board."""
+        boards = generate_scenarios(500, moves=25, seed=3)
+        self.assertEqual(boards.shape, (500, 16))
+        for board in boards[:50]:
+            puzzle = FifteenPuzzleState(board.tolist())
+            self.assertEqual(sorted(puzzle.tiles), list(range(16)))
+            # 25 moves leave the blank an odd Manhattan distance from its goal
+            row, col = puzzle.blankLocation
+            self.assertEqual((6 - row - col) % 2, 1)
+
+    def test_seeded_and_without_reversals(self):
+        """Seeds reproduce sets, and no walk undoes its previous move."""
+        first = generate_scenarios(1000, moves=10, seed=42)
+        self.assertTrue((first == generate_scenarios(1000, moves=10, seed=42)).all())
+        self.assertFalse((first == generate_scenarios(1000, moves=10, seed=43)).all())
+        solved = np.array(list(range(1, 16)) + [0], dtype=np.uint8)
+        twice = generate_scenarios(1000, moves=2, seed=5)
+        self.assertFalse((twice == solved).all(axis=1).any())
+        self.assertEqual(generate_scenarios(10, moves=4, seed=1, rows=3, cols=3).shape, (10, 9))
+
+
+class TestScenarioFiles(unittest.TestCase):
+    """Test cases for binary scenario files and their CSV export."""
+
+    def test_binary_round_trip(self):
+        """Boards and goal survive a save and a memory-mapped read."""
+        boards = generate_scenarios(300, moves=20, seed=8, rows=3, cols=3)
+        goal = [0, 1, 2, 3, 4, 5, 6, 7, 8]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'scenarios.bin')
+            save_scenarios(path, boards, rows=3, cols=3, goal=goal)
+            self.assertEqual(os.path.getsize(path), 24 + 16 + 300 * 8)
+            scenarios = ScenarioFile(path)
+            self.assertEqual((scenarios.rows, scenarios.cols, scenarios.goal), (3, 3, goal))
+            self.assertEqual(len(scenarios), 300)
+            self.assertTrue((scenarios.boards() == boards).all())
+            self.assertTrue((scenarios.boards(10, 20) == boards[10:20]).all())
+            self.assertEqual(list(scenarios), boards.tolist())
+            del scenarios
+
+    def test_csv_export_matches_generated_csv(self):
+        """The CSV export and the CSV output of the generator read alike."""
+        with tempfile.TemporaryDirectory() as directory:
+            binary = os.path.join(directory, 'scenarios.bin')
+            generated = os.path.join(directory, 'generated.csv')
+            exported = os.path.join(directory, 'exported.csv')
+            generate_and_save_scenarios(binary, num_puzzles=20, seed=4)
+            generate_and_save_scenarios(generated, num_puzzles=20, seed=4)
+            ScenarioFile(binary).export_csv(exported)
+            with open(generated) as first, open(exported) as second:
+                self.assertEqual(first.read(), second.read())
+            boards = list(load_scenarios(binary))
+            self.assertEqual(boards, list(load_scenarios(exported)))
+            self.assertEqual(boards, generate_scenarios(20, seed=4).tolist())
+
+    def test_rejects_other_files(self):
+        """Files without the scenario header are refused."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'other.bin')
+            with open(path, 'wb') as file:
+                file.write(bytes(64))
+            with self.assertRaises(ValueError):
+                ScenarioFile(path)
+
+
+if __name__ == '__main__':
+    unittest.main()